@@ -1,46 +1,390 @@
+import json
+import hashlib
 from sqlalchemy.orm import Session
-from sqlalchemy import select, func, and_, exists, text
+from sqlalchemy import select, update, func, and_, case, exists, text, literal_column, null
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from datetime import datetime, timedelta
 from . import models, schemas
+from .locations import normalize_location, location_filter_target
+from .near_duplicates import NearDuplicateIndex, signature, lsh_bands
 
-def _find_existing(db: Session, title: str, company: str, canonical_url: str | None):
-    if not canonical_url:
+# Rows per INSERT ... ON CONFLICT statement. Keeps bind params well under
+# Postgres' 65535 limit (~20 columns x 500 rows).
+BULK_UPSERT_CHUNK = 500
+
+# Fields that make up a posting's content fingerprint. posted_at is left out
+# on purpose: several scrapers stamp it with "now" on every run.
+CONTENT_FIELDS = (
+    "title", "company", "location", "remote_flag", "skills",
+    "salary_min", "salary_max", "currency", "description_text", "apply_url",
+)
+
+
+def job_dedupe_key(
+    title: str | None,
+    company: str | None,
+    canonical_url: str | None,
+    source: str | None = None,
+    apply_url: str | None = None,
+) -> str | None:
+    """
+    Normalized identity of a posting: md5 of lower/whitespace-collapsed
+    title|company|canonical_url.
+
+    Without a canonical_url, title|company alone would merge distinct
+    "Software Engineer @ X" listings, so the key becomes
+    title|company||source|apply_url. With no URL at all there is no
+    identity: None, which never conflicts — every fetch inserts a row, as
+    before dedupe keys existed.
+
+    Must stay in sync with the SQL backfill in db.ensure_columns().
+    """
+    def norm(p):
+        return " ".join((p or "").split()).lower()
+
+    if norm(canonical_url):
+        parts = [norm(p) for p in (title, company, canonical_url)]
+    elif norm(apply_url):
+        parts = [norm(p) for p in (title, company, "", source, apply_url)]
+    else:
         return None
-    stmt = select(models.Job).where(
-        and_(
-            func.lower(models.Job.title) == func.lower(title),
-            func.lower(models.Job.company) == func.lower(company),
-            func.lower(models.Job.canonical_url) == func.lower(canonical_url),
-        )
+    return hashlib.md5("|".join(parts).encode("utf-8")).hexdigest()
+
+
+def payload_dedupe_key(payload: schemas.JobCreate) -> str | None:
+    return job_dedupe_key(
+        payload.title, payload.company, payload.canonical_url, payload.source, payload.apply_url
     )
+
+
+def job_content_hash(payload: schemas.JobCreate) -> str:
+    """
+    sha256 over the normalized payload (CONTENT_FIELDS).
+
+    Whitespace and skill order don't count as changes.
+    """
+    data = payload.model_dump(include=set(CONTENT_FIELDS))
+    for field, value in data.items():
+        if isinstance(value, str):
+            data[field] = " ".join(value.split())
+    data["skills"] = sorted({s.strip().lower() for s in data.get("skills") or [] if s})
+    blob = json.dumps(data, sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+def job_near_dup_fields(payload: schemas.JobCreate) -> dict:
+    """minhash + lsh_bands columns for a payload (see app/core/near_duplicates.py)."""
+    sig = signature(payload.title, payload.company, payload.description_text)
+    return {"minhash": sig, "lsh_bands": lsh_bands(sig)}
+
+
+def live_jobs_clause():
+    """
+    Jobs users should see: open (is_active) and not a near-duplicate of
+    another posting. Same predicate as the partial indexes in
+    db.ensure_indexes — raw SQL spells it "is_active AND canonical_job_id IS NULL".
+    """
+    return and_(models.Job.is_active, models.Job.canonical_job_id.is_(None))
+
+
+def _reopen() -> dict:
+    """Lifecycle columns for a posting the source is (again) delivering."""
+    return {"is_active": True, "closed_at": None, "close_reason": None}
+
+
+def _reopen_if_seen_after_close(seen_at) -> dict:
+    """
+    Replay version of _reopen(): a posting closed after the Bronze copy
+    was fetched stays closed; one seen again after closing reopens.
+    seen_at is a datetime or SQL expression.
+    """
+    Job = models.Job
+    reopen = and_(Job.closed_at.is_not(None), Job.closed_at < seen_at)
+    return {
+        "is_active": case((reopen, True), else_=Job.is_active),
+        "closed_at": case((reopen, null()), else_=Job.closed_at),
+        "close_reason": case((reopen, null()), else_=Job.close_reason),
+    }
+
+
+def _find_existing(db: Session, payload: schemas.JobCreate):
+    key = payload_dedupe_key(payload)
+    if key is None:
+        return None
+    stmt = select(models.Job).where(models.Job.dedupe_key == key)
     return db.execute(stmt).scalar_one_or_none()
 
 def upsert_job(db: Session, payload: schemas.JobCreate) -> models.Job:
-    existing = _find_existing(db, payload.title, payload.company, payload.canonical_url or "")
+    existing = _find_existing(db, payload)
+    content_hash = job_content_hash(payload)
     if existing:
         existing.last_seen_at = datetime.utcnow()
+        for field, value in _reopen().items():
+            setattr(existing, field, value)
+        if existing.content_hash == content_hash:
+            # Identical posting — only mark it as still live
+            db.commit()
+            db.refresh(existing)
+            return existing
+        existing.content_hash = content_hash
+        existing.content_changed_at = datetime.utcnow()
         if payload.salary_min is not None: existing.salary_min = payload.salary_min
         if payload.salary_max is not None: existing.salary_max = payload.salary_max
         if payload.currency is not None:   existing.currency = payload.currency
         if payload.skills:                 existing.skills = payload.skills
-        if payload.location is not None:  existing.location = payload.location
+        if payload.location is not None:
+            existing.location = payload.location
+            for field, value in normalize_location(payload.location, payload.remote_flag).items():
+                setattr(existing, field, value)
         if payload.remote_flag is not None: existing.remote_flag = payload.remote_flag
-        if payload.description_text:       existing.description_text = payload.description_text
+        if payload.description_text:
+            existing.description_text = payload.description_text
+            for field, value in job_near_dup_fields(payload).items():
+                setattr(existing, field, value)
         db.add(existing)
+        db.flush()
+        link_near_duplicates(db, [existing.id])
         db.commit()
         db.refresh(existing)
         return existing
 
     obj = models.Job(
         **payload.model_dump(),
+        **normalize_location(payload.location, payload.remote_flag),
+        **job_near_dup_fields(payload),
+        dedupe_key=payload_dedupe_key(payload),
+        content_hash=content_hash,
+        content_changed_at=datetime.utcnow(),
         scraped_at=datetime.utcnow(),
         last_seen_at=datetime.utcnow(),
     )
     db.add(obj)
+    db.flush()
+    link_near_duplicates(db, [obj.id])
     db.commit()
     db.refresh(obj)
     return obj
 
+
+def bulk_upsert_jobs(
+    db: Session, payloads: list[schemas.JobCreate], seen_at: list[datetime] | None = None
+) -> dict[str, int]:
+    """
+    Set-based upsert for a whole source batch.
+
+    One INSERT ... ON CONFLICT (dedupe_key) DO UPDATE per chunk, plus one
+    UPDATE that bumps last_seen_at on rows whose content didn't change.
+    Same merge rules as upsert_job(): a None/empty incoming value never
+    overwrites what we already have.
+
+    Change detection uses the stored content_hash: an identical posting
+    only gets last_seen_at bumped (no rewrite of description/skills, no
+    index churn); a changed one also gets content_changed_at = now.
+
+    New and changed postings are then linked to earlier near-duplicates
+    (link_near_duplicates) in the same transaction.
+
+    Replay mode (seen_at given, one per payload — when the Bronze copy was
+    fetched; app/replay.py): last_seen_at only moves forward to seen_at,
+    and a closed posting stays closed unless seen_at is after its
+    closed_at. Without it an old segment would make every posting closed
+    since then look live again.
+
+    Does NOT commit — caller owns the transaction.
+
+    Returns: {"inserted": n, "updated": n, "unchanged": n, "duplicates": n}
+    (duplicates: written rows that are near-duplicates of an earlier job)
+    """
+    now = datetime.utcnow()
+    Job = models.Job
+
+    # Last occurrence wins — Postgres rejects a statement that touches
+    # the same conflict row twice. Keyless postings are all kept.
+    replay = seen_at is not None
+    rows: dict[str | int, dict] = {}
+    for i, payload in enumerate(payloads):
+        key = payload_dedupe_key(payload)
+        rows[i if key is None else key] = {
+            **payload.model_dump(),
+            **normalize_location(payload.location, payload.remote_flag),
+            **job_near_dup_fields(payload),
+            "dedupe_key": key,
+            "content_hash": job_content_hash(payload),
+            "content_changed_at": now,
+            "scraped_at": now,
+            "last_seen_at": seen_at[i] if replay else now,
+            **_reopen(),
+        }
+
+    counts = {"inserted": 0, "updated": 0, "unchanged": 0, "duplicates": 0}
+    items = list(rows.values())
+    written_ids: list[int] = []
+
+    for start in range(0, len(items), BULK_UPSERT_CHUNK):
+        chunk = items[start:start + BULK_UPSERT_CHUNK]
+        stmt = pg_insert(Job).values(chunk)
+        excluded = stmt.excluded
+
+        merged = {
+            "salary_min": func.coalesce(excluded.salary_min, Job.salary_min),
+            "salary_max": func.coalesce(excluded.salary_max, Job.salary_max),
+            "currency": func.coalesce(excluded.currency, Job.currency),
+            "skills": case(
+                (func.json_array_length(excluded.skills) > 0, excluded.skills),
+                else_=Job.skills,
+            ),
+            "location": func.coalesce(excluded.location, Job.location),
+            # Structured location follows the location it was derived from
+            **{
+                c: case((excluded.location.is_(None), getattr(Job, c)), else_=getattr(excluded, c))
+                for c in ("regions", "country_codes", "remote_scope")
+            },
+            "remote_flag": excluded.remote_flag,
+            "description_text": func.coalesce(
+                func.nullif(excluded.description_text, ""), Job.description_text
+            ),
+            "source": func.coalesce(excluded.source, Job.source),
+            # Signatures follow the description they were computed from
+            **{
+                c: case(
+                    (func.coalesce(excluded.description_text, "") == "", getattr(Job, c)),
+                    else_=getattr(excluded, c),
+                )
+                for c in ("minhash", "lsh_bands")
+            },
+        }
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[Job.dedupe_key],
+            set_={
+                **merged,
+                "content_hash": excluded.content_hash,
+                "content_changed_at": excluded.content_changed_at,
+                **({
+                    "last_seen_at": func.greatest(Job.last_seen_at, excluded.last_seen_at),
+                    **_reopen_if_seen_after_close(excluded.last_seen_at),
+                } if replay else {
+                    "last_seen_at": excluded.last_seen_at,
+                    **_reopen(),
+                }),
+            },
+            where=Job.content_hash.is_distinct_from(excluded.content_hash),
+        ).returning(Job.id, Job.dedupe_key, literal_column("(xmax = 0)").label("inserted"))
+
+        written = db.execute(stmt).all()
+        written_ids.extend(job_id for job_id, _, _ in written)
+        touched = {key for _, key, _ in written}
+        inserted = sum(1 for _, _, was_insert in written if was_insert)
+        counts["inserted"] += inserted
+        counts["updated"] += len(written) - inserted
+
+        # Conflicting rows skipped by the content_hash check come back as
+        # nothing — they're unchanged, only mark them as still live.
+        # (Keyless rows never conflict — always inserted.)
+        unchanged = [r for r in chunk if r["dedupe_key"] is not None and r["dedupe_key"] not in touched]
+        if unchanged and not replay:
+            db.execute(
+                update(Job)
+                .where(Job.dedupe_key.in_([r["dedupe_key"] for r in unchanged]))
+                .values(last_seen_at=now, **_reopen())
+                .execution_options(synchronize_session=False)
+            )
+        elif unchanged:
+            # One UPDATE per fetch time (a replayed source has few segments)
+            by_seen: dict[datetime, list[str]] = {}
+            for r in unchanged:
+                by_seen.setdefault(r["last_seen_at"], []).append(r["dedupe_key"])
+            for seen, keys in by_seen.items():
+                db.execute(
+                    update(Job)
+                    .where(Job.dedupe_key.in_(keys))
+                    .values(
+                        last_seen_at=func.greatest(Job.last_seen_at, seen),
+                        **_reopen_if_seen_after_close(seen),
+                    )
+                    .execution_options(synchronize_session=False)
+                )
+        counts["unchanged"] += len(unchanged)
+
+    counts["duplicates"] = link_near_duplicates(db, written_ids)
+    return counts
+
+
+def link_near_duplicates(db: Session, job_ids: list[int]) -> int:
+    """
+    (Re)decide canonical_job_id for `job_ids` from their stored signatures.
+
+    Per chunk: one GIN lookup (lsh_bands && chunk's band keys) fetches every
+    candidate, then an in-memory NearDuplicateIndex replays chunk rows and
+    candidates in id order — a posting can only link to an EARLIER one, and
+    rows outside the chunk keep the link they already have. Rows that become
+    duplicates take their own duplicates along, so links never chain.
+
+    Processing all ids in ascending order (python -m app.dedupe) rebuilds
+    the links over history exactly; ingest calls it for just the rows it
+    wrote. Does NOT commit. Returns how many of `job_ids` are duplicates.
+    """
+    Job = models.Job
+    ids = sorted(set(job_ids))
+    duplicates = 0
+    columns = (Job.id, Job.title, Job.minhash, Job.lsh_bands, Job.canonical_job_id)
+
+    for start in range(0, len(ids), BULK_UPSERT_CHUNK):
+        chunk = ids[start:start + BULK_UPSERT_CHUNK]
+        batch = db.execute(select(*columns).where(Job.id.in_(chunk))).all()
+        bands = sorted({band for row in batch for band in row.lsh_bands or ()})
+        # Closed postings are never canonicals — a repost starts a new cluster
+        candidates = db.execute(
+            select(*columns).where(Job.lsh_bands.overlap(bands), Job.is_active, Job.id.notin_(chunk))
+        ).all() if bands else []
+
+        mine = {row.id for row in batch}
+        index = NearDuplicateIndex()
+        changes = []
+        for row in sorted([*batch, *candidates], key=lambda r: r.id):
+            if row.id not in mine:
+                index.add_known(row.id, row.minhash, row.title, row.canonical_job_id, row.lsh_bands)
+                continue
+            canonical = index.add(row.id, row.minhash, row.title, row.lsh_bands)
+            if canonical is not None:
+                duplicates += 1
+            if canonical != row.canonical_job_id:
+                changes.append({"id": row.id, "canonical_job_id": canonical})
+
+        if changes:
+            db.execute(update(Job), changes)
+            for change in changes:
+                if change["canonical_job_id"] is not None:
+                    db.execute(
+                        update(Job)
+                        .where(Job.canonical_job_id == change["id"])
+                        .values(canonical_job_id=change["canonical_job_id"])
+                        .execution_options(synchronize_session=False)
+                    )
+
+    return duplicates
+
+
+def touch_source_jobs(db: Session, source: str, seen_since: datetime | None = None) -> int:
+    """
+    Mark every open job from an unchanged board as seen now — one UPDATE.
+
+    Used when a board answers 304 / returns the same payload as last run,
+    and for postings an incremental fetch skipped. seen_since (the feed's
+    last full sync) limits it to jobs that feed still listed then, so
+    postings that dropped off stay unseen and close as stale
+    (app/core/lifecycle.py). Closed jobs are never touched.
+
+    Does NOT commit. Returns rows touched.
+    """
+    Job = models.Job
+    stmt = update(Job).where(Job.source == source, Job.is_active)
+    if seen_since is not None:
+        stmt = stmt.where(Job.last_seen_at >= seen_since)
+    result = db.execute(
+        stmt.values(last_seen_at=datetime.utcnow()).execution_options(synchronize_session=False)
+    )
+    return result.rowcount or 0
+
 def list_jobs(
     db: Session,
     q: str | None = None,
@@ -48,7 +392,8 @@ def list_jobs(
     limit: int = 100,
     offset: int = 0
 ) -> list[models.Job]:
-    stmt = select(models.Job)
+    # Open postings only; near-duplicates are hidden behind their canonical
+    stmt = select(models.Job).where(live_jobs_clause())
     if days:
         cutoff = datetime.utcnow() - timedelta(days=days)
         stmt = stmt.where(models.Job.scraped_at >= cutoff)
@@ -68,6 +413,22 @@ def get_job(db: Session, job_id: int):
     from app.core.models import Job
     return db.query(Job).filter(Job.id == job_id).first()
 
+def location_clause(location: str):
+    """
+    WHERE clause for a location filter: an indexed lookup on the structured
+    location columns when the term is a known region/country/scope,
+    otherwise a substring match on the raw location.
+    """
+    Job = models.Job
+    target = location_filter_target(location)
+    if target is None:
+        return func.lower(Job.location).like(f"%{location.lower()}%")
+    column, values = target
+    if column == "remote_scope":
+        return Job.remote_scope.in_(values)
+    return getattr(Job, column).contains(values)
+
+
 def list_jobs_paginated(
     db: Session,
     q: str | None = None,
@@ -78,7 +439,7 @@ def list_jobs_paginated(
     location: str | None = None,
     remote: bool | None = None,
 ):
-    stmt = select(models.Job)
+    stmt = select(models.Job).where(live_jobs_clause())
     
     # Apply filters
     if days:
@@ -101,7 +462,7 @@ def list_jobs_paginated(
         ).params(skill_pattern=skill_pattern)
     
     if location:
-        stmt = stmt.where(func.lower(models.Job.location).like(f"%{location.lower()}%"))
+        stmt = stmt.where(location_clause(location))
     
     if remote is not None:
         stmt = stmt.where(models.Job.remote_flag.is_(remote))
@@ -52,12 +52,165 @@ def init_db() -> None:
     """Initialize database tables"""
     from . import models
     from app.services.auth import models as auth_models
+    from app.ingest import models as ingest_models
     Base.metadata.create_all(bind=engine)
 
 
+def ensure_columns(conn: Connection) -> None:
+    """
+    Add columns introduced after the table was first created.
+
+    create_all() never alters existing tables, so new columns are added here
+    (idempotent) and backfilled before their indexes are built.
+    """
+    conn.execute(text("ALTER TABLE jobs ADD COLUMN IF NOT EXISTS dedupe_key VARCHAR(32)"))
+    conn.execute(text("ALTER TABLE jobs ADD COLUMN IF NOT EXISTS source VARCHAR(128)"))
+    conn.execute(text("ALTER TABLE jobs ADD COLUMN IF NOT EXISTS content_hash VARCHAR(64)"))
+    conn.execute(text("ALTER TABLE jobs ADD COLUMN IF NOT EXISTS content_changed_at TIMESTAMP"))
+    conn.execute(text("ALTER TABLE jobs ADD COLUMN IF NOT EXISTS regions TEXT[]"))
+    conn.execute(text("ALTER TABLE jobs ADD COLUMN IF NOT EXISTS country_codes TEXT[]"))
+    conn.execute(text("ALTER TABLE jobs ADD COLUMN IF NOT EXISTS remote_scope VARCHAR(16)"))
+    conn.execute(text("ALTER TABLE jobs ADD COLUMN IF NOT EXISTS minhash INTEGER[]"))
+    conn.execute(text("ALTER TABLE jobs ADD COLUMN IF NOT EXISTS lsh_bands TEXT[]"))
+    conn.execute(text("ALTER TABLE jobs ADD COLUMN IF NOT EXISTS canonical_job_id INTEGER"))
+    conn.execute(text("ALTER TABLE jobs ADD COLUMN IF NOT EXISTS is_active BOOLEAN NOT NULL DEFAULT TRUE"))
+    conn.execute(text("ALTER TABLE jobs ADD COLUMN IF NOT EXISTS closed_at TIMESTAMP"))
+    conn.execute(text("ALTER TABLE jobs ADD COLUMN IF NOT EXISTS close_reason VARCHAR(16)"))
+
+    # Backfill dedupe_key (mirrors crud.job_dedupe_key). Legacy duplicates
+    # keep NULL on all but the newest row so the unique index can be built.
+    # Keys from before the no-URL rule (title|company| for rows without a
+    # canonical_url) are cleared first and rebuilt with source|apply_url;
+    # rows with no URL at all keep NULL.
+    conn.execute(text(f"""
+        UPDATE jobs SET dedupe_key = NULL
+        WHERE {_norm('canonical_url')} = ''
+          AND dedupe_key = md5({_norm('title')} || '|' || {_norm('company')} || '|')
+    """))
+    conn.execute(text(f"""
+        UPDATE jobs SET dedupe_key = k.key
+        FROM (
+            SELECT DISTINCT ON (key) id, key
+            FROM (
+                SELECT id, CASE
+                    WHEN {_norm('canonical_url')} <> '' THEN md5(
+                        {_norm('title')} || '|' || {_norm('company')} || '|' || {_norm('canonical_url')}
+                    )
+                    WHEN {_norm('apply_url')} <> '' THEN md5(
+                        {_norm('title')} || '|' || {_norm('company')} || '||' ||
+                        {_norm('source')} || '|' || {_norm('apply_url')}
+                    )
+                END AS key
+                FROM jobs
+                WHERE dedupe_key IS NULL
+            ) s
+            WHERE key IS NOT NULL
+            ORDER BY key, id DESC
+        ) k
+        WHERE jobs.id = k.id
+          AND NOT EXISTS (SELECT 1 FROM jobs j2 WHERE j2.dedupe_key = k.key)
+    """))
+    conn.commit()
+
+    _backfill_locations(conn)
+    _renormalize_state_locations(conn)
+    # Signatures for older rows are not backfilled here (too slow for
+    # startup) — run `python -m app.dedupe` once over history.
+
+
+def _norm(column: str) -> str:
+    """SQL for crud.job_dedupe_key's normalization: lower, whitespace-collapsed."""
+    return f"lower(trim(regexp_replace(coalesce({column}, ''), '\\s+', ' ', 'g')))"
+
+
+def _backfill_locations(conn: Connection, batch: int = 2000) -> None:
+    """
+    Fill regions/country_codes/remote_scope for rows ingested before they
+    existed. Normalization is Python (app/core/locations.py), so this pages
+    through the rows in id order; remote_scope stays NULL only for rows
+    with nothing to normalize, so finished rows aren't re-read.
+    """
+    from .locations import normalize_location
+
+    last_id = 0
+    while True:
+        rows = conn.execute(text("""
+            SELECT id, location, remote_flag FROM jobs
+            WHERE remote_scope IS NULL AND regions IS NULL AND id > :last_id
+            ORDER BY id LIMIT :batch
+        """), {"last_id": last_id, "batch": batch}).fetchall()
+        if not rows:
+            break
+        conn.execute(
+            text("""
+                UPDATE jobs SET regions = :regions, country_codes = :country_codes,
+                                remote_scope = :remote_scope
+                WHERE id = :id
+            """),
+            [{"id": r.id, **normalize_location(r.location, r.remote_flag)} for r in rows],
+        )
+        conn.commit()
+        last_id = rows[-1].id
+
+
+def _renormalize_state_locations(conn: Connection) -> None:
+    """
+    Re-run normalization on "City, XX" rows that got "us" next to another
+    country — before the fix, "Toronto, CA" was {ca,us} and "Paris, TX"
+    {fr,us}. Content-identical re-ingests don't rewrite these columns, so
+    they'd stay wrong. Rows that really are multi-country just get the
+    same values again.
+    """
+    from .locations import normalize_location
+
+    rows = conn.execute(text("""
+        SELECT id, location, remote_flag FROM jobs
+        WHERE 'us' = ANY(country_codes) AND cardinality(country_codes) > 1
+          AND location ~ ',\\s*[A-Z]{2}\\s*($|[,;/(|-])'
+    """)).fetchall()
+    if not rows:
+        return
+    conn.execute(
+        text("""
+            UPDATE jobs SET regions = :regions, country_codes = :country_codes,
+                            remote_scope = :remote_scope
+            WHERE id = :id
+        """),
+        [{"id": r.id, **normalize_location(r.location, r.remote_flag)} for r in rows],
+    )
+    conn.commit()
+
+
 def ensure_indexes(conn: Connection) -> None:
     """Create indexes for better query performance"""
     conn.execute(text("CREATE INDEX IF NOT EXISTS idx_jobs_company ON jobs (company)"))
     conn.execute(text("CREATE INDEX IF NOT EXISTS idx_jobs_posted_at ON jobs (posted_at)"))
     conn.execute(text("CREATE INDEX IF NOT EXISTS idx_jobs_scraped_at ON jobs (scraped_at)"))
+    conn.execute(text("CREATE UNIQUE INDEX IF NOT EXISTS ix_jobs_dedupe_key ON jobs (dedupe_key)"))
+    conn.execute(text("CREATE INDEX IF NOT EXISTS ix_jobs_source ON jobs (source)"))
+    conn.execute(text("CREATE INDEX IF NOT EXISTS ix_jobs_content_changed_at ON jobs (content_changed_at)"))
+    conn.execute(text("CREATE INDEX IF NOT EXISTS ix_jobs_regions ON jobs USING gin (regions)"))
+    conn.execute(text("CREATE INDEX IF NOT EXISTS ix_jobs_country_codes ON jobs USING gin (country_codes)"))
+    conn.execute(text("CREATE INDEX IF NOT EXISTS ix_jobs_remote_scope ON jobs (remote_scope)"))
+    conn.execute(text("CREATE INDEX IF NOT EXISTS ix_jobs_lsh_bands ON jobs USING gin (lsh_bands)"))
+    conn.execute(text("CREATE INDEX IF NOT EXISTS ix_jobs_canonical_job_id ON jobs (canonical_job_id)"))
+
+    # Partial indexes for live rows (app/core/lifecycle.py). Listing/matching
+    # predicates must include "is_active AND canonical_job_id IS NULL" for
+    # the planner to use the first two.
+    conn.execute(text("""
+        CREATE INDEX IF NOT EXISTS ix_jobs_live_scraped_at ON jobs (scraped_at DESC)
+        WHERE is_active AND canonical_job_id IS NULL
+    """))
+    conn.execute(text("""
+        CREATE INDEX IF NOT EXISTS ix_jobs_live_posted_at ON jobs (posted_at DESC NULLS LAST, scraped_at DESC)
+        WHERE is_active AND canonical_job_id IS NULL
+    """))
+    # close_missing / close_stale: a board's open jobs by last_seen_at
+    conn.execute(text("""
+        CREATE INDEX IF NOT EXISTS ix_jobs_active_source_seen ON jobs (source, last_seen_at)
+        WHERE is_active
+    """))
+    # archive_closed: oldest closed first
+    conn.execute(text("CREATE INDEX IF NOT EXISTS ix_jobs_closed_at ON jobs (closed_at) WHERE NOT is_active"))
     conn.commit()
\ No newline at end of file
@@ -0,0 +1,239 @@
+"""
+app/core/lifecycle.py
+
+Job lifecycle: open → closed → archived.
+
+WHY: listings only filtered on a scraped_at window, so a posting taken
+down at the source stayed on the board (and in matching/scoring) until it
+aged out, and email/tasks filtered on a Job.is_active that didn't exist.
+Now every job has is_active / closed_at / close_reason:
+
+- close_missing: a COMPLETE board fetch (Greenhouse, Lever, Ashby — they
+  return every open posting) closes the board's jobs it no longer
+  contains ("missing"). Rows the fetch wrote have last_seen_at >= the
+  fetch's seen_at, so that's one UPDATE, no key list.
+- close_stale: windowed feeds (Remotive, RemoteOK, …) can't prove a
+  posting is gone, so their jobs close once last_seen_at is older than
+  max(LIFECYCLE_STALE_HOURS, LIFECYCLE_STALE_INTERVALS x the source's
+  polling interval) ("stale"). Sources whose last run failed are skipped —
+  an outage is not a takedown.
+- close_filtered: a Bronze replay after a location_filter change
+  (app/replay.py) closes live rows whose stored copy the new rules reject
+  ("filtered").
+- promote_duplicates: when a canonical posting closes, its earliest
+  still-open near-duplicate becomes the canonical (app/core/near_duplicates.py).
+- archive_closed: jobs closed for LIFECYCLE_ARCHIVE_DAYS move to
+  jobs_archive (whole row as JSONB) and their user_job_scores go. Jobs a
+  user applied to / saved / generated documents for stay: those foreign
+  keys cascade on delete.
+
+A closed job that shows up again is reopened by the upsert.
+
+Listing, matching and scoring read live rows only (crud.live_jobs_clause,
+"is_active AND canonical_job_id IS NULL" in raw SQL), backed by the partial
+indexes in db.ensure_indexes.
+"""
+
+import os
+from datetime import datetime, timedelta
+from sqlalchemy import select, update, func, text, values, column, String, DateTime
+from sqlalchemy.orm import Session
+
+from . import models
+
+STALE_HOURS = float(os.getenv("LIFECYCLE_STALE_HOURS", "72"))
+STALE_INTERVALS = float(os.getenv("LIFECYCLE_STALE_INTERVALS", "3"))
+ARCHIVE_DAYS = float(os.getenv("LIFECYCLE_ARCHIVE_DAYS", "30"))
+ARCHIVE_BATCH = int(os.getenv("LIFECYCLE_ARCHIVE_BATCH", "1000"))
+
+# Rows per VALUES list in close_filtered
+_FILTERED_CHUNK = 1000
+
+# Run statuses after which a source's jobs may be judged stale
+_HEALTHY = ("ok", "not_modified")
+
+# Tables whose job_id rows would be cascade-deleted with the job (or left
+# dangling) — a job referenced here is never archived
+_USER_REFERENCES = (
+    "applications", "saved_jobs", "generated_cover_letters",
+    "generated_resumes", "interview_preps", "resume_analyses",
+)
+
+
+def _close(reason: str, now: datetime) -> dict:
+    return {"is_active": False, "closed_at": now, "close_reason": reason}
+
+
+def close_missing(db: Session, source: str, seen_at: datetime) -> int:
+    """
+    Close `source`'s open jobs not seen since `seen_at` (the start of a
+    complete board fetch). Does NOT commit. Returns rows closed.
+    """
+    Job = models.Job
+    result = db.execute(
+        update(Job)
+        .where(Job.source == source, Job.is_active, Job.last_seen_at < seen_at)
+        .values(**_close("missing", datetime.utcnow()))
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount or 0
+
+
+def stale_cutoffs(db: Session, now: datetime | None = None) -> dict[str, datetime]:
+    """last_seen_at cutoff per healthy source (from its adaptive polling interval)."""
+    from app.ingest.models import SourceSchedule
+
+    now = now or datetime.utcnow()
+    cutoffs = {}
+    for source, interval, status in db.execute(
+        select(SourceSchedule.source, SourceSchedule.interval_minutes, SourceSchedule.last_status)
+    ):
+        if status not in _HEALTHY:
+            continue
+        window = max(STALE_HOURS * 60, STALE_INTERVALS * (interval or 0))
+        cutoffs[source] = now - timedelta(minutes=window)
+    return cutoffs
+
+
+def close_stale(db: Session, now: datetime | None = None) -> int:
+    """
+    Close open jobs whose source hasn't delivered them within its stale
+    window — one UPDATE joined against a VALUES list of per-source cutoffs.
+    Does NOT commit. Returns rows closed.
+    """
+    Job = models.Job
+    now = now or datetime.utcnow()
+    # Rows from before jobs.source existed: plain STALE_HOURS
+    closed = db.execute(
+        update(Job)
+        .where(Job.source.is_(None), Job.is_active, Job.last_seen_at < now - timedelta(hours=STALE_HOURS))
+        .values(**_close("stale", now))
+        .execution_options(synchronize_session=False)
+    ).rowcount or 0
+
+    cutoffs = stale_cutoffs(db, now)
+    if not cutoffs:
+        return closed
+    windows = values(
+        column("source", String), column("cutoff", DateTime), name="windows"
+    ).data(list(cutoffs.items()))
+    result = db.execute(
+        update(Job)
+        .where(Job.source == windows.c.source, Job.is_active, Job.last_seen_at < windows.c.cutoff)
+        .values(**_close("stale", now))
+        .execution_options(synchronize_session=False)
+    )
+    return closed + (result.rowcount or 0)
+
+
+def close_filtered(db: Session, rejected: dict[str, str], now: datetime | None = None) -> int:
+    """
+    Close open jobs the location filter now rejects. `rejected` maps
+    dedupe_key → content_hash of the rejected copy; a row only closes if
+    it still holds that content (a newer copy that passes stays live).
+    One UPDATE per chunk joined against a VALUES list. Does NOT commit.
+    Returns rows closed.
+    """
+    Job = models.Job
+    now = now or datetime.utcnow()
+    items = list(rejected.items())
+    closed = 0
+    for start in range(0, len(items), _FILTERED_CHUNK):
+        keys = values(
+            column("dedupe_key", String), column("content_hash", String), name="rejected"
+        ).data(items[start:start + _FILTERED_CHUNK])
+        result = db.execute(
+            update(Job)
+            .where(
+                Job.dedupe_key == keys.c.dedupe_key,
+                Job.content_hash == keys.c.content_hash,
+                Job.is_active,
+            )
+            .values(**_close("filtered", now))
+            .execution_options(synchronize_session=False)
+        )
+        closed += result.rowcount or 0
+    return closed
+
+
+def promote_duplicates(db: Session) -> int:
+    """
+    Re-point open near-duplicates of closed canonicals at their earliest
+    open sibling (which becomes canonical). Does NOT commit. Returns rows moved.
+    """
+    result = db.execute(text("""
+        WITH heirs AS (
+            SELECT d.canonical_job_id AS closed_id, MIN(d.id) AS heir
+            FROM jobs d JOIN jobs c ON c.id = d.canonical_job_id
+            WHERE d.is_active AND NOT c.is_active
+            GROUP BY d.canonical_job_id
+        )
+        UPDATE jobs SET canonical_job_id = NULLIF(h.heir, jobs.id)
+        FROM heirs h
+        WHERE jobs.canonical_job_id = h.closed_id AND jobs.is_active
+    """))
+    return result.rowcount or 0
+
+
+def archive_closed(db: Session, older_than_days: float = ARCHIVE_DAYS, batch: int = ARCHIVE_BATCH) -> int:
+    """
+    Move jobs closed more than `older_than_days` ago into jobs_archive, in
+    batches of `batch` (one statement each: pick → drop scores → delete →
+    insert). COMMITS per batch. Returns rows archived.
+    """
+    cutoff = datetime.utcnow() - timedelta(days=older_than_days)
+    unreferenced = " ".join(
+        f"AND NOT EXISTS (SELECT 1 FROM {table} r WHERE r.job_id = jobs.id)"
+        for table in _USER_REFERENCES
+    )
+    stmt = text(f"""
+        WITH victims AS (
+            SELECT id FROM jobs
+            WHERE NOT is_active AND closed_at < :cutoff {unreferenced}
+            ORDER BY closed_at
+            LIMIT :batch
+            FOR UPDATE SKIP LOCKED
+        ), scores AS (
+            DELETE FROM user_job_scores s USING victims v WHERE s.job_id = v.id
+        ), moved AS (
+            DELETE FROM jobs j USING victims v WHERE j.id = v.id RETURNING j.*
+        )
+        INSERT INTO jobs_archive
+            (id, source, dedupe_key, title, company, closed_at, close_reason, archived_at, data)
+        SELECT id, source, dedupe_key, title, company, closed_at, close_reason, :now, to_jsonb(moved)
+        FROM moved
+        ON CONFLICT (id) DO NOTHING
+    """)
+    archived = 0
+    while True:
+        moved = db.execute(stmt, {"cutoff": cutoff, "batch": batch, "now": datetime.utcnow()}).rowcount or 0
+        db.commit()
+        archived += moved
+        if moved < batch:
+            return archived
+
+
+def run_lifecycle(db: Session) -> dict[str, int]:
+    """
+    End-of-run maintenance: stale → promote → archive.
+
+    Returns {"closed_stale", "promoted", "archived"}.
+    """
+    closed = close_stale(db)
+    promoted = promote_duplicates(db)
+    db.commit()
+    archived = archive_closed(db)
+    return {"closed_stale": closed, "promoted": promoted, "archived": archived}
+
+
+def lifecycle_stats(db: Session) -> dict:
+    """Open / closed-by-reason / archived counts for /admin/status."""
+    Job = models.Job
+    closed = dict(db.execute(
+        select(Job.close_reason, func.count()).where(~Job.is_active).group_by(Job.close_reason)
+    ).all())
+    return {
+        "active": db.scalar(select(func.count()).select_from(Job).where(Job.is_active)) or 0,
+        "closed": {reason or "unknown": n for reason, n in closed.items()},
+        "archived": db.scalar(select(func.count()).select_from(models.JobArchive)) or 0,
+    }
@@ -1,5 +1,36 @@
+"""
+Worldwide-remote location filter.
+
+WHY compiled: filter_worldwide_jobs runs this for every fetched posting.
+The keyword lists used to be scanned one substring at a time and the
+description patterns recompiled per call. Each list is now a single
+alternation compiled once, so one regex pass per field finds every match.
+
+WHY word boundaries: bare substrings matched inside unrelated words
+("uk" in "Milwaukee", "eu" in "Neuquén"). A
+keyword only matches when it is not part of a longer word. The US-only
+keywords still take the suffixes the old substring scan matched through
+("remote - us" → "Remote - USA", "us citizen" → "US citizens"), see
+_US_SUFFIXES.
+
+classify_location returns a decision dict, so every accept/reject can be
+explained (and logged to the DLQ) with the rule that fired:
+    {"accept": bool, "rule": str, "match": str | None, "field": str | None}
+
+Rules, checked in order:
+    no_location      empty location                    → reject
+    us_only          US_ONLY_KEYWORDS in location      → reject
+    worldwide        WORLDWIDE_KEYWORDS in location    → accept
+    emea             EMEA_KEYWORDS in location         → accept
+    remote           plain "remote" in location        → accept
+    us_requirement   US work requirement in description → reject
+    default          nothing matched                   → accept (inclusive)
+
+Regression corpus + benchmark: benchmarks/bench_location.py
+"""
+
 import re
-from typing import Optional
+from typing import Optional, Iterable
 
 # Keywords that indicate US-only remote positions
 US_ONLY_KEYWORDS = [
@@ -50,9 +81,108 @@ EMEA_KEYWORDS = [
     "portugal",
     "italy",
     "poland",
-    "remote",  # Just "remote" with no qualifier
 ]
 
+# Just "remote" with no qualifier — accepted (most remote jobs are flexible)
+REMOTE_KEYWORDS = [
+    "remote",
+]
+
+# Description phrases that make a job US-only
+US_REQUIREMENT_PATTERNS = [
+    r"must be (?:located|based|residing) in (?:the )?usa?",
+    r"us work authorization required",
+    r"authorized to work in (?:the )?usa?",
+    r"us citizens only",
+    r"only considering us-based",
+]
+
+
+# Keyword ending → optional suffix it may carry ("us" → "usa", "citizen" → "citizens")
+_US_SUFFIXES = {"us": "a?", "citizen": "s?"}
+
+
+def _compile(keywords: Iterable[str], suffixes: dict[str, str] | None = None) -> re.Pattern:
+    """One alternation, longest first, that only matches whole words."""
+    def term(keyword: str) -> str:
+        for ending, suffix in (suffixes or {}).items():
+            if keyword.endswith(ending):
+                return re.escape(keyword) + suffix
+        return re.escape(keyword)
+
+    alternation = "|".join(term(k) for k in sorted(keywords, key=len, reverse=True))
+    return re.compile(rf"(?<!\w)(?:{alternation})(?!\w)", re.IGNORECASE)
+
+
+# Location rules in precedence order: (rule, pattern, accept)
+_LOCATION_RULES = [
+    ("us_only", _compile(US_ONLY_KEYWORDS, _US_SUFFIXES), False),
+    ("worldwide", _compile(WORLDWIDE_KEYWORDS), True),
+    ("emea", _compile(EMEA_KEYWORDS), True),
+    ("remote", _compile(REMOTE_KEYWORDS), True),
+]
+_US_REQUIREMENT_RE = re.compile(
+    r"(?<!\w)(?:" + "|".join(US_REQUIREMENT_PATTERNS) + r")(?!\w)", re.IGNORECASE
+)
+
+
+def _decision(accept: bool, rule: str, match: str | None = None, field: str | None = None) -> dict:
+    return {"accept": accept, "rule": rule, "match": match, "field": field}
+
+
+def _classify_location_only(location: str) -> dict | None:
+    """Decision from the location field alone, None if no rule matched."""
+    for rule, pattern, accept in _LOCATION_RULES:
+        m = pattern.search(location)
+        if m:
+            return _decision(accept, rule, m.group(0).lower(), "location")
+    return None
+
+
+def _classify_description(description: Optional[str]) -> dict:
+    """Fallback when the location matched no rule."""
+    m = _US_REQUIREMENT_RE.search(description) if description else None
+    if m:
+        return _decision(False, "us_requirement", m.group(0).lower(), "description")
+    return _decision(True, "default")
+
+
+def classify_location(location: Optional[str], description: Optional[str] = None) -> dict:
+    """
+    Decide whether a job is worldwide/EMEA remote (accept) or US-only /
+    unclear (reject), and which rule decided it. See the module docstring.
+    """
+    if not location:
+        return _decision(False, "no_location")
+    return _classify_location_only(location) or _classify_description(description)
+
+
+def classify_many(
+    jobs: Iterable[dict],
+    location_key: str = "location",
+    description_key: str = "description_text",
+    clean: bool = True,
+) -> list[dict]:
+    """
+    classify_location over a batch of job dicts, in order (locations are
+    passed through clean_location first unless clean=False).
+
+    Cleaning and the location rules run once per distinct location string —
+    a board batch repeats the same handful ("Remote", "Remote - EMEA"...) —
+    and only jobs whose location decided nothing reach the description scan.
+    """
+    memo: dict[str, dict | None] = {}
+    out = []
+    for job in jobs:
+        location = job.get(location_key) or ""
+        if location not in memo:
+            cleaned = clean_location(location) if clean else location
+            memo[location] = (
+                _classify_location_only(cleaned) if cleaned else _decision(False, "no_location")
+            )
+        out.append(memo[location] or _classify_description(job.get(description_key)))
+    return out
+
 
 def is_worldwide_remote(location: Optional[str], description: Optional[str] = None) -> bool:
     """
@@ -62,52 +192,11 @@ def is_worldwide_remote(location: Optional[str], description: Optional[str] = No
         True if worldwide/EMEA remote
         False if US-only or unclear
     """
-    if not location:
-        return False
-    
-    location_lower = location.lower()
-    desc_lower = (description or "").lower()
-    
-    # FIRST: Check if it's explicitly US-only (REJECT)
-    for keyword in US_ONLY_KEYWORDS:
-        if keyword in location_lower:
-            return False
-    
-    # SECOND: Check for worldwide/global indicators (ACCEPT)
-    for keyword in WORLDWIDE_KEYWORDS:
-        if keyword in location_lower:
-            return True
-    
-    # THIRD: Check for EMEA indicators (ACCEPT)
-    for keyword in EMEA_KEYWORDS:
-        if keyword in location_lower:
-            return True
-    
-    # FOURTH: Check description for US-only requirements (REJECT)
-    us_requirement_patterns = [
-        r"must be (located|based|residing) in (the )?us",
-        r"us work authorization required",
-        r"authorized to work in (the )?us",
-        r"us citizens only",
-        r"only considering us-based",
-    ]
-    
-    for pattern in us_requirement_patterns:
-        if re.search(pattern, desc_lower):
-            return False
-    
-    # FIFTH: If location just says "Remote" with no qualifier
-    # Check description for worldwide/global indicators
-    if location_lower.strip() in ["remote", "remote only", "fully remote"]:
-        # If description mentions worldwide/global, accept
-        for keyword in WORLDWIDE_KEYWORDS:
-            if keyword in desc_lower:
-                return True
-        # If no qualifier, accept (most remote jobs are flexible)
-        return True
-    
-    # DEFAULT: If uncertain, accept (to be inclusive)
-    return True
+    return classify_location(location, description)["accept"]
+
+
+_PARENS_RE = re.compile(r'\(.*?\)')
+_SPACES_RE = re.compile(r'\s+')
 
 
 def clean_location(location: str) -> str:
@@ -116,7 +205,7 @@ def clean_location(location: str) -> str:
         return location
     
     # Remove common noise
-    location = re.sub(r'\(.*?\)', '', location)  # Remove parentheses content temporarily
-    location = re.sub(r'\s+', ' ', location)  # Normalize whitespace
+    location = _PARENS_RE.sub('', location)  # Remove parentheses content temporarily
+    location = _SPACES_RE.sub(' ', location)  # Normalize whitespace
     
     return location.strip()
\ No newline at end of file
@@ -0,0 +1,235 @@
+"""
+Structured location normalization.
+
+WHY: jobs.location is free text, so the /jobs/page and matching filters
+were LOWER(location) LIKE '%x%' — a sequential scan on every request, for
+one of the most-used filters. Ingest now normalizes each location into:
+
+    regions        text[]  e.g. {europe,eu,emea}     (GIN index)
+    country_codes  text[]  ISO 3166-1 alpha-2, {de}  (GIN index)
+    remote_scope   str     worldwide | regional | country | remote |
+                           hybrid | onsite           (btree index)
+
+and a location filter is resolved to one of those columns
+(location_filter_target): "europe" → regions @> {europe}, "germany" →
+country_codes @> {de}, "remote" → remote_scope IN (...). Only terms we
+can't resolve (city names we don't know) fall back to LIKE.
+
+Regions are expanded upwards — a German job is also europe, eu and emea —
+so a region filter is a single containment check.
+"""
+
+import re
+from typing import Optional
+
+REGIONS = {
+    "worldwide", "emea", "europe", "eu", "africa", "middle_east",
+    "americas", "north_america", "latam", "apac", "asia",
+}
+
+# Region aliases → region codes (a match adds all of them)
+REGION_ALIASES = {
+    "worldwide": ["worldwide"],
+    "global": ["worldwide"],
+    "anywhere": ["worldwide"],
+    "international": ["worldwide"],
+    "work from anywhere": ["worldwide"],
+    "emea": ["emea"],
+    "europe": ["europe", "emea"],
+    "european": ["europe", "emea"],
+    "eu": ["eu", "europe", "emea"],
+    "european union": ["eu", "europe", "emea"],
+    "cet": ["europe", "emea"],
+    "africa": ["africa", "emea"],
+    "middle east": ["middle_east", "emea"],
+    "mena": ["middle_east", "africa", "emea"],
+    "americas": ["americas"],
+    "north america": ["north_america", "americas"],
+    "latam": ["latam", "americas"],
+    "latin america": ["latam", "americas"],
+    "south america": ["latam", "americas"],
+    "apac": ["apac"],
+    "asia": ["asia", "apac"],
+    "asia pacific": ["apac"],
+}
+
+# Country code → regions it belongs to
+_EU = ["eu", "europe", "emea"]
+_EUROPE = ["europe", "emea"]
+_AFRICA = ["africa", "emea"]
+_MIDDLE_EAST = ["middle_east", "emea"]
+_LATAM = ["latam", "americas"]
+_NA = ["north_america", "americas"]
+_ASIA = ["asia", "apac"]
+
+COUNTRY_REGIONS = {
+    "at": _EU, "be": _EU, "bg": _EU, "hr": _EU, "cy": _EU, "cz": _EU, "dk": _EU,
+    "ee": _EU, "fi": _EU, "fr": _EU, "de": _EU, "gr": _EU, "hu": _EU, "ie": _EU,
+    "it": _EU, "lv": _EU, "lt": _EU, "lu": _EU, "mt": _EU, "nl": _EU, "pl": _EU,
+    "pt": _EU, "ro": _EU, "sk": _EU, "si": _EU, "es": _EU, "se": _EU,
+    "gb": _EUROPE, "ch": _EUROPE, "no": _EUROPE, "ua": _EUROPE, "rs": _EUROPE, "tr": _EUROPE,
+    "ng": _AFRICA, "ke": _AFRICA, "za": _AFRICA, "gh": _AFRICA, "eg": _AFRICA + _MIDDLE_EAST,
+    "ma": _AFRICA, "rw": _AFRICA, "ug": _AFRICA, "tz": _AFRICA, "et": _AFRICA,
+    "ae": _MIDDLE_EAST, "sa": _MIDDLE_EAST, "il": _MIDDLE_EAST, "qa": _MIDDLE_EAST,
+    "us": _NA, "ca": _NA, "mx": _NA + ["latam"],
+    "br": _LATAM, "ar": _LATAM, "co": _LATAM, "cl": _LATAM, "pe": _LATAM, "uy": _LATAM,
+    "in": _ASIA, "sg": _ASIA, "jp": _ASIA, "ph": _ASIA, "id": _ASIA, "vn": _ASIA,
+    "my": _ASIA, "pk": _ASIA, "kr": _ASIA, "cn": _ASIA,
+    "au": ["apac"], "nz": ["apac"],
+}
+
+# Names, demonyms and common abbreviations → country code
+COUNTRY_ALIASES = {
+    "austria": "at", "belgium": "be", "bulgaria": "bg", "croatia": "hr", "cyprus": "cy",
+    "czech republic": "cz", "czechia": "cz", "denmark": "dk", "estonia": "ee",
+    "finland": "fi", "france": "fr", "germany": "de", "deutschland": "de",
+    "greece": "gr", "hungary": "hu", "ireland": "ie", "italy": "it", "latvia": "lv",
+    "lithuania": "lt", "luxembourg": "lu", "malta": "mt",
+    "netherlands": "nl", "the netherlands": "nl", "poland": "pl", "portugal": "pt",
+    "romania": "ro", "slovakia": "sk", "slovenia": "si", "spain": "es", "sweden": "se",
+    "uk": "gb", "u.k.": "gb", "united kingdom": "gb", "great britain": "gb",
+    "england": "gb", "scotland": "gb",
+    "switzerland": "ch", "norway": "no", "ukraine": "ua", "serbia": "rs",
+    "turkey": "tr", "türkiye": "tr",
+    "nigeria": "ng", "kenya": "ke", "south africa": "za", "ghana": "gh", "egypt": "eg",
+    "morocco": "ma", "rwanda": "rw", "uganda": "ug", "tanzania": "tz", "ethiopia": "et",
+    "uae": "ae", "united arab emirates": "ae", "saudi arabia": "sa", "israel": "il",
+    "qatar": "qa",
+    "us": "us", "u.s.": "us", "usa": "us", "united states": "us",
+    "united states of america": "us", "canada": "ca", "mexico": "mx",
+    "brazil": "br", "argentina": "ar", "colombia": "co", "chile": "cl", "peru": "pe",
+    "uruguay": "uy",
+    "india": "in", "singapore": "sg", "japan": "jp", "philippines": "ph",
+    "indonesia": "id", "vietnam": "vn", "malaysia": "my", "pakistan": "pk",
+    "south korea": "kr", "korea": "kr", "china": "cn",
+    "australia": "au", "new zealand": "nz",
+}
+
+# Hub cities → country code. Fills country_codes at ingest only — a city
+# filter stays a LIKE on the city, not a match on its whole country
+CITY_COUNTRIES = {
+    "vienna": "at", "brussels": "be", "sofia": "bg", "prague": "cz", "copenhagen": "dk",
+    "tallinn": "ee", "helsinki": "fi", "paris": "fr", "berlin": "de", "munich": "de",
+    "hamburg": "de", "athens": "gr", "budapest": "hu", "dublin": "ie", "milan": "it",
+    "rome": "it", "vilnius": "lt", "amsterdam": "nl", "warsaw": "pl", "krakow": "pl",
+    "lisbon": "pt", "porto": "pt", "bucharest": "ro", "madrid": "es", "barcelona": "es",
+    "stockholm": "se", "london": "gb", "manchester": "gb", "zurich": "ch", "oslo": "no",
+    "kyiv": "ua", "belgrade": "rs", "istanbul": "tr",
+    "lagos": "ng", "abuja": "ng", "nairobi": "ke", "cape town": "za",
+    "johannesburg": "za", "accra": "gh", "cairo": "eg", "kigali": "rw",
+    "dubai": "ae", "tel aviv": "il",
+    "new york": "us", "san francisco": "us", "toronto": "ca", "vancouver": "ca",
+    "montreal": "ca", "são paulo": "br", "sao paulo": "br", "buenos aires": "ar",
+    "bogota": "co", "bangalore": "in", "bengaluru": "in", "tokyo": "jp",
+    "sydney": "au", "melbourne": "au",
+}
+
+# "Austin, TX" — a trailing US state code means the US. After a known
+# non-US city it is read against that city: "Toronto, CA" / "Berlin, DE"
+# repeat the city's country code (no US), "Paris, TX" is the US namesake
+# (Texas, not France).
+US_STATES = {
+    "AL", "AK", "AZ", "AR", "CA", "CO", "CT", "DE", "FL", "GA", "HI", "ID", "IL",
+    "IN", "IA", "KS", "KY", "LA", "ME", "MD", "MA", "MI", "MN", "MS", "MO", "MT",
+    "NE", "NV", "NH", "NJ", "NM", "NY", "NC", "ND", "OH", "OK", "OR", "PA", "RI",
+    "SC", "SD", "TN", "TX", "UT", "VT", "VA", "WA", "WV", "WI", "WY", "DC",
+}
+
+REMOTE_SCOPES = ["worldwide", "regional", "country", "remote", "hybrid", "onsite"]
+# Scopes a "remote" location filter matches
+_REMOTE_FILTER_SCOPES = ["worldwide", "regional", "country", "remote"]
+
+
+def _alternation(words) -> re.Pattern:
+    body = "|".join(re.escape(w) for w in sorted(words, key=len, reverse=True))
+    return re.compile(rf"(?<!\w)(?:{body})(?!\w)", re.IGNORECASE)
+
+
+_REGION_RE = _alternation(REGION_ALIASES)
+_COUNTRY_RE = _alternation({**COUNTRY_ALIASES, **CITY_COUNTRIES})
+_STATE_RE = re.compile(r",\s*([A-Z]{2})\s*(?:$|[,;/(|-])")
+_REMOTE_RE = re.compile(r"(?<!\w)(?:remote|distributed|telecommute|wfh)(?!\w)", re.IGNORECASE)
+_HYBRID_RE = re.compile(r"(?<!\w)hybrid(?!\w)", re.IGNORECASE)
+
+
+def normalize_location(location: Optional[str], remote_flag: bool = False) -> dict:
+    """
+    Structured fields for a free-text location.
+
+    Returns {"regions": [...], "country_codes": [...], "remote_scope": str | None}
+    (remote_scope is None only for an empty location on a non-remote job).
+    """
+    text = location or ""
+    regions: set[str] = set()
+    countries: set[str] = set()
+
+    for m in _REGION_RE.finditer(text):
+        regions.update(REGION_ALIASES[m.group(0).lower()])
+
+    # place match → its country code, keyed by where the match ends
+    places: dict[int, tuple[str, str]] = {}
+    for m in _COUNTRY_RE.finditer(text):
+        alias = m.group(0).lower()
+        places[m.end()] = (alias, COUNTRY_ALIASES.get(alias) or CITY_COUNTRIES[alias])
+    for m in _STATE_RE.finditer(text):
+        state = m.group(1)
+        if state not in US_STATES:
+            continue
+        before = places.get(len(text[:m.start()].rstrip()))
+        if before is not None:
+            alias, cc = before
+            if alias in COUNTRY_ALIASES or cc in ("us", state.lower()):
+                continue  # "Germany, CA", "Toronto, CA", "Berlin, DE"
+            places[len(text[:m.start()].rstrip())] = (alias, "us")  # "Paris, TX"
+        else:
+            countries.add("us")
+    countries.update(cc for _, cc in places.values())
+
+    named_regions = set(regions)
+    for cc in countries:
+        regions.update(COUNTRY_REGIONS.get(cc, ()))
+
+    remote = remote_flag or bool(_REMOTE_RE.search(text))
+    if "worldwide" in named_regions:
+        scope = "worldwide"
+    elif _HYBRID_RE.search(text):
+        scope = "hybrid"
+    elif remote:
+        if named_regions:
+            scope = "regional"
+        elif countries:
+            scope = "country"
+        else:
+            scope = "remote"
+    else:
+        scope = "onsite" if text.strip() else None
+
+    return {
+        "regions": sorted(regions),
+        "country_codes": sorted(countries),
+        "remote_scope": scope,
+    }
+
+
+def location_filter_target(term: str) -> tuple[str, list[str]] | None:
+    """
+    Map a user's location filter to an indexed column.
+
+    Returns ("regions", [code]), ("country_codes", [cc]),
+    ("remote_scope", [scopes...]) or None (unknown term → LIKE fallback).
+    """
+    key = " ".join(term.lower().split())
+    if key in ("remote", "remote only", "fully remote"):
+        return "remote_scope", _REMOTE_FILTER_SCOPES
+    if key in ("hybrid", "onsite", "on-site"):
+        return "remote_scope", [key.replace("-", "")]
+    if key in REGIONS:
+        return "regions", [key]
+    if key in REGION_ALIASES:
+        codes = REGION_ALIASES[key]
+        return "regions", codes[:1]
+    if key in COUNTRY_ALIASES:
+        return "country_codes", [COUNTRY_ALIASES[key]]
+    if len(key) == 2 and key in COUNTRY_REGIONS:
+        return "country_codes", [key]
+    return None
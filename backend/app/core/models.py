@@ -1,5 +1,6 @@
 from sqlalchemy.orm import Mapped, mapped_column
-from sqlalchemy import String, Integer, DateTime, Boolean, Text, JSON
+from sqlalchemy import String, Integer, DateTime, Boolean, Text, JSON, true
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB
 from datetime import datetime
 from .db import Base
 
@@ -12,6 +13,12 @@ class Job(Base):
     location: Mapped[str | None] = mapped_column(String(256), index=True, default=None)
     remote_flag: Mapped[bool] = mapped_column(Boolean, default=False, index=True)
 
+    # Structured location, derived at ingest — see app/core/locations.py.
+    # GIN-indexed (db.ensure_indexes) so location filters are index lookups.
+    regions: Mapped[list[str] | None] = mapped_column(ARRAY(Text), default=None)
+    country_codes: Mapped[list[str] | None] = mapped_column(ARRAY(Text), default=None)
+    remote_scope: Mapped[str | None] = mapped_column(String(16), index=True, default=None)
+
     # NEW — for trends
     skills: Mapped[list[str] | None] = mapped_column(JSON, default=list)
 
@@ -23,6 +30,53 @@ class Job(Base):
     apply_url: Mapped[str | None] = mapped_column(String(512), default=None)
     canonical_url: Mapped[str | None] = mapped_column(String(512), default=None)
 
+    # md5(title|company|canonical_url), normalized; title|company||source|apply_url
+    # without a canonical_url, NULL with no URL — see crud.job_dedupe_key
+    dedupe_key: Mapped[str | None] = mapped_column(String(32), unique=True, index=True, default=None)
+    # Ingest board that last delivered this posting, e.g. "greenhouse_stripe"
+    source: Mapped[str | None] = mapped_column(String(128), index=True, default=None)
+
+    # sha256 of the normalized payload — see crud.job_content_hash.
+    # content_changed_at moves only when the posting itself changed, so
+    # scoring can re-score just those jobs.
+    content_hash: Mapped[str | None] = mapped_column(String(64), default=None)
+    content_changed_at: Mapped[datetime | None] = mapped_column(DateTime, index=True, default=None)
+
+    # Near-duplicate detection — see app/core/near_duplicates.py.
+    # canonical_job_id points at the earliest posting of the same role from
+    # another board/URL; NULL means this row is the canonical copy.
+    minhash: Mapped[list[int] | None] = mapped_column(ARRAY(Integer), default=None)
+    lsh_bands: Mapped[list[str] | None] = mapped_column(ARRAY(Text), default=None)
+    canonical_job_id: Mapped[int | None] = mapped_column(Integer, index=True, default=None)
+
     posted_at: Mapped[datetime | None] = mapped_column(DateTime, index=True, default=None)
     scraped_at: Mapped[datetime] = mapped_column(DateTime, index=True, default=datetime.utcnow)
     last_seen_at: Mapped[datetime] = mapped_column(DateTime, index=True, default=datetime.utcnow)
+
+    # Lifecycle — see app/core/lifecycle.py. Closed when the source stops
+    # listing the posting ("missing") or stops delivering it ("stale");
+    # reopened if it comes back. Live-row queries hit partial indexes
+    # WHERE is_active (db.ensure_indexes).
+    is_active: Mapped[bool] = mapped_column(Boolean, default=True, server_default=true())
+    closed_at: Mapped[datetime | None] = mapped_column(DateTime, default=None)
+    close_reason: Mapped[str | None] = mapped_column(String(16), default=None)
+
+
+class JobArchive(Base):
+    """
+    Closed jobs moved out of `jobs` by lifecycle.archive_closed.
+
+    id is the original jobs.id; data is the whole row (to_jsonb), so new
+    jobs columns never need an archive migration.
+    """
+    __tablename__ = "jobs_archive"
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=False)
+    source: Mapped[str | None] = mapped_column(String(128), index=True, default=None)
+    dedupe_key: Mapped[str | None] = mapped_column(String(32), index=True, default=None)
+    title: Mapped[str | None] = mapped_column(String(256), default=None)
+    company: Mapped[str | None] = mapped_column(String(256), default=None)
+    closed_at: Mapped[datetime | None] = mapped_column(DateTime, default=None)
+    close_reason: Mapped[str | None] = mapped_column(String(16), default=None)
+    archived_at: Mapped[datetime] = mapped_column(DateTime, index=True, default=datetime.utcnow)
+    data: Mapped[dict] = mapped_column(JSONB)
@@ -0,0 +1,229 @@
+"""
+app/core/near_duplicates.py
+
+Near-duplicate postings: MinHash signatures + LSH banding.
+
+WHY: the same role arrives from Greenhouse, RemoteOK, Himalayas and
+Remotive with slightly different titles ("Sr." vs "Senior"), company
+spellings ("Acme Inc." vs "Acme") and URLs. dedupe_key (exact
+title|company|canonical_url) and Silver's drop_duplicates can't see
+that, and every copy we keep costs a keyword score per user, an LLM score
+in scorer_job and a slot on the page.
+
+- shingles(title, company, description) → word 3-grams over the normalized
+  text (title abbreviations expanded and "(m/w/d)"/"Remote" noise dropped,
+  company legal suffixes dropped, description capped at MAX_WORDS)
+- signature(...) → NUM_PERM MinHash values (ints < 2^31, so they fit a
+  Postgres int4[]); the share of equal positions estimates Jaccard
+- lsh_bands(sig) → LSH_BANDS keys of LSH_ROWS values each; two postings
+  become candidates when any band key matches, so lookups are an index
+  probe (jobs.lsh_bands, GIN) instead of a pairwise scan
+- NearDuplicateIndex → in-memory LSH index for a batch (Silver, crud)
+
+Candidates are confirmed with the signature estimate against
+NEAR_DUP_THRESHOLD. With 32 bands x 4 rows, a pair at Jaccard 0.7 is a
+candidate >99.9% of the time, one at 0.3 about 23% (and is then rejected
+by the estimate).
+
+The title is only ~3 of up to ~300 words in the shingle set, so two
+different roles at one company sharing its boilerplate ("Senior Backend
+Engineer" / "Data Analyst" with 88% common text) can clear the
+threshold. A link therefore also needs the normalized titles to agree:
+Jaccard of title_words() >= NEAR_DUP_TITLE_THRESHOLD.
+
+A duplicate links to the EARLIEST matching posting (its canonical); links
+never chain, they always point at the root. Hashing is stable across
+processes (crc32 + fixed-seed permutations), so stored signatures stay
+valid; change SHINGLE_WORDS/NUM_PERM/normalization and they must be
+recomputed (python -m app.dedupe --recompute).
+"""
+
+import os
+import re
+import zlib
+import random
+import hashlib
+from typing import Iterable, Hashable
+
+try:
+    import numpy as np
+except ImportError:  # pure-Python hashing still works
+    np = None
+
+NUM_PERM = 128
+LSH_BANDS = 32
+LSH_ROWS = NUM_PERM // LSH_BANDS
+SHINGLE_WORDS = 3
+MAX_WORDS = 300
+
+# Estimated Jaccard at or above which two postings are the same job
+NEAR_DUP_THRESHOLD = float(os.getenv("NEAR_DUP_THRESHOLD", "0.7"))
+# ... and at or above which their normalized titles name the same role
+NEAR_DUP_TITLE_THRESHOLD = float(os.getenv("NEAR_DUP_TITLE_THRESHOLD", "0.75"))
+
+# Mersenne prime 2^31 - 1: (a*x + b) stays below 2^63 for 32-bit x, so the
+# NumPy path can use uint64 without overflow
+_PRIME = (1 << 31) - 1
+_rng = random.Random(0x6A6F6273)  # fixed seed — signatures must be reproducible
+_PERMS = [(_rng.randrange(1, _PRIME), _rng.randrange(0, _PRIME)) for _ in range(NUM_PERM)]
+if np is not None:
+    _A = np.array([a for a, _ in _PERMS], dtype=np.uint64)[:, None]
+    _B = np.array([b for _, b in _PERMS], dtype=np.uint64)[:, None]
+
+_NON_WORD = re.compile(r"[^\w]+")
+_COMPANY_SUFFIXES = {
+    "inc", "incorporated", "llc", "ltd", "limited", "gmbh", "ag", "sa", "sas",
+    "bv", "nv", "plc", "corp", "corporation", "co", "company", "srl", "oy", "ab",
+}
+# Boards decorate titles differently: "Sr. Backend Engineer (m/w/d) - Remote"
+_TITLE_ALIASES = {"sr": "senior", "snr": "senior", "jr": "junior", "eng": "engineer",
+                  "dev": "developer", "mgr": "manager"}
+_TITLE_NOISE = {"remote", "hybrid", "worldwide", "anywhere", "m", "w", "d", "f", "x", "h", "all", "genders"}
+
+
+def _words(text: str | None) -> list[str]:
+    return _NON_WORD.sub(" ", (text or "").lower()).split()
+
+
+def _title_words(title: str | None) -> list[str]:
+    return [_TITLE_ALIASES.get(w, w) for w in _words(title) if w not in _TITLE_NOISE]
+
+
+def title_words(title: str | None) -> frozenset[str]:
+    """Normalized title words ("Sr. Backend Eng (m/w/d)" → {senior, backend, engineer})."""
+    return frozenset(_title_words(title))
+
+
+def title_similarity(a: frozenset[str], b: frozenset[str]) -> float:
+    """Jaccard of two title_words() sets (1.0 when both are empty)."""
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+def shingles(title: str | None, company: str | None, description: str | None) -> set[int]:
+    """crc32 of every SHINGLE_WORDS-word window over title + company + description."""
+    title_words = _title_words(title)
+    company_words = [w for w in _words(company) if w not in _COMPANY_SUFFIXES]
+    words = title_words + company_words + _words(description)[:MAX_WORDS]
+    if not words:
+        return set()
+    if len(words) < SHINGLE_WORDS:
+        return {zlib.crc32(" ".join(words).encode("utf-8"))}
+    return {
+        zlib.crc32(" ".join(words[i:i + SHINGLE_WORDS]).encode("utf-8"))
+        for i in range(len(words) - SHINGLE_WORDS + 1)
+    }
+
+
+def minhash(hashed: set[int]) -> list[int] | None:
+    """MinHash signature of a shingle set, or None for an empty one."""
+    if not hashed:
+        return None
+    if np is not None:
+        xs = np.fromiter(hashed, dtype=np.uint64, count=len(hashed))[None, :]
+        return ((_A * xs + _B) % _PRIME).min(axis=1).astype(np.int64).tolist()
+    xs = list(hashed)
+    return [min([(a * x + b) % _PRIME for x in xs]) for a, b in _PERMS]
+
+
+def signature(title: str | None, company: str | None, description: str | None) -> list[int] | None:
+    return minhash(shingles(title, company, description))
+
+
+def lsh_bands(sig: list[int] | None) -> list[str] | None:
+    """One "band:hash" key per LSH band — stored in jobs.lsh_bands."""
+    if not sig:
+        return None
+    keys = []
+    for band in range(LSH_BANDS):
+        rows = sig[band * LSH_ROWS:(band + 1) * LSH_ROWS]
+        digest = hashlib.md5(",".join(map(str, rows)).encode("ascii")).hexdigest()[:12]
+        keys.append(f"{band}:{digest}")
+    return keys
+
+
+def similarity(a: list[int] | None, b: list[int] | None) -> float:
+    """Estimated Jaccard similarity of two signatures."""
+    if not a or not b or len(a) != len(b):
+        return 0.0
+    return sum(1 for x, y in zip(a, b) if x == y) / len(a)
+
+
+class NearDuplicateIndex:
+    """
+    In-memory LSH index. Add postings in age order (oldest first): each
+    one is linked to the best earlier match above both thresholds, or
+    becomes a canonical itself.
+    """
+
+    def __init__(self, threshold: float = NEAR_DUP_THRESHOLD, title_threshold: float = NEAR_DUP_TITLE_THRESHOLD):
+        self.threshold = threshold
+        self.title_threshold = title_threshold
+        self._buckets: dict[str, list[Hashable]] = {}
+        self._sigs: dict[Hashable, list[int]] = {}
+        self._titles: dict[Hashable, frozenset[str]] = {}
+        self._canonical: dict[Hashable, Hashable | None] = {}
+
+    def __len__(self) -> int:
+        return len(self._sigs)
+
+    def _insert(self, key: Hashable, sig: list[int], bands: list[str], title: str | None):
+        self._sigs[key] = sig
+        self._titles[key] = title_words(title)
+        for band in bands:
+            self._buckets.setdefault(band, []).append(key)
+
+    def match(self, sig: list[int] | None, title: str | None,
+              bands: list[str] | None = None) -> tuple[Hashable | None, float]:
+        """(best earlier key, similarity) above the thresholds, or (None, 0.0)."""
+        if not sig:
+            return None, 0.0
+        words = title_words(title)
+        seen: set = set()
+        best, best_sim = None, 0.0
+        for band in bands or lsh_bands(sig):
+            for other in self._buckets.get(band, ()):
+                if other in seen:
+                    continue
+                seen.add(other)
+                sim = similarity(sig, self._sigs[other])
+                if sim < self.threshold or sim <= best_sim:
+                    continue
+                if title_similarity(words, self._titles[other]) < self.title_threshold:
+                    continue
+                best, best_sim = other, sim
+        return best, best_sim
+
+    def add(self, key: Hashable, sig: list[int] | None, title: str | None,
+            bands: list[str] | None = None) -> Hashable | None:
+        """Index `key`; returns its canonical key (None when it is canonical)."""
+        if not sig:
+            self._canonical[key] = None
+            return None
+        bands = bands or lsh_bands(sig)
+        other, _ = self.match(sig, title, bands)
+        canonical = None
+        if other is not None:
+            root = self._canonical.get(other)
+            canonical = other if root is None else root
+        self._canonical[key] = canonical
+        self._insert(key, sig, bands, title)
+        return canonical
+
+    def add_known(self, key: Hashable, sig: list[int] | None, title: str | None, canonical: Hashable | None,
+                  bands: list[str] | None = None):
+        """Index `key` with a link decided earlier (e.g. stored in the DB)."""
+        self._canonical[key] = canonical
+        if sig:
+            self._insert(key, sig, bands or lsh_bands(sig), title)
+
+
+def find_near_duplicates(docs: Iterable[tuple[str | None, str | None, str | None]],
+                         threshold: float = NEAR_DUP_THRESHOLD) -> list[int | None]:
+    """
+    For (title, company, description) docs in age order: the position of
+    each doc's canonical, or None for canonicals (and docs with no text).
+    """
+    index = NearDuplicateIndex(threshold)
+    return [index.add(i, signature(*doc), doc[0]) for i, doc in enumerate(docs)]
@@ -14,6 +14,7 @@ class JobCreate(BaseModel):
     apply_url: str | None = None
     canonical_url: str | None = None
     posted_at: datetime | None = None
+    source: str | None = None
 
 class JobOut(JobCreate):
     id: int
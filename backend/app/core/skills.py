@@ -1,43 +1,168 @@
 # app/core/skills.py
-from typing import List
+"""
+Skill taxonomy + single-pass extractor.
+
+One taxonomy (canonical skill → aliases, category) shared by ingest
+(jobs.skills), the matching scorer and trends, so a skill is spelled the
+same everywhere ("node", not "node.js" in one place and "node" in another).
+
+All aliases are compiled into ONE regex built from a character trie
+(common prefixes merged), so extraction is a single pass per document and
+adding skills grows the trie, not the number of scans. Aliases only match
+as whole words: "java" is not found in "javascript", "sql" not in
+"postgresql".
+
+Add a skill: one SKILL_TAXONOMY entry. Canonical names are what jobs.skills
+stores, so don't rename existing ones.
+"""
+
 import re
+from typing import Iterable, List
 
-SKILL_VARIANTS = {
-    r"\breact(\.js)?\b": "react",
-    r"\bnode(\.js)?\b": "node",
-    r"\btypescript\b": "typescript",
-    r"\bjavascript\b": "javascript",
-    r"\bpython\b": "python",
-    r"\b(java)\b": "java",
-    r"\bpostgres(ql)?\b": "postgres",
-    r"\bmysql\b": "mysql",
-    r"\bmongo(db)?\b": "mongodb",
-    r"\baws\b": "aws",
-    r"\bgcp\b": "gcp",
-    r"\bazure\b": "azure",
-    r"\bdocker\b": "docker",
-    r"\bkubernetes\b": "kubernetes",
-    r"\bpandas\b": "pandas",
-    r"\bnumpy\b": "numpy",
-    r"\bpytorch\b": "pytorch",
-    r"\btensorflow\b": "tensorflow",
-    r"\bspark\b": "spark",
-    r"\bairflow\b": "airflow",
-    r"\bsql\b": "sql",
-    r"\bgdpr\b": "gdpr",
-    r"\bc\+\+\b": "cpp",
-    r"\bc#\b": "csharp",
-    r"\b\.net\b": "dotnet",
-    r"\bsap\b": "sap",
-    r"\bsalesforce\b": "salesforce",
-    r"\btableau\b": "tableau",
-    r"\bpower\s?bi\b": "powerbi",
+# canonical: (category, [aliases]) — the canonical name always matches itself
+SKILL_TAXONOMY = {
+    # Languages
+    "python": ("language", []),
+    "javascript": ("language", []),
+    "typescript": ("language", []),
+    "java": ("language", []),
+    "golang": ("language", ["go lang"]),
+    "rust": ("language", []),
+    "cpp": ("language", ["c++"]),
+    "csharp": ("language", ["c#"]),
+    "sql": ("language", []),
+    # Frontend
+    "react": ("frontend", ["react.js", "reactjs"]),
+    "next.js": ("frontend", ["nextjs"]),
+    "vue": ("frontend", ["vue.js", "vuejs"]),
+    "angular": ("frontend", []),
+    "svelte": ("frontend", []),
+    "tailwind": ("frontend", ["tailwindcss", "tailwind css"]),
+    "graphql": ("frontend", []),
+    # Backend
+    "node": ("backend", ["node.js", "nodejs"]),
+    "dotnet": ("backend", [".net", "asp.net"]),
+    "fastapi": ("backend", []),
+    "django": ("backend", []),
+    "flask": ("backend", []),
+    "grpc": ("backend", []),
+    "celery": ("backend", []),
+    "rabbitmq": ("backend", []),
+    "kafka": ("backend", ["apache kafka"]),
+    # Databases
+    "postgres": ("database", ["postgresql"]),
+    "mysql": ("database", []),
+    "mongodb": ("database", ["mongo"]),
+    "redis": ("database", []),
+    "elasticsearch": ("database", []),
+    # Data
+    "pandas": ("data", []),
+    "numpy": ("data", []),
+    "spark": ("data", ["apache spark", "pyspark"]),
+    "airflow": ("data", ["apache airflow"]),
+    "dbt": ("data", []),
+    "etl": ("data", []),
+    "elt": ("data", []),
+    "data engineering": ("data", []),
+    "data pipeline": ("data", ["data pipelines"]),
+    "tableau": ("data", []),
+    "powerbi": ("data", ["power bi"]),
+    # ML
+    "pytorch": ("ml", []),
+    "tensorflow": ("ml", []),
+    "scikit-learn": ("ml", ["sklearn"]),
+    # Cloud / DevOps
+    "aws": ("cloud", []),
+    "gcp": ("cloud", ["google cloud"]),
+    "azure": ("cloud", []),
+    "docker": ("devops", []),
+    "kubernetes": ("devops", ["k8s"]),
+    "terraform": ("devops", []),
+    "ansible": ("devops", []),
+    "ci/cd": ("devops", ["cicd"]),
+    "github actions": ("devops", []),
+    "jenkins": ("devops", []),
+    # Business / compliance
+    "sap": ("business", []),
+    "salesforce": ("business", []),
+    "gdpr": ("business", []),
 }
 
+SKILL_CATEGORIES = {skill: category for skill, (category, _) in SKILL_TAXONOMY.items()}
+
+# lowercase alias (whitespace collapsed) → canonical
+ALIASES = {}
+for _skill, (_, _aliases) in SKILL_TAXONOMY.items():
+    for _alias in [_skill, *_aliases]:
+        ALIASES[" ".join(_alias.lower().split())] = _skill
+
+
+def _trie_pattern(words: Iterable[str]) -> str:
+    """Regex alternation for `words` with shared prefixes merged (a trie)."""
+    trie: dict = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[""] = {}  # end of word
+
+    def emit(node: dict) -> str:
+        optional = "" in node
+        branches = [
+            (r"\s+" if ch == " " else re.escape(ch)) + emit(child)
+            for ch, child in sorted(node.items()) if ch
+        ]
+        if not branches:
+            return ""
+        body = "(?:" + "|".join(branches) + ")"
+        # A word ends here but longer ones continue: greedy optional tries
+        # the longer alias first and backtracks to the shorter one
+        return body + "?" if optional else body
+
+    return emit(trie)
+
+
+_SKILL_RE = re.compile(rf"(?<![\w.+#])(?:{_trie_pattern(ALIASES)})(?![\w+#]|\.\w)", re.IGNORECASE)
+
+
+def _find(blob: str) -> set[str]:
+    return {ALIASES[" ".join(m.group(0).lower().split())] for m in _SKILL_RE.finditer(blob)}
+
+
 def extract_skills(*texts: str | None) -> List[str]:
-    blob = " ".join([t or "" for t in texts]).lower()
-    found = set()
-    for pattern, norm in SKILL_VARIANTS.items():
-        if re.search(pattern, blob):
-            found.add(norm)
-    return sorted(found)
+    """Canonical skills mentioned in any of `texts`, sorted."""
+    return sorted(_find(" \n ".join(t or "" for t in texts)))
+
+
+def extract_skills_many(docs: Iterable[str | tuple | list | None]) -> List[List[str]]:
+    """
+    extract_skills over a batch. Each doc is a string or a tuple/list of
+    strings (e.g. (title, description, location)).
+    """
+    out = []
+    for doc in docs:
+        if isinstance(doc, (tuple, list)):
+            out.append(extract_skills(*doc))
+        else:
+            out.append(extract_skills(doc))
+    return out
+
+
+def canonical_skills(names: Iterable[str]) -> set[str]:
+    """
+    Map free-form skill names (a user's profile, certifications) onto the
+    taxonomy: known aliases → canonical, other strings are scanned for
+    skills ("AWS Certified Solutions Architect" → aws). Unknown names are
+    kept lowercased so exact matches still count.
+    """
+    out = set()
+    for name in names:
+        key = " ".join((name or "").lower().split())
+        if not key:
+            continue
+        if key in ALIASES:
+            out.add(ALIASES[key])
+            continue
+        found = _find(key)
+        out.update(found or {key})
+    return out
@@ -4,61 +4,230 @@ app/core/translate.py
 Detect and translate non-English job descriptions to English using Groq.
 Called during the Silver layer transformation — only fires if the description
 is not already English, so English jobs have zero latency impact.
+
+Translations are cached by sha256(model | PROMPT_VERSION | text) in
+app/core/translation_cache.py, so re-running Silver over history makes no
+LLM calls for text we've already translated. Bump PROMPT_VERSION when
+either prompt changes.
+
+Cache misses go through an async stage (atranslate_many):
+- short texts (< TRANSLATE_PACK_ITEM_CHARS) are packed several per request
+  (up to TRANSLATE_PACK_CHARS) and returned as a JSON array; if the reply
+  doesn't map back 1:1, those texts are retried one per request
+- up to TRANSLATE_CONCURRENCY requests in flight, under token buckets for
+  requests/min and tokens/min (TRANSLATE_RPM / TRANSLATE_TPM — size them to
+  the Groq plan)
+- 429s wait for Retry-After (TRANSLATE_MAX_RETRIES times), anything else
+  keeps the original text
+
+TRANSLATE_BASE_URL points at any OpenAI-compatible endpoint — Groq by
+default, or a local mock (benchmarks/bench_translate.py) for testing.
 """
 
 import os
-import logging
-from groq import Groq
+import json
 import time
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+
+from .langid import probability_many
+from .translation_cache import translation_cache, translation_key
 
 logger = logging.getLogger(__name__)
 
-_client: Groq | None = None
+MODEL = os.getenv("TRANSLATE_MODEL", "llama-3.1-8b-instant")
+PROMPT_VERSION = "v1"
+SYSTEM_PROMPT = "Translate the following job description to English. Output ONLY the translated text."
+PACKED_PROMPT = (
+    "Translate each job description in the JSON array to English. "
+    "Return ONLY a JSON array of strings: the translations, same order, same length."
+)
 
-def _get_client() -> Groq:
-    global _client
-    if _client is None:
-        _client = Groq(api_key=os.getenv("GROQ_API_KEY"))
-    return _client
+TRANSLATE_BASE_URL = os.getenv("TRANSLATE_BASE_URL", "https://api.groq.com/openai/v1")
+TRANSLATE_RPM = float(os.getenv("TRANSLATE_RPM", "30"))
+TRANSLATE_TPM = float(os.getenv("TRANSLATE_TPM", "6000"))
+TRANSLATE_CONCURRENCY = int(os.getenv("TRANSLATE_CONCURRENCY", "4"))
+TRANSLATE_PACK_CHARS = int(os.getenv("TRANSLATE_PACK_CHARS", "2400"))
+TRANSLATE_PACK_ITEM_CHARS = int(os.getenv("TRANSLATE_PACK_ITEM_CHARS", "600"))
+TRANSLATE_MAX_RETRIES = int(os.getenv("TRANSLATE_MAX_RETRIES", "2"))
+TRANSLATE_TIMEOUT = float(os.getenv("TRANSLATE_TIMEOUT", "60"))
 
+# Rough token estimate (no tokenizer dependency): ~4 chars per token,
+# and the English output is about as long as the input
+_CHARS_PER_TOKEN = 4
+_MAX_OUTPUT_TOKENS = 1000
 
-# Languages we leave alone — everything else gets translated
-_ENGLISH_INDICATORS = {"english", "en", "eng"}
 
-# Fast keyword check — if any of these appear in the first 300 chars,
-# assume the description is already in English and skip translation
-_ENGLISH_KEYWORDS = {
-    "the", "and", "for", "with", "you", "are", "this", "that",
-    "will", "have", "from", "your", "our", "we ", "be ", "to ",
-    "of ", "in ", "is ", "it ", "as ", "at ", "by ", "an ",
-}
+# Below this detector confidence that a text is NOT English (1 - P(en))
+# it is left alone — a wrong "not English" costs an LLM call, a wrong
+# "English" only an untranslated row. Tuned with benchmarks/bench_langid.py
+TRANSLATE_MIN_CONFIDENCE = float(os.getenv("TRANSLATE_MIN_CONFIDENCE", "0.8"))
 
 
 def is_english(text: str) -> bool:
-    if not text or len(text.strip()) < 20:
-        return True
-    
-    sample = text[:500].lower()
-    
-    # German/French/Portuguese giveaways — if any appear, it's not English
-    non_english_markers = [
-        "und ", "der ", "die ", "das ", "ist ", "ein ", "eine ",  # German
-        "für ", "mit ", "von ", "auf ", "bei ", "wir ", "sie ",   # German
-        "les ", "des ", "est ", "que ", "une ", "dans ", "pour ",  # French
-        "para ", "com ", "que ", "uma ", "não ", "são ", "pelo ",  # Portuguese
-        "per ", "del ", "che ", "una ", "non ", "con ", "alla ",   # Italian
+    """True unless the language detector is confident the text is another language."""
+    return is_english_many([text])[0]
+
+
+def is_english_many(texts: list[str]) -> list[bool]:
+    """is_english for a batch (one vectorized detector pass, app/core/langid.py)."""
+    return [
+        p_en is None or 1.0 - p_en < TRANSLATE_MIN_CONFIDENCE
+        for p_en in probability_many(texts, "en")
     ]
-    
-    for marker in non_english_markers:
-        if marker in sample:
-            return False
-    
-    return True
 
 
+# ── Rate limiting ────────────────────────────────────────────────────
+
+class TokenBucket:
+    """
+    Refills `per_minute` units per minute up to `capacity` (default: one
+    minute's worth). acquire(n) waits until n units are available.
+    """
+
+    def __init__(self, per_minute: float, capacity: float | None = None):
+        self.rate = per_minute / 60.0
+        self.capacity = capacity or per_minute
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, n: float = 1.0):
+        n = min(n, self.capacity)  # an oversized request still goes, alone
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= n:
+                    self._tokens -= n
+                    return
+                await asyncio.sleep((n - self._tokens) / self.rate)
+
+
+def _estimate_tokens(chars: int) -> int:
+    return min(2 * chars // _CHARS_PER_TOKEN + 50, 2 * _MAX_OUTPUT_TOKENS)
+
+
+# ── LLM calls ────────────────────────────────────────────────────────
+
+class _Stage:
+    """One async translation run: shared client, limits and counters."""
+
+    def __init__(self, client: httpx.AsyncClient):
+        self.client = client
+        self.sema = asyncio.Semaphore(max(1, TRANSLATE_CONCURRENCY))
+        self.rpm = TokenBucket(TRANSLATE_RPM)
+        self.tpm = TokenBucket(TRANSLATE_TPM)
+        self.stats = {"requests": 0, "packed_requests": 0, "failed": 0, "tokens": 0}
+
+    async def chat(self, system: str, user: str) -> tuple[str, int]:
+        """One chat completion → (content, total tokens). Raises on failure."""
+        payload = {
+            "model": MODEL,
+            "messages": [{"role": "system", "content": system}, {"role": "user", "content": user}],
+            "temperature": 0.1,
+            "max_tokens": _MAX_OUTPUT_TOKENS,
+        }
+        for attempt in range(TRANSLATE_MAX_RETRIES + 1):
+            async with self.sema:
+                await self.rpm.acquire()
+                await self.tpm.acquire(_estimate_tokens(len(user)))
+                self.stats["requests"] += 1
+                r = await self.client.post("/chat/completions", json=payload)
+            if r.status_code == 429 and attempt < TRANSLATE_MAX_RETRIES:
+                delay = min(float(r.headers.get("retry-after") or 2 ** attempt), 60.0)
+                logger.info(f"[Translate] 429, retrying in {delay:.0f}s")
+                await asyncio.sleep(delay)
+                continue
+            r.raise_for_status()
+            body = r.json()
+            tokens = (body.get("usage") or {}).get("total_tokens", 0) or 0
+            self.stats["tokens"] += tokens
+            return body["choices"][0]["message"]["content"].strip(), tokens
+        raise RuntimeError("unreachable")  # loop always returns or raises
+
+    async def one(self, text: str) -> tuple[str, int] | None:
+        try:
+            return await self.chat(SYSTEM_PROMPT, text)
+        except Exception as e:
+            # Fail-safe: keep the original text
+            self.stats["failed"] += 1
+            logger.warning(f"[Translate] Failed — keeping original: {type(e).__name__}: {e}")
+            return None
+
+    async def packed(self, texts: list[str]) -> list[tuple[str, int] | None]:
+        """Several short texts in one request; falls back to one-by-one."""
+        try:
+            content, tokens = await self.chat(PACKED_PROMPT, json.dumps(texts, ensure_ascii=False))
+            self.stats["packed_requests"] += 1
+            if content.startswith("```"):
+                content = content.strip("`").removeprefix("json").strip()
+            translated = json.loads(content)
+            if (
+                isinstance(translated, list)
+                and len(translated) == len(texts)
+                and all(isinstance(t, str) and t.strip() for t in translated)
+            ):
+                total = sum(len(t) for t in texts) or 1
+                return [(t.strip(), round(tokens * len(src) / total)) for t, src in zip(translated, texts)]
+            logger.info(f"[Translate] Packed reply didn't map back ({len(texts)} texts), retrying singly")
+        except Exception as e:
+            logger.info(f"[Translate] Packed request failed ({type(e).__name__}), retrying singly")
+        return list(await asyncio.gather(*(self.one(t) for t in texts)))
+
+
+def _pack(texts: list[str]) -> list[list[int]]:
+    """Group indexes: short texts packed up to TRANSLATE_PACK_CHARS, long ones alone."""
+    groups, current, size = [], [], 0
+    for i, text in enumerate(texts):
+        if len(text) >= TRANSLATE_PACK_ITEM_CHARS:
+            groups.append([i])
+            continue
+        if current and size + len(text) > TRANSLATE_PACK_CHARS:
+            groups.append(current)
+            current, size = [], 0
+        current.append(i)
+        size += len(text)
+    if current:
+        groups.append(current)
+    return groups
+
+
+async def _translate_uncached(texts: list[str]) -> list[tuple[str, int] | None]:
+    """LLM translations for `texts` (same order); None where it failed."""
+    api_key = os.getenv("GROQ_API_KEY")
+    headers = {"Authorization": f"Bearer {api_key}"} if api_key else {}
+    async with httpx.AsyncClient(base_url=TRANSLATE_BASE_URL, headers=headers, timeout=TRANSLATE_TIMEOUT) as client:
+        stage = _Stage(client)
+        groups = _pack(texts)
+
+        async def run(group: list[int]):
+            if len(group) == 1:
+                return [await stage.one(texts[group[0]])]
+            return await stage.packed([texts[i] for i in group])
+
+        results: list[tuple[str, int] | None] = [None] * len(texts)
+        for group, out in zip(groups, await asyncio.gather(*(run(g) for g in groups))):
+            for i, result in zip(group, out):
+                results[i] = result
+
+    s = stage.stats
+    logger.info(
+        f"[Translate] {len(texts)} texts in {s['requests']} requests "
+        f"({s['packed_requests']} packed), {s['tokens']} tokens, {s['failed']} failed"
+    )
+    return results
+
+
+# ── Public API ───────────────────────────────────────────────────────
+
 def translate_to_english(text: str, max_chars: int = 2000) -> str:
     """
-    Translate text to English using Groq (llama-3.3-70b-versatile).
+    Translate text to English (cached, see module docstring).
     Returns original text if:
     - Already English (fast heuristic)
     - Translation fails for any reason (fail-safe)
@@ -72,30 +241,76 @@ def translate_to_english(text: str, max_chars: int = 2000) -> str:
         return text
     if is_english(text):
         return text
+    try:
+        return translate_many([text], max_chars=max_chars, assume_non_english=True)[0]
+    except Exception as e:
+        logger.error(f"[Translate] Failed — keeping original: {type(e).__name__}: {e}")
+        return text
+
 
-    logger.info(f"[Translate] Translating {len(text)} chars...")
-    truncated = text[:max_chars]
+async def atranslate_many(texts: list[str], max_chars: int = 2000, assume_non_english: bool = False) -> list[str]:
+    """
+    Batch translation: same order as `texts`, originals kept for English
+    text and failures.
+
+    Each distinct text is looked up once in the translation cache (one
+    batched query); only misses go to the LLM stage, and successful
+    translations are stored. assume_non_english skips the is_english check
+    (caller already filtered).
+    """
+    out = list(texts)
+    english = [False] * len(texts) if assume_non_english else is_english_many(texts)
+    pending: dict[str, list[int]] = {}   # cache key → row positions
+    sources: dict[str, str] = {}         # cache key → truncated text
+    for i, text in enumerate(texts):
+        if not text or not text.strip() or english[i]:
+            continue
+        truncated = text[:max_chars]
+        key = translation_key(truncated, MODEL, PROMPT_VERSION)
+        pending.setdefault(key, []).append(i)
+        sources[key] = truncated
+
+    if not pending:
+        return out
+
+    cached = translation_cache.get_many(pending)
+    misses = [key for key in pending if key not in cached]
+    if misses:
+        logger.info(f"[Translate] {len(cached)} cached, translating {len(misses)}...")
+        fresh = []
+        results = await _translate_uncached([sources[key] for key in misses])
+        for key, result in zip(misses, results):
+            if result is None:
+                continue
+            translation, tokens = result
+            cached[key] = translation
+            fresh.append((key, MODEL, PROMPT_VERSION, translation, len(sources[key]), tokens))
+        translation_cache.put_many(fresh)
+
+    for key, rows in pending.items():
+        if key in cached:
+            for i in rows:
+                out[i] = cached[key]
+    return out
 
+
+def translate_many(texts: list[str], max_chars: int = 2000, assume_non_english: bool = False) -> list[str]:
+    """
+    Sync wrapper for atranslate_many (Silver, scripts). Async callers
+    should await atranslate_many instead.
+
+    asyncio.run() can't nest: called from a running event loop (a FastAPI
+    handler, the async ingest) the stage runs on its own loop in a helper
+    thread, and the caller blocks like the old sync Groq call did.
+    """
+    coro = atranslate_many(texts, max_chars=max_chars, assume_non_english=assume_non_english)
     try:
-        response = _get_client().chat.completions.create(
-            model="llama-3.1-8b-instant",
-            messages=[
-                {
-                    "role": "system",
-                    "content": "Translate the following job description to English. Output ONLY the translated text.",
-                },
-                {"role": "user", "content": truncated},
-            ],
-            temperature=0.1,
-            max_tokens=1000,
-        )
-        return response.choices[0].message.content.strip()
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix="translate") as pool:
+        return pool.submit(asyncio.run, coro).result()
 
-    except Exception as e:
-        # Fail fast — never sleep, never retry
-        # Blocking the event loop kills login/signup
-        logger.warning(f"[Translate] Failed — keeping original: {e}")
-        return text
 
 def translate_job(job: dict) -> dict:
     """
@@ -0,0 +1,120 @@
+"""
+Persistent store for LLM translations (app/core/translate.py).
+
+WHY: translate_to_english called Groq for every non-English description,
+and Silver re-translates the same postings on every run (and on every
+re-run over history). Translations are now remembered, keyed by
+sha256(model | prompt version | source text):
+- a new model or prompt (PROMPT_VERSION) naturally misses, old entries
+  are never served for it
+- lookups are batched (get_many) — one query per Silver batch
+- hits / misses / tokens saved are counted for the run summary
+
+Storage: SQLite at data/cache/translations.sqlite (TRANSLATION_CACHE_PATH),
+same setup as the detail-page cache. Entries never expire — a translation
+of the same text by the same model and prompt doesn't go stale.
+"""
+
+import os
+import time
+import sqlite3
+import hashlib
+import threading
+from pathlib import Path
+from typing import Iterable
+
+TRANSLATION_CACHE_PATH = os.getenv("TRANSLATION_CACHE_PATH", "data/cache/translations.sqlite")
+
+# SQLite's default host-parameter limit is 999
+_LOOKUP_CHUNK = 500
+
+
+def translation_key(text: str, model: str, prompt_version: str) -> str:
+    return hashlib.sha256(f"{model}\x00{prompt_version}\x00{text}".encode("utf-8")).hexdigest()
+
+
+class TranslationCache:
+    def __init__(self, path: str = TRANSLATION_CACHE_PATH):
+        self.path = Path(path)
+        self.stats = {"hits": 0, "misses": 0, "stored": 0, "tokens_saved": 0}
+        self._lock = threading.Lock()
+        self._conn: sqlite3.Connection | None = None
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS translations (
+                    key TEXT PRIMARY KEY,
+                    model TEXT NOT NULL,
+                    prompt_version TEXT NOT NULL,
+                    translation TEXT NOT NULL,
+                    source_chars INTEGER NOT NULL,
+                    tokens INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    hits INTEGER NOT NULL DEFAULT 0
+                )
+            """)
+        return self._conn
+
+    def get_many(self, keys: Iterable[str]) -> dict[str, str]:
+        """Cached translations for `keys` (missing keys are absent). Counts hits/misses."""
+        wanted = list(dict.fromkeys(keys))
+        found: dict[str, str] = {}
+        saved = 0
+        with self._lock:
+            db = self._db()
+            for start in range(0, len(wanted), _LOOKUP_CHUNK):
+                chunk = wanted[start:start + _LOOKUP_CHUNK]
+                marks = ",".join("?" * len(chunk))
+                for key, translation, tokens in db.execute(
+                    f"SELECT key, translation, tokens FROM translations WHERE key IN ({marks})", chunk
+                ):
+                    found[key] = translation
+                    saved += tokens
+            if found:
+                db.executemany("UPDATE translations SET hits = hits + 1 WHERE key = ?", [(k,) for k in found])
+        self.stats["hits"] += len(found)
+        self.stats["misses"] += len(wanted) - len(found)
+        self.stats["tokens_saved"] += saved
+        return found
+
+    def get(self, key: str) -> str | None:
+        return self.get_many([key]).get(key)
+
+    def put_many(self, rows: Iterable[tuple[str, str, str, str, int, int]]):
+        """rows: (key, model, prompt_version, translation, source_chars, tokens)."""
+        now = time.time()
+        values = [(*row, now) for row in rows]
+        if not values:
+            return
+        with self._lock:
+            self._db().executemany(
+                """
+                INSERT INTO translations
+                    (key, model, prompt_version, translation, source_chars, tokens, created_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(key) DO NOTHING
+                """,
+                values,
+            )
+        self.stats["stored"] += len(values)
+
+    def snapshot(self) -> dict:
+        """Counters + store size, for the Silver / run summary."""
+        with self._lock:
+            entries, tokens = self._db().execute(
+                "SELECT COUNT(*), COALESCE(SUM(tokens), 0) FROM translations"
+            ).fetchone()
+        lookups = self.stats["hits"] + self.stats["misses"]
+        return {
+            **self.stats,
+            "entries": entries,
+            "tokens_stored": tokens,
+            "hit_rate": round(self.stats["hits"] / lookups, 3) if lookups else 0.0,
+        }
+
+
+translation_cache = TranslationCache()
@@ -6,7 +6,9 @@ from . import models
 
 def top_skills(db: Session, days: int = 90, top_k: int = 15):
     cutoff = datetime.utcnow() - timedelta(days=days)
-    stmt = select(models.Job.skills).where(models.Job.scraped_at >= cutoff)
+    stmt = select(models.Job.skills).where(
+        models.Job.scraped_at >= cutoff, models.Job.canonical_job_id.is_(None)
+    )
     rows = db.execute(stmt).all()
     c = Counter()
     for (skills,) in rows:
@@ -17,8 +19,9 @@ def top_skills(db: Session, days: int = 90, top_k: int = 15):
 
 def remote_ratio(db: Session, days: int = 90):
     cutoff = datetime.utcnow() - timedelta(days=days)
-    total = db.scalar(select(func.count()).select_from(models.Job).where(models.Job.scraped_at >= cutoff)) or 0
-    remote = db.scalar(select(func.count()).select_from(models.Job).where(models.Job.scraped_at >= cutoff, models.Job.remote_flag.is_(True))) or 0
+    live = (models.Job.scraped_at >= cutoff, models.Job.canonical_job_id.is_(None))
+    total = db.scalar(select(func.count()).select_from(models.Job).where(*live)) or 0
+    remote = db.scalar(select(func.count()).select_from(models.Job).where(*live, models.Job.remote_flag.is_(True))) or 0
     onsite = total - remote
     return {
         "total": total,
@@ -31,7 +34,7 @@ def company_activity(db: Session, days: int = 90, top_k: int = 15):
     cutoff = datetime.utcnow() - timedelta(days=days)
     stmt = (
         select(models.Job.company, func.count().label("cnt"))
-        .where(models.Job.scraped_at >= cutoff)
+        .where(models.Job.scraped_at >= cutoff, models.Job.canonical_job_id.is_(None))
         .group_by(models.Job.company)
         .order_by(func.count().desc())
         .limit(top_k)
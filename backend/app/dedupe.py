@@ -0,0 +1,119 @@
+"""
+Near-duplicate backfill
+=======================
+
+Signs and links the whole jobs table — the bulk counterpart of what
+ingest does per batch (crud.bulk_upsert_jobs → crud.link_near_duplicates).
+
+WHY:
+- Rows ingested before near-duplicate detection have no signature, so
+  ingest can't match new postings against them.
+- After changing the shingling or NEAR_DUP_THRESHOLD, links over history
+  need to be decided again.
+
+How it works:
+1. Sign: pages through jobs in id order and stores minhash + lsh_bands
+   for rows that have none (every row with --recompute).
+2. Link: pages through ALL ids ascending and runs
+   crud.link_near_duplicates on each page. Earlier pages are final by the
+   time later ones read them, so every posting ends up linked to the
+   earliest copy of its role — the same result as ingesting history in
+   order. One GIN lookup per page; memory is bounded by --batch.
+
+Each page commits on its own, so an interrupted run can simply be
+restarted.
+
+Usage:
+    python -m app.dedupe                 # sign what's missing, relink everything
+    python -m app.dedupe --recompute     # after changing near_duplicates.py
+    python -m app.dedupe --link-only --batch 1000
+"""
+
+import time
+import argparse
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
+def sign_jobs(batch: int = 500, recompute: bool = False) -> int:
+    """Store signatures for rows without one (or all rows). Returns rows signed."""
+    from sqlalchemy import select, update
+    from app.core import models
+    from app.core.db import SessionLocal
+    from app.core.near_duplicates import signature, lsh_bands
+
+    Job = models.Job
+    started = time.perf_counter()
+    signed = last_id = 0
+    with SessionLocal() as db:
+        while True:
+            stmt = select(Job.id, Job.title, Job.company, Job.description_text).where(Job.id > last_id)
+            if not recompute:
+                stmt = stmt.where(Job.minhash.is_(None))
+            rows = db.execute(stmt.order_by(Job.id).limit(batch)).all()
+            if not rows:
+                break
+            changes = []
+            for row in rows:
+                sig = signature(row.title, row.company, row.description_text)
+                changes.append({"id": row.id, "minhash": sig, "lsh_bands": lsh_bands(sig)})
+            db.execute(update(Job), changes)
+            db.commit()
+            signed += len(rows)
+            last_id = rows[-1].id
+            elapsed = time.perf_counter() - started
+            print(f"  ✍️  signed {signed} jobs (up to id {last_id}, {signed / max(elapsed, 1e-9):.0f} rows/s)")
+    return signed
+
+
+def link_jobs(batch: int = 500) -> dict:
+    """Relink every job in id order. Returns {"jobs", "duplicates", "clusters"}."""
+    from sqlalchemy import select, func
+    from app.core import crud, models
+    from app.core.db import SessionLocal
+
+    Job = models.Job
+    started = time.perf_counter()
+    seen = last_id = 0
+    with SessionLocal() as db:
+        while True:
+            ids = db.execute(
+                select(Job.id).where(Job.id > last_id).order_by(Job.id).limit(batch)
+            ).scalars().all()
+            if not ids:
+                break
+            crud.link_near_duplicates(db, ids)
+            db.commit()
+            seen += len(ids)
+            last_id = ids[-1]
+            elapsed = time.perf_counter() - started
+            print(f"  🔗 linked {seen} jobs (up to id {last_id}, {seen / max(elapsed, 1e-9):.0f} rows/s)")
+
+        duplicates, clusters = db.execute(
+            select(func.count(Job.canonical_job_id), func.count(func.distinct(Job.canonical_job_id)))
+        ).one()
+    return {"jobs": seen, "duplicates": duplicates, "clusters": clusters}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sign and link near-duplicate jobs over history")
+    parser.add_argument("--recompute", action="store_true", help="re-sign every row, not just unsigned ones")
+    parser.add_argument("--link-only", action="store_true", help="skip signing, only relink")
+    parser.add_argument("--batch", type=int, default=500, help="rows per page / transaction")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    print("🧬 Near-duplicate backfill" + (" (recompute)" if args.recompute else ""))
+    if not args.link_only:
+        sign_jobs(batch=args.batch, recompute=args.recompute)
+    result = link_jobs(batch=args.batch)
+    print(
+        f"✅ Done in {time.perf_counter() - started:.1f}s — {result['jobs']} jobs, "
+        f"{result['duplicates']} near-duplicates in {result['clusters']} clusters"
+    )
+
+
+if __name__ == "__main__":
+    main()
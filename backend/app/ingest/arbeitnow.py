@@ -1,7 +1,9 @@
-import httpx
 import re
-from typing import List, Dict
+from typing import Dict, AsyncIterator
 from app.core.skills import extract_skills
+from .clients import get_client
+from .conditional import conditional_stream
+from .stream import iter_json_array
 
 API = "https://www.arbeitnow.com/api/job-board-api"
 
@@ -22,20 +24,16 @@ def clean_job_title(title: str) -> str:
     
     return title.strip()
 
-async def fetch_arbeitnow_jobs() -> List[Dict]:
+async def fetch_arbeitnow_jobs() -> AsyncIterator[Dict]:
     """
     Fetch jobs from Arbeitnow API
     Focus: Europe + Remote jobs
+
+    Yields jobs while the "data" array is decoded (app/ingest/stream.py).
     """
-    async with httpx.AsyncClient(timeout=30) as client:
-        r = await client.get(API)
-        r.raise_for_status()
-        data = r.json()
+    body = conditional_stream(get_client("arbeitnow"), API)
 
-    jobs = data.get("data", [])
-    
-    out: List[Dict] = []
-    for j in jobs:
+    async for j in iter_json_array(body, key="data"):
         # Only include remote jobs
         if not j.get("remote", False):
             continue
@@ -51,7 +49,7 @@ async def fetch_arbeitnow_jobs() -> List[Dict]:
         if not clean_title:
             continue
         
-        out.append({
+        yield {
             "title": clean_title,
             "company": company,
             "location": location,
@@ -64,6 +62,4 @@ async def fetch_arbeitnow_jobs() -> List[Dict]:
             "salary_min": None,
             "salary_max": None,
             "currency": None,
-        })
-    
-    return out
\ No newline at end of file
+        }
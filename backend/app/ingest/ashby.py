@@ -1,18 +1,19 @@
-import httpx, asyncio
+import asyncio
 from typing import List, Dict
 from app.core.skills import extract_skills
 from .detail import fetch_job_text
+from .clients import get_client
+from .conditional import conditional_get
 
 API = "https://api.ashbyhq.com/posting-api/job-board/{name}"
 
 async def fetch_ashby_org(org: str) -> List[Dict]:
     url = API.format(name=org)
-    async with httpx.AsyncClient(timeout=30) as client:
-        r = await client.get(url, params={"includeCompensation": "true"})
-        if r.status_code == 404:
-            raise RuntimeError(f"Ashby board not found for '{org}'")
-        r.raise_for_status()
-        data = r.json()
+    r = await conditional_get(get_client("ashby"), url, params={"includeCompensation": "true"})
+    if r.status_code == 404:
+        raise RuntimeError(f"Ashby board not found for '{org}'")
+    r.raise_for_status()
+    data = r.json()
 
     jobs = data.get("jobs", [])
     # many Ashby board payloads lack full desc → fetch jobUrl if present
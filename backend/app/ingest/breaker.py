@@ -0,0 +1,240 @@
+"""
+Circuit breakers and retry backoff for ingest sources.
+
+WHY: a board that 429s, times out or 404s used to be retried at full cost
+on every run, and the scrapers hid 403 blocks by returning []. Now:
+
+1. RetryTransport (wired into every pooled client, app/ingest/clients.py)
+   retries GETs on 429/5xx and connection errors with exponential backoff
+   + full jitter, honoring Retry-After. A Retry-After longer than
+   INGEST_MAX_RETRY_AFTER is not slept on — the response is returned and
+   the breaker takes over.
+
+2. A circuit breaker per source (board key from build_ingest_plan):
+   - closed: fetch normally; INGEST_BREAKER_THRESHOLD consecutive failures
+     → open
+   - open: the board is skipped (status "circuit_open") until its cooldown
+     ends — INGEST_BREAKER_COOLDOWN_MINUTES doubling per further failure,
+     capped at INGEST_BREAKER_MAX_COOLDOWN_HOURS, ±20% jitter, never
+     shorter than the server's Retry-After
+   - half_open: after the cooldown one probe fetch is allowed; success
+     closes the breaker, failure re-opens it with a longer cooldown
+
+State lives in the circuit_breakers table so it survives restarts and is
+shared by sharded workers; it is shown in /admin/status. In-process it is
+loaded per run (load_breakers → save_breakers), and runs in one process
+never overlap (orchestrator.run_lock) — otherwise a second run's load
+would drop the first one's failure counts and half-open probes.
+"""
+
+import os
+import random
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from email.utils import parsedate_to_datetime
+import httpx
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from .models import CircuitBreakerState
+
+logger = logging.getLogger(__name__)
+
+MAX_RETRIES = int(os.getenv("INGEST_MAX_RETRIES", "3"))
+RETRY_BASE_DELAY = float(os.getenv("INGEST_RETRY_BASE_DELAY", "1"))
+RETRY_MAX_DELAY = float(os.getenv("INGEST_RETRY_MAX_DELAY", "30"))
+MAX_RETRY_AFTER = float(os.getenv("INGEST_MAX_RETRY_AFTER", "60"))
+
+BREAKER_THRESHOLD = int(os.getenv("INGEST_BREAKER_THRESHOLD", "3"))
+BREAKER_COOLDOWN = timedelta(minutes=float(os.getenv("INGEST_BREAKER_COOLDOWN_MINUTES", "30")))
+BREAKER_MAX_COOLDOWN = timedelta(hours=float(os.getenv("INGEST_BREAKER_MAX_COOLDOWN_HOURS", "24")))
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+
+# ── Retry-After / backoff ────────────────────────────────────────────
+
+def retry_after_seconds(response: httpx.Response) -> float | None:
+    """Retry-After as seconds (delta or HTTP date), None if absent/invalid."""
+    value = response.headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+        return max(0.0, (when - datetime.now(when.tzinfo)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+
+def backoff_delay(attempt: int) -> float:
+    """Full-jitter exponential backoff for retry number `attempt` (0-based)."""
+    return random.uniform(0, min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** attempt))
+
+
+class RetryTransport(httpx.AsyncBaseTransport):
+    """Wraps a transport; retries idempotent requests on 429/5xx."""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, max_retries: int = MAX_RETRIES):
+        self._transport = transport
+        self.max_retries = max_retries
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if request.method not in ("GET", "HEAD"):
+            return await self._transport.handle_async_request(request)
+
+        for attempt in range(self.max_retries + 1):
+            last = attempt == self.max_retries
+            try:
+                response = await self._transport.handle_async_request(request)
+            except (httpx.ConnectError, httpx.RemoteProtocolError) as e:
+                if last:
+                    raise
+                delay = backoff_delay(attempt)
+                logger.info(f"[Retry] {request.url.host}: {type(e).__name__}, retrying in {delay:.1f}s")
+                await asyncio.sleep(delay)
+                continue
+
+            if response.status_code not in RETRY_STATUSES or last:
+                return response
+
+            retry_after = retry_after_seconds(response)
+            if retry_after is not None and retry_after > MAX_RETRY_AFTER:
+                # Server wants a long pause — let the breaker handle it
+                return response
+            delay = retry_after if retry_after is not None else backoff_delay(attempt)
+            await response.aclose()
+            logger.info(f"[Retry] {request.url.host}: HTTP {response.status_code}, retrying in {delay:.1f}s")
+            await asyncio.sleep(delay)
+
+        raise RuntimeError("unreachable")  # loop always returns or raises
+
+    async def aclose(self):
+        await self._transport.aclose()
+
+
+# ── Circuit breakers ─────────────────────────────────────────────────
+
+_breakers: dict[str, dict] = {}
+_dirty: set[str] = set()
+
+
+def load_breakers(db: Session):
+    """Preload breaker state — one query per run. The caller holds the run lock."""
+    _breakers.clear()
+    _dirty.clear()
+    for row in db.execute(select(CircuitBreakerState)).scalars():
+        _breakers[row.source] = {
+            "source": row.source,
+            "state": row.state,
+            "failures": row.failures,
+            "opened_until": row.opened_until,
+            "last_error": row.last_error,
+            "last_failure_at": row.last_failure_at,
+        }
+
+
+def allow(source: str) -> bool:
+    """May this source be fetched now? Moves expired open breakers to half-open."""
+    b = _breakers.get(source)
+    if b is None or b["state"] == CLOSED:
+        return True
+    if b["state"] == OPEN and b["opened_until"] and datetime.utcnow() < b["opened_until"]:
+        return False
+    b["state"] = HALF_OPEN
+    _dirty.add(source)
+    return True
+
+
+def opened_until(source: str) -> datetime | None:
+    b = _breakers.get(source)
+    return b["opened_until"] if b else None
+
+
+def record_success(source: str):
+    b = _breakers.get(source)
+    if b is None or (b["state"] == CLOSED and b["failures"] == 0):
+        return
+    if b["state"] != CLOSED:
+        logger.info(f"[Breaker] {source}: closed after successful probe")
+    b.update(state=CLOSED, failures=0, opened_until=None)
+    _dirty.add(source)
+
+
+def record_failure(source: str, error: str, retry_after: float | None = None):
+    now = datetime.utcnow()
+    b = _breakers.setdefault(source, {
+        "source": source, "state": CLOSED, "failures": 0,
+        "opened_until": None, "last_error": None, "last_failure_at": None,
+    })
+    b["failures"] += 1
+    b["last_error"] = error[:512]
+    b["last_failure_at"] = now
+    _dirty.add(source)
+
+    if b["state"] == HALF_OPEN or b["failures"] >= BREAKER_THRESHOLD:
+        extra = max(0, b["failures"] - BREAKER_THRESHOLD)
+        cooldown = min(BREAKER_MAX_COOLDOWN, BREAKER_COOLDOWN * 2 ** extra)
+        cooldown *= random.uniform(0.8, 1.2)
+        if retry_after is not None:
+            cooldown = max(cooldown, timedelta(seconds=retry_after))
+        b["state"] = OPEN
+        b["opened_until"] = now + cooldown
+        logger.warning(
+            f"[Breaker] {source}: open for {cooldown.total_seconds() / 60:.0f} min "
+            f"after {b['failures']} failures ({error[:120]})"
+        )
+
+
+def failure_retry_after(exc: BaseException) -> float | None:
+    """Retry-After from a raised HTTPStatusError, if the server sent one."""
+    if isinstance(exc, httpx.HTTPStatusError):
+        return retry_after_seconds(exc.response)
+    return None
+
+
+def save_breakers(db: Session):
+    """
+    Persist breakers changed during this run.
+
+    Does NOT commit.
+    """
+    if not _dirty:
+        return
+    now = datetime.utcnow()
+    rows = [{**_breakers[s], "updated_at": now} for s in _dirty]
+    stmt = pg_insert(CircuitBreakerState).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[CircuitBreakerState.source],
+        set_={
+            c: stmt.excluded[c]
+            for c in ("state", "failures", "opened_until", "last_error", "last_failure_at", "updated_at")
+        },
+    )
+    db.execute(stmt)
+    _dirty.clear()
+
+
+def breaker_status(db: Session) -> dict:
+    """Summary for /admin/status: counts per state + every non-closed breaker."""
+    rows = db.execute(select(CircuitBreakerState)).scalars().all()
+    counts = {CLOSED: 0, OPEN: 0, HALF_OPEN: 0}
+    tripped = []
+    for row in rows:
+        counts[row.state] = counts.get(row.state, 0) + 1
+        if row.state != CLOSED:
+            tripped.append({
+                "source": row.source,
+                "state": row.state,
+                "failures": row.failures,
+                "opened_until": row.opened_until.isoformat() if row.opened_until else None,
+                "last_error": row.last_error,
+            })
+    return {"counts": counts, "tripped": sorted(tripped, key=lambda r: r["source"])}
@@ -0,0 +1,154 @@
+"""
+Shared HTTP clients for ingest fetchers.
+
+WHY: every fetcher used to open its own httpx.AsyncClient per call (and
+detail.fetch_job_text one per posting), throwing away TLS sessions and
+keep-alive connections. Now each source gets one pooled client for the
+whole ingest run:
+- connection reuse across orgs/pages/detail URLs (one handshake per host)
+- HTTP/2 when the `h2` package is installed
+- per-source connection limits, timeouts and default headers
+- retries with backoff on 429/5xx (breaker.RetryTransport)
+- per-host concurrency + requests/second on every request, retries
+  included (throttle.HostLimitTransport)
+
+Lifecycle:
+    async with ingest_session():      # run_ingest_once does this
+        client = get_client("greenhouse")
+        r = await client.get(url)
+
+Clients are closed when the outermost ingest_session() exits. Calling
+get_client() outside a session still works; the clients live until the
+next close_clients().
+"""
+
+import os
+import logging
+import importlib.util
+from contextlib import asynccontextmanager
+import httpx
+
+from .breaker import RetryTransport
+from .throttle import HostLimitTransport
+
+logger = logging.getLogger(__name__)
+
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+_BROWSER_UA = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+    "AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/122.0.0.0 Safari/537.36"
+)
+
+# Per-source client settings. Anything not listed uses DEFAULT_CONFIG.
+SOURCE_CONFIG: dict[str, dict] = {
+    "greenhouse": {"max_connections": 10},
+    "lever": {"max_connections": 10},
+    "ashby": {"max_connections": 10},
+    "remoteok": {"headers": {"User-Agent": _BROWSER_UA}},
+    "himalayas": {
+        "timeout": 60,
+        "headers": {
+            "User-Agent": "Mozilla/5.0 (compatible; MyJobPhase/1.0)",
+            "Accept": "application/json",
+        },
+    },
+    "europeremotely": {
+        "timeout": 60,
+        "follow_redirects": True,
+        "headers": {"User-Agent": _BROWSER_UA},
+    },
+    "remoteafrica": {
+        "follow_redirects": True,
+        "headers": {
+            "User-Agent": _BROWSER_UA,
+            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+            "Accept-Language": "en-US,en;q=0.9",
+        },
+    },
+    "detail": {
+        "timeout": int(os.getenv("DETAIL_TIMEOUT", "20")),
+        "follow_redirects": True,
+        "max_connections": int(os.getenv("DETAIL_CONCURRENCY", "3")) * 2,
+    },
+}
+
+DEFAULT_CONFIG = {
+    "timeout": 30,
+    "follow_redirects": False,
+    "headers": {},
+    "max_connections": int(os.getenv("INGEST_MAX_CONNECTIONS", "5")),
+}
+
+
+class ClientRegistry:
+    """One lazily-built AsyncClient per source name."""
+
+    def __init__(self):
+        self._clients: dict[str, httpx.AsyncClient] = {}
+
+    def get(self, source: str) -> httpx.AsyncClient:
+        client = self._clients.get(source)
+        if client is None or client.is_closed:
+            client = self._build(source)
+            self._clients[source] = client
+        return client
+
+    def _build(self, source: str) -> httpx.AsyncClient:
+        cfg = {**DEFAULT_CONFIG, **SOURCE_CONFIG.get(source, {})}
+        # http2/limits live on the inner transport once we pass our own
+        transport = httpx.AsyncHTTPTransport(
+            http2=HTTP2_AVAILABLE,
+            limits=httpx.Limits(
+                max_connections=cfg["max_connections"],
+                max_keepalive_connections=cfg["max_connections"],
+                keepalive_expiry=30,
+            ),
+        )
+        return httpx.AsyncClient(
+            timeout=cfg["timeout"],
+            headers=cfg["headers"],
+            follow_redirects=cfg["follow_redirects"],
+            # limiter inside the retry loop: each attempt takes a slot
+            transport=RetryTransport(HostLimitTransport(transport, label=source)),
+        )
+
+    async def aclose(self):
+        for source, client in list(self._clients.items()):
+            try:
+                await client.aclose()
+            except Exception as e:
+                logger.warning(f"[HTTP] Closing {source} client failed: {e}")
+        self._clients.clear()
+
+
+_registry = ClientRegistry()
+_open_sessions = 0
+
+
+def get_client(source: str) -> httpx.AsyncClient:
+    """Pooled client for a source ("greenhouse", "detail", ...)."""
+    return _registry.get(source)
+
+
+async def close_clients():
+    await _registry.aclose()
+
+
+@asynccontextmanager
+async def ingest_session():
+    """
+    Scope shared clients to an ingest run.
+
+    Re-entrant: overlapping runs (startup ingest + scheduled ingest) share
+    the clients and only the last one out closes them.
+    """
+    global _open_sessions
+    _open_sessions += 1
+    try:
+        yield _registry
+    finally:
+        _open_sessions -= 1
+        if _open_sessions == 0:
+            await close_clients()
@@ -0,0 +1,193 @@
+"""
+Conditional requests for board/feed fetchers.
+
+WHY: most Greenhouse/Lever/Ashby boards and the Remotive/Arbeitnow feeds
+don't change between runs, yet we used to re-download, re-parse, re-filter
+and re-upsert all of them. Now:
+- the last ETag / Last-Modified per URL is sent back on the next run
+- a 304, or a 200 whose body hashes the same as last time, raises
+  NotModified → the orchestrator skips the whole pipeline for that board
+  and just bumps last_seen_at on its jobs in one UPDATE
+
+Streamed feeds (conditional_stream) hash the body chunk by chunk while
+spooling it (RAM up to INGEST_SPOOL_MEMORY_BYTES, then a temp file), so
+NotModified is still raised before a single record is parsed.
+
+Validators are only persisted (commit_validators) after the board's jobs
+were written successfully — otherwise a failed upsert would be "cached"
+and silently skipped on every following run.
+
+Disable with CONDITIONAL_FETCH=false (e.g. after a location_filter change
+that needs every board re-processed).
+"""
+
+import os
+import hashlib
+import logging
+import tempfile
+from contextvars import ContextVar
+from datetime import datetime
+from typing import AsyncIterator
+from urllib.parse import urlencode
+import httpx
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from .models import HttpValidator
+from .stream import STREAM_CHUNK
+
+logger = logging.getLogger(__name__)
+
+CONDITIONAL_FETCH = os.getenv("CONDITIONAL_FETCH", "true").lower() == "true"
+SPOOL_MEMORY_BYTES = int(os.getenv("INGEST_SPOOL_MEMORY_BYTES", str(1024 * 1024)))
+
+# Board currently being ingested — set by the orchestrator around fetch()
+current_source: ContextVar[str | None] = ContextVar("current_source", default=None)
+
+_validators: dict[str, HttpValidator] | None = None
+_pending: dict[str, list[dict]] = {}
+
+
+class NotModified(Exception):
+    """Board unchanged since the last successful ingest."""
+
+    def __init__(self, url: str, reason: str):
+        super().__init__(f"{url} not modified ({reason})")
+        self.url = url
+        self.reason = reason
+
+
+def _validator_key(url: str, params: dict | None) -> str:
+    if not params:
+        return url
+    return f"{url}?{urlencode(sorted(params.items()))}"
+
+
+def load_validators(db: Session):
+    """
+    Preload every stored validator — one query per run instead of one per board.
+
+    Resets the staged validators too, so runs must not overlap — the
+    orchestrator holds its run lock from here to the last commit_validators.
+    """
+    global _validators
+    rows = db.execute(select(HttpValidator)).scalars().all()
+    for row in rows:
+        db.expunge(row)
+    _validators = {row.url: row for row in rows}
+    _pending.clear()
+
+
+def _request_headers(key: str) -> tuple[HttpValidator | None, dict]:
+    saved = (_validators or {}).get(key)
+    headers = {}
+    if saved and saved.etag:
+        headers["If-None-Match"] = saved.etag
+    if saved and saved.last_modified:
+        headers["If-Modified-Since"] = saved.last_modified
+    return saved, headers
+
+
+def _stage(source: str, key: str, saved: HttpValidator | None, response: httpx.Response, digest: str):
+    """Raise NotModified for a known payload, else stage its validators."""
+    if saved and saved.payload_hash == digest:
+        raise NotModified(key, "same payload")
+    _pending.setdefault(source, []).append({
+        "url": key,
+        "source": source,
+        "etag": response.headers.get("etag"),
+        "last_modified": response.headers.get("last-modified"),
+        "payload_hash": digest,
+        "updated_at": datetime.utcnow(),
+    })
+
+
+async def conditional_get(client: httpx.AsyncClient, url: str, params: dict | None = None) -> httpx.Response:
+    """
+    GET with stored validators.
+
+    Raises NotModified on 304 or an identical payload. Any other response
+    (including 404/5xx) is returned for the caller to handle as before.
+    """
+    source = current_source.get()
+    if not CONDITIONAL_FETCH or source is None:
+        return await client.get(url, params=params)
+
+    key = _validator_key(url, params)
+    saved, headers = _request_headers(key)
+
+    r = await client.get(url, params=params, headers=headers)
+    if r.status_code == 304:
+        raise NotModified(key, "304")
+
+    if r.is_success:
+        _stage(source, key, saved, r, hashlib.sha256(r.content).hexdigest())
+    return r
+
+
+async def conditional_stream(client: httpx.AsyncClient, url: str, params: dict | None = None) -> AsyncIterator[bytes]:
+    """
+    Streaming conditional_get: yields the body in STREAM_CHUNK pieces.
+
+    The payload hash needs the whole body, so it is spooled while hashing
+    and replayed from the spool; NotModified (304 / same payload) is raised
+    before the first chunk. Error statuses raise httpx.HTTPStatusError.
+    The hash is the same as conditional_get's, so stored validators carry over.
+    """
+    source = current_source.get()
+    if not CONDITIONAL_FETCH or source is None:
+        async with client.stream("GET", url, params=params) as r:
+            r.raise_for_status()
+            async for chunk in r.aiter_bytes(STREAM_CHUNK):
+                yield chunk
+        return
+
+    key = _validator_key(url, params)
+    saved, headers = _request_headers(key)
+
+    with tempfile.SpooledTemporaryFile(max_size=SPOOL_MEMORY_BYTES) as spool:
+        digest = hashlib.sha256()
+        async with client.stream("GET", url, params=params, headers=headers) as r:
+            if r.status_code == 304:
+                raise NotModified(key, "304")
+            r.raise_for_status()
+            async for chunk in r.aiter_bytes(STREAM_CHUNK):
+                digest.update(chunk)
+                spool.write(chunk)
+        _stage(source, key, saved, r, digest.hexdigest())
+
+        spool.seek(0)
+        while chunk := spool.read(STREAM_CHUNK):
+            yield chunk
+
+
+def discard_validators(source: str):
+    """Drop validators staged for a board whose ingest failed."""
+    _pending.pop(source, None)
+
+
+def commit_validators(db: Session, source: str):
+    """
+    Persist validators staged for a board after its jobs were written.
+
+    Does NOT commit — runs inside the caller's upsert transaction.
+    """
+    rows = _pending.pop(source, None)
+    if not rows:
+        return
+    stmt = pg_insert(HttpValidator).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[HttpValidator.url],
+        set_={
+            "source": stmt.excluded.source,
+            "etag": stmt.excluded.etag,
+            "last_modified": stmt.excluded.last_modified,
+            "payload_hash": stmt.excluded.payload_hash,
+            "updated_at": stmt.excluded.updated_at,
+        },
+    )
+    db.execute(stmt)
+    if _validators is not None:
+        for row in rows:
+            _validators[row["url"]] = HttpValidator(**row)
@@ -0,0 +1,136 @@
+"""
+Incremental cursors for paginated feeds.
+
+WHY: fetch_remotive_jobs(168), fetch_remoteok_jobs(168) and the Himalayas
+pagination re-read a fixed 7-day window / page count every run — almost
+all of it postings we already have. Now each feed keeps a high-water mark
+(newest posted_at seen):
+- items older than the mark are skipped before normalization
+  (extract_skills, HTML stripping) and Himalayas stops paginating
+- the mark minus INGEST_CURSOR_OVERLAP_MINUTES is used, so postings
+  indexed a little late aren't lost
+- every INGEST_FULL_RESYNC_HOURS (default 168) the cursor is ignored for
+  one run: full window, as a safety net
+
+Same lifecycle as conditional.py validators: fetchers stage the new mark
+with advance(), the orchestrator persists it (commit_cursors) only after
+the board's jobs were written. Staged marks are per-run module state, so
+runs in one process never overlap (orchestrator.run_lock) — a second
+run's load_cursors would otherwise drop the first run's advances.
+
+Disable with INCREMENTAL_FETCH=false.
+"""
+
+import os
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from .models import IngestCursor
+from .conditional import current_source
+
+INCREMENTAL_FETCH = os.getenv("INCREMENTAL_FETCH", "true").lower() == "true"
+CURSOR_OVERLAP = timedelta(minutes=int(os.getenv("INGEST_CURSOR_OVERLAP_MINUTES", "60")))
+FULL_RESYNC_INTERVAL = timedelta(hours=float(os.getenv("INGEST_FULL_RESYNC_HOURS", "168")))
+
+_cursors: dict[str, IngestCursor] | None = None
+_pending: dict[str, dict] = {}
+
+
+def _naive_utc(dt: datetime) -> datetime:
+    return dt.astimezone(timezone.utc).replace(tzinfo=None) if dt.tzinfo else dt
+
+
+def load_cursors(db: Session):
+    """
+    Preload every stored cursor — one query per run. Drops marks staged
+    by an earlier run that never finished; the caller holds the run lock.
+    """
+    global _cursors
+    rows = db.execute(select(IngestCursor)).scalars().all()
+    for row in rows:
+        db.expunge(row)
+    _cursors = {row.source: row for row in rows}
+    _pending.clear()
+
+
+def watermark() -> datetime | None:
+    """
+    Oldest posted_at the current board still needs (tz-aware UTC), or None
+    for a full fetch (no cursor yet, resync due, or incremental disabled).
+    """
+    source = current_source.get()
+    if not INCREMENTAL_FETCH or source is None:
+        return None
+    cursor = (_cursors or {}).get(source)
+    if cursor is None or cursor.high_water is None or cursor.last_full_sync_at is None:
+        return None
+    if datetime.utcnow() - cursor.last_full_sync_at > FULL_RESYNC_INTERVAL:
+        return None
+    return (cursor.high_water - CURSOR_OVERLAP).replace(tzinfo=timezone.utc)
+
+
+def advance(newest: datetime | None, full: bool):
+    """
+    Stage the new high-water mark for the current board.
+
+    newest: newest posted_at in this fetch (None if the feed was empty)
+    full:   True if this fetch ignored the cursor (watermark() was None)
+    """
+    source = current_source.get()
+    if not INCREMENTAL_FETCH or source is None:
+        return
+    saved = (_cursors or {}).get(source)
+    high_water = _naive_utc(newest) if newest else None
+    if saved and saved.high_water and (high_water is None or saved.high_water > high_water):
+        high_water = saved.high_water
+    now = datetime.utcnow()
+    _pending[source] = {
+        "source": source,
+        "high_water": high_water,
+        "last_full_sync_at": now if full else (saved.last_full_sync_at if saved else None),
+        "updated_at": now,
+        "full": full,
+    }
+
+
+def is_incremental(source: str) -> bool:
+    """True if the board's staged fetch skipped known postings."""
+    staged = _pending.get(source)
+    return staged is not None and not staged["full"]
+
+
+def last_full_sync(source: str) -> datetime | None:
+    """When the board's last committed full fetch ran (None: no cursor yet)."""
+    cursor = (_cursors or {}).get(source)
+    return cursor.last_full_sync_at if cursor else None
+
+
+def discard_cursors(source: str):
+    """Drop the cursor staged for a board whose ingest failed."""
+    _pending.pop(source, None)
+
+
+def commit_cursors(db: Session, source: str):
+    """
+    Persist the cursor staged for a board after its jobs were written.
+
+    Does NOT commit — runs inside the caller's upsert transaction.
+    """
+    staged = _pending.pop(source, None)
+    if not staged:
+        return
+    row = {k: v for k, v in staged.items() if k != "full"}
+    stmt = pg_insert(IngestCursor).values(row)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[IngestCursor.source],
+        set_={
+            "high_water": stmt.excluded.high_water,
+            "last_full_sync_at": stmt.excluded.last_full_sync_at,
+            "updated_at": stmt.excluded.updated_at,
+        },
+    )
+    db.execute(stmt)
+    if _cursors is not None:
+        _cursors[source] = IngestCursor(**row)
@@ -1,21 +1,54 @@
-import os, asyncio, httpx
-from bs4 import BeautifulSoup
+import os, asyncio
+from .clients import get_client
+from .detail_cache import detail_cache
+from .extract import extract_main_text
 
 DETAIL_FETCH = (os.getenv("DETAIL_FETCH", "false").lower() == "true")
 DETAIL_CONCURRENCY = int(os.getenv("DETAIL_CONCURRENCY", "3"))
 DETAIL_TIMEOUT = int(os.getenv("DETAIL_TIMEOUT", "20"))
+DETAIL_MAX_CHARS = int(os.getenv("DETAIL_MAX_CHARS", "20000"))
+
+_sema: asyncio.Semaphore | None = None
+_sema_loop = None
+
+
+def _get_sema() -> asyncio.Semaphore:
+    # asyncio primitives are loop-bound; each ingest run may use a new loop
+    global _sema, _sema_loop
+    loop = asyncio.get_running_loop()
+    if _sema is None or _sema_loop is not loop:
+        _sema = asyncio.Semaphore(DETAIL_CONCURRENCY)
+        _sema_loop = loop
+    return _sema
 
-_sema = asyncio.Semaphore(DETAIL_CONCURRENCY)
 
 async def fetch_job_text(url: str) -> str | None:
     if not DETAIL_FETCH or not url:
         return None
-    async with _sema:
-        async with httpx.AsyncClient(timeout=DETAIL_TIMEOUT, follow_redirects=True) as client:
-            r = await client.get(url)
-            r.raise_for_status()
-            html = r.text
-    soup = BeautifulSoup(html, "lxml")
-    # keep it simple: full page text (you can narrow to a content div later)
-    text = soup.get_text(" ", strip=True)
-    return text[:20000]  # guard: very long pages
+
+    # fresh cache entry → no request at all
+    cached = detail_cache.get(url)
+    if cached and cached["fresh"]:
+        detail_cache.stats["hits"] += 1
+        return cached["text"]
+
+    headers = {}
+    if cached and cached["etag"]:
+        headers["If-None-Match"] = cached["etag"]
+    if cached and cached["last_modified"]:
+        headers["If-Modified-Since"] = cached["last_modified"]
+
+    async with _get_sema():
+        # shared pooled client — keep-alive across every detail URL of the run
+        r = await get_client("detail").get(url, headers=headers, timeout=DETAIL_TIMEOUT)
+        if r.status_code == 304 and cached:
+            detail_cache.mark_revalidated(url)
+            return cached["text"]
+        r.raise_for_status()
+        html = r.text
+    detail_cache.stats["misses"] += 1
+
+    # job body only — no nav/footer/related-jobs noise
+    text = extract_main_text(html, url=url, max_chars=DETAIL_MAX_CHARS)
+    detail_cache.put(url, text, r.headers.get("etag"), r.headers.get("last-modified"))
+    return text
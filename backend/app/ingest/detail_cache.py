@@ -0,0 +1,149 @@
+"""
+Persistent cache for detail-page text (app/ingest/detail.fetch_job_text).
+
+WHY: with DETAIL_FETCH on, every run re-downloaded the full HTML of every
+posting with a short description — the whole board, every 12 hours. Now
+extracted text is cached on disk, keyed by URL:
+- fresh entries (younger than DETAIL_CACHE_TTL_HOURS) → no request at all
+- stale entries → revalidated with If-None-Match / If-Modified-Since;
+  a 304 just refreshes the entry
+- LRU eviction once the cache exceeds DETAIL_CACHE_MAX_MB
+- hit / miss / revalidated counters for the run summary
+
+So enabling detail fetch only costs us the new postings.
+
+Storage: SQLite at data/cache/detail.sqlite (stdlib, one file, safe for
+the concurrent readers/writers we have).
+"""
+
+import os
+import time
+import sqlite3
+import threading
+from pathlib import Path
+
+DETAIL_CACHE_TTL_HOURS = float(os.getenv("DETAIL_CACHE_TTL_HOURS", "72"))
+DETAIL_CACHE_MAX_MB = float(os.getenv("DETAIL_CACHE_MAX_MB", "200"))
+
+# Run eviction every N writes rather than on every put
+_EVICT_EVERY = 50
+
+
+class DetailCache:
+    def __init__(
+        self,
+        path: str = "data/cache/detail.sqlite",
+        ttl_hours: float = DETAIL_CACHE_TTL_HOURS,
+        max_mb: float = DETAIL_CACHE_MAX_MB,
+    ):
+        self.path = Path(path)
+        self.ttl_seconds = ttl_hours * 3600
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.stats = {"hits": 0, "misses": 0, "revalidated": 0, "stored": 0, "evicted": 0}
+        self._lock = threading.Lock()
+        self._conn: sqlite3.Connection | None = None
+        self._puts = 0
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS pages (
+                    url TEXT PRIMARY KEY,
+                    text TEXT NOT NULL,
+                    etag TEXT,
+                    last_modified TEXT,
+                    fetched_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL,
+                    size INTEGER NOT NULL
+                )
+            """)
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_pages_accessed ON pages (accessed_at)")
+        return self._conn
+
+    def get(self, url: str) -> dict | None:
+        """Cached entry for url (any age) or None. Marks it as recently used."""
+        with self._lock:
+            db = self._db()
+            row = db.execute(
+                "SELECT text, etag, last_modified, fetched_at FROM pages WHERE url = ?", (url,)
+            ).fetchone()
+            if row is None:
+                return None
+            db.execute("UPDATE pages SET accessed_at = ? WHERE url = ?", (time.time(), url))
+        text, etag, last_modified, fetched_at = row
+        return {
+            "text": text,
+            "etag": etag,
+            "last_modified": last_modified,
+            "fresh": (time.time() - fetched_at) < self.ttl_seconds,
+        }
+
+    def put(self, url: str, text: str, etag: str | None = None, last_modified: str | None = None):
+        now = time.time()
+        with self._lock:
+            self._db().execute(
+                """
+                INSERT INTO pages (url, text, etag, last_modified, fetched_at, accessed_at, size)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(url) DO UPDATE SET
+                    text = excluded.text, etag = excluded.etag,
+                    last_modified = excluded.last_modified,
+                    fetched_at = excluded.fetched_at, accessed_at = excluded.accessed_at,
+                    size = excluded.size
+                """,
+                (url, text, etag, last_modified, now, now, len(text.encode("utf-8"))),
+            )
+            self.stats["stored"] += 1
+            self._puts += 1
+            if self._puts % _EVICT_EVERY == 0:
+                self._evict_locked()
+
+    def mark_revalidated(self, url: str):
+        """Server answered 304 — entry is good for another TTL."""
+        now = time.time()
+        with self._lock:
+            self._db().execute(
+                "UPDATE pages SET fetched_at = ?, accessed_at = ? WHERE url = ?", (now, now, url)
+            )
+        self.stats["revalidated"] += 1
+
+    def evict(self):
+        with self._lock:
+            self._evict_locked()
+
+    def _evict_locked(self):
+        """Drop least-recently-used entries until we're under max_bytes."""
+        db = self._db()
+        total = db.execute("SELECT COALESCE(SUM(size), 0) FROM pages").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        excess = total - self.max_bytes
+        freed = 0
+        victims = []
+        for url, size in db.execute("SELECT url, size FROM pages ORDER BY accessed_at ASC"):
+            victims.append((url,))
+            freed += size
+            if freed >= excess:
+                break
+        db.executemany("DELETE FROM pages WHERE url = ?", victims)
+        self.stats["evicted"] += len(victims)
+
+    def snapshot(self) -> dict:
+        """Counters + current size, for the run summary / admin."""
+        with self._lock:
+            entries, size = self._db().execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM pages"
+            ).fetchone()
+        lookups = self.stats["hits"] + self.stats["misses"] + self.stats["revalidated"]
+        return {
+            **self.stats,
+            "entries": entries,
+            "size_mb": round(size / 1024 / 1024, 2),
+            "hit_rate": round((self.stats["hits"] + self.stats["revalidated"]) / lookups, 3) if lookups else 0.0,
+        }
+
+
+detail_cache = DetailCache()
@@ -1,7 +1,7 @@
-import httpx
 from typing import List, Dict
 from app.core.skills import extract_skills
 from bs4 import BeautifulSoup
+from .clients import get_client
 
 async def fetch_europeremotely_jobs() -> List[Dict]:
     """
@@ -10,20 +10,11 @@ async def fetch_europeremotely_jobs() -> List[Dict]:
     """
     
     url = "https://europeremotely.com/jobs/"
-    
-    # FIX: Add User-Agent and longer timeout
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-    }
-    
-    async with httpx.AsyncClient(timeout=60, headers=headers, follow_redirects=True) as client:
-        try:
-            r = await client.get(url)
-            r.raise_for_status()
-        except httpx.HTTPStatusError as e:
-            # Site might be blocking scrapers
-            print(f"EuropeRemotely returned status {e.response.status_code}")
-            return []
+
+    # User-Agent, longer timeout and redirects are set on the shared client.
+    # A 403 (scraper blocked) raises so the circuit breaker backs off.
+    r = await get_client("europeremotely").get(url)
+    r.raise_for_status()
     
     soup = BeautifulSoup(r.text, "lxml")
     jobs = []
@@ -0,0 +1,217 @@
+"""
+Main-content extraction for job pages and HTML descriptions.
+
+WHY: detail.fetch_job_text and himalayas._strip_html ran a full
+BeautifulSoup parse + get_text() over the whole page. For detail pages
+that meant nav, cookie banners, "other openings" lists and footers —
+then a blind cut at 20k chars. That noise was stored in description_text
+and sent to the LLM scorers on every match.
+
+Now (lxml, C-backed, ~10x faster than BeautifulSoup on the same page):
+1. per-ATS selectors for the hosts we actually fetch (Greenhouse, Lever,
+   Ashby, Himalayas)
+2. schema.org JobPosting JSON-LD description (most ATS pages embed it)
+3. itemprop="description"
+4. readability-style scoring: paragraphs vote for their parent blocks,
+   link-heavy blocks (menus, footers) are penalized
+5. whole <body> minus boilerplate tags, as a last resort
+
+Usage:
+    text = extract_main_text(html, url=job_url)
+    text = html_to_text(description_html)   # fragments from JSON APIs
+
+Benchmark against the old approach: benchmarks/bench_extract.py
+"""
+
+import re
+import html as htmllib
+import json
+from urllib.parse import urlparse
+
+import lxml.html
+from lxml import etree
+
+# Tags that never contain the job body
+_NOISE_TAGS = (
+    "script", "style", "noscript", "template", "svg", "iframe", "form",
+    "button", "nav", "header", "footer", "aside",
+)
+
+# Tags that end a line of text
+_BLOCK_TAGS = {
+    "p", "div", "section", "article", "main", "br", "li", "ul", "ol",
+    "h1", "h2", "h3", "h4", "h5", "h6", "tr", "table", "pre", "blockquote",
+    "dd", "dt",
+}
+
+# Host suffix → XPath candidates for the job body, most specific first
+SITE_SELECTORS = {
+    "greenhouse.io": [
+        "//div[contains(concat(' ', normalize-space(@class), ' '), ' job__description ')]",
+        "//div[@id='content']",
+        "//div[@id='app_body']",
+    ],
+    "lever.co": [
+        "//div[@data-qa='job-description']",
+        "//div[contains(concat(' ', normalize-space(@class), ' '), ' posting-page ')]",
+    ],
+    "ashbyhq.com": [
+        "//div[contains(@class, '_descriptionText')]",
+        "//div[@id='overview']",
+    ],
+    "himalayas.app": [
+        "//article",
+    ],
+}
+
+_CANDIDATE_TAGS = ("div", "section", "article", "main", "td")
+_PARAGRAPH_TAGS = ("p", "li", "pre", "td")
+
+_WS_RE = re.compile(r"[ \t\r\f\v\u00a0]+")
+_BLANK_LINES_RE = re.compile(r"\n\s*\n+")
+_TAG_RE = re.compile(r"<[^>]+>")
+
+
+def _clean(text: str) -> str:
+    lines = (_WS_RE.sub(" ", line).strip() for line in text.split("\n"))
+    return _BLANK_LINES_RE.sub("\n", "\n".join(l for l in lines if l)).strip()
+
+
+def _node_text(el) -> str:
+    """Text of an element with block boundaries kept as newlines."""
+    for child in el.iter(*_BLOCK_TAGS):
+        child.tail = "\n" + (child.tail or "")
+    return _clean(el.text_content())
+
+
+def _strip_noise(root):
+    etree.strip_elements(root, *_NOISE_TAGS, with_tail=False)
+    etree.strip_elements(root, etree.Comment, with_tail=False)
+
+
+def _parse(html: str):
+    try:
+        return lxml.html.document_fromstring(html)
+    except (etree.ParserError, ValueError):
+        return None
+
+
+def html_to_text(html: str) -> str:
+    """Plain text of an HTML fragment (API description fields)."""
+    if not html:
+        return ""
+    if "<" not in html:
+        # no tags, but API fields are often entity-escaped ("Ops &amp; SRE")
+        return _clean(htmllib.unescape(html))
+    try:
+        root = lxml.html.fragment_fromstring(html, create_parent="div")
+    except (etree.ParserError, ValueError):
+        return _clean(htmllib.unescape(_TAG_RE.sub(" ", html)))
+    _strip_noise(root)
+    return _node_text(root)
+
+
+def _jsonld_description(root) -> str | None:
+    for script in root.xpath("//script[@type='application/ld+json']"):
+        try:
+            data = json.loads(script.text or "")
+        except ValueError:
+            continue
+        if isinstance(data, dict):
+            items = data.get("@graph", [data])
+        elif isinstance(data, list):
+            items = data
+        else:
+            continue
+        for item in items:
+            if not isinstance(item, dict):
+                continue
+            types = item.get("@type")
+            types = types if isinstance(types, list) else [types]
+            if "JobPosting" in types and item.get("description"):
+                return html_to_text(item["description"])
+    return None
+
+
+def _site_candidates(url: str | None) -> list[str]:
+    if not url:
+        return []
+    host = (urlparse(url).hostname or "").lower()
+    for suffix, selectors in SITE_SELECTORS.items():
+        if host == suffix or host.endswith("." + suffix):
+            return selectors
+    return []
+
+
+def _link_density(el) -> float:
+    text_len = len(el.text_content())
+    if not text_len:
+        return 1.0
+    link_len = sum(len(a.text_content()) for a in el.iter("a"))
+    return link_len / text_len
+
+
+def _readability_pick(root):
+    """
+    Readability-style scoring: each paragraph gives points to its parent
+    (full) and grandparent (half); the best block after the link-density
+    penalty wins.
+    """
+    scores: dict = {}
+    for p in root.iter(*_PARAGRAPH_TAGS):
+        text = p.text_content().strip()
+        if len(text) < 25:
+            continue
+        points = 1 + text.count(",") + min(len(text) / 100, 3)
+        parent = p.getparent()
+        if parent is not None and parent.tag in _CANDIDATE_TAGS:
+            scores[parent] = scores.get(parent, 0) + points
+            grand = parent.getparent()
+            if grand is not None and grand.tag in _CANDIDATE_TAGS:
+                scores[grand] = scores.get(grand, 0) + points / 2
+
+    best, best_score = None, 0.0
+    for el, score in scores.items():
+        score *= 1 - _link_density(el)
+        if score > best_score:
+            best, best_score = el, score
+    return best
+
+
+MIN_MAIN_TEXT = 200  # shorter than this → the match was probably a header/teaser
+
+
+def extract_main_text(html: str, url: str | None = None, max_chars: int = 20000) -> str:
+    """Job-body text of a full page, boilerplate removed."""
+    if not html:
+        return ""
+    root = _parse(html)
+    if root is None:
+        return ""
+
+    # JSON-LD lives in <script>, read it before the noise is stripped
+    jsonld = _jsonld_description(root)
+    _strip_noise(root)
+
+    for xpath in _site_candidates(url):
+        for el in root.xpath(xpath):
+            text = _node_text(el)
+            if len(text) >= MIN_MAIN_TEXT:
+                return text[:max_chars]
+
+    if jsonld and len(jsonld) >= MIN_MAIN_TEXT:
+        return jsonld[:max_chars]
+
+    for el in root.xpath("//*[@itemprop='description']"):
+        text = _node_text(el)
+        if len(text) >= MIN_MAIN_TEXT:
+            return text[:max_chars]
+
+    best = _readability_pick(root)
+    if best is not None:
+        text = _node_text(best)
+        if len(text) >= MIN_MAIN_TEXT:
+            return text[:max_chars]
+
+    body = root.find("body")
+    return _node_text(body if body is not None else root)[:max_chars]
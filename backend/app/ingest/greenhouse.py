@@ -1,18 +1,19 @@
-import httpx, asyncio
+import asyncio
 from typing import List, Dict
 from app.core.skills import extract_skills
 from .detail import fetch_job_text
+from .clients import get_client
+from .conditional import conditional_get
 
 API = "https://boards-api.greenhouse.io/v1/boards/{token}/jobs"
 
 async def fetch_greenhouse_org(token: str) -> List[Dict]:
     url = API.format(token=token)
-    async with httpx.AsyncClient(timeout=30) as client:
-        r = await client.get(url, params={"content": "true"})
-        if r.status_code == 404:
-            raise RuntimeError(f"Greenhouse board not found for '{token}'")
-        r.raise_for_status()
-        data = r.json()
+    r = await conditional_get(get_client("greenhouse"), url, params={"content": "true"})
+    if r.status_code == 404:
+        raise RuntimeError(f"Greenhouse board not found for '{token}'")
+    r.raise_for_status()
+    data = r.json()
 
     out: List[Dict] = []
     jobs = data.get("jobs", [])
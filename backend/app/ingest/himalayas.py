@@ -1,9 +1,12 @@
-import httpx
 import logging
-from typing import List, Dict
+from typing import List, Dict, AsyncIterator
 from datetime import datetime, timezone
-from bs4 import BeautifulSoup
+import httpx
 from app.core.skills import extract_skills
+from .clients import get_client
+from .extract import html_to_text
+from .stream import iter_json_array, STREAM_CHUNK
+from . import cursors
 
 logger = logging.getLogger(__name__)
 
@@ -13,76 +16,111 @@ PAGE_SIZE = 20
 REQUEST_TIMEOUT = 30
 
 
-async def fetch_himalayas_jobs(max_jobs: int = 200, categories: List[str] | None = None) -> List[Dict]:
+async def fetch_himalayas_jobs(max_jobs: int = 200, categories: List[str] | None = None) -> AsyncIterator[Dict]:
+    """
+    Both endpoints return newest first, so pagination stops at the first
+    page that reaches postings older than the stored cursor
+    (app/ingest/cursors.py) — between full resyncs we only read new pages.
+
+    Yields jobs page by page as each page's "jobs" array is decoded
+    (app/ingest/stream.py).
+    """
+    since = cursors.watermark()
     if categories:
-        return await _fetch_search(categories=categories, max_jobs=max_jobs)
-    return await _fetch_browse(max_jobs=max_jobs)
+        jobs = _fetch_search(categories=categories, max_jobs=max_jobs, since=since)
+    else:
+        jobs = _fetch_browse(max_jobs=max_jobs, since=since)
+    newest = None
+    async for job in jobs:
+        newest = job["posted_at"] if newest is None or job["posted_at"] > newest else newest
+        yield job
+    cursors.advance(newest, full=since is None)
+
+
+async def _stream_page(client: httpx.AsyncClient, url: str, page: Dict, **kwargs) -> AsyncIterator[Dict]:
+    """Raw jobs of one API page; page["meta"] gets the other fields (totalCount)."""
+    async with client.stream("GET", url, **kwargs) as r:
+        r.raise_for_status()
+        async for j in iter_json_array(r.aiter_bytes(STREAM_CHUNK), key="jobs", meta=page["meta"]):
+            page["raw"] += 1
+            yield j
+
+
+async def _take_new(raw_jobs: AsyncIterator[Dict], page: Dict, since: datetime | None) -> AsyncIterator[Dict]:
+    """Normalize a page; page["reached_known"] once it reaches known postings."""
+    async for j in raw_jobs:
+        n = _normalize(j)
+        if not n:
+            continue
+        if since and n["posted_at"] < since:
+            page["reached_known"] = True
+            continue
+        yield n
+
+
+def _new_page() -> Dict:
+    return {"raw": 0, "reached_known": False, "meta": {}}
 
 
-async def _fetch_browse(max_jobs: int) -> List[Dict]:
+async def _fetch_browse(max_jobs: int, since: datetime | None = None) -> AsyncIterator[Dict]:
     logger.info(f"[Himalayas] Fetching up to {max_jobs} jobs...")
-    out: List[Dict] = []
+    taken = 0
     offset = 0
 
-    # Match exact headers that work in debug endpoint
-    headers = {
-        "User-Agent": "Mozilla/5.0 (compatible; MyJobPhase/1.0)",
-        "Accept": "application/json",
-    }
-
-    async with httpx.AsyncClient(timeout=60, headers=headers) as client:
-        while len(out) < max_jobs:
+    # Headers that work in debug endpoint are set on the shared "himalayas" client
+    client = get_client("himalayas")
+    while taken < max_jobs:
+        page = _new_page()
+        try:
+            raw_jobs = _stream_page(client, BROWSE_API, page, params={"limit": PAGE_SIZE, "offset": offset})
+            async for job in _take_new(raw_jobs, page, since):
+                if taken < max_jobs:
+                    taken += 1
+                    yield job
+        except Exception as e:
+            # Log type AND message — empty message hides the real error
+            logger.error(f"[Himalayas] Browse failed (offset={offset}): {type(e).__name__}: {e}")
+            if offset == 0:
+                raise  # nothing fetched — let the circuit breaker see it
+            break
+
+        if not page["raw"]:
+            break
+
+        if page["reached_known"]:
+            logger.info(f"[Himalayas] Reached known postings at offset {offset}")
+            break
+
+        offset += PAGE_SIZE
+        if offset >= min(page["meta"].get("totalCount", 0), max_jobs + PAGE_SIZE):
+            break
+
+    logger.info(f"[Himalayas] Done — {taken} jobs")
+
+
+async def _fetch_search(categories: List[str], max_jobs: int, since: datetime | None = None) -> AsyncIterator[Dict]:
+    taken = 0
+    client = get_client("himalayas")
+    for category in categories:
+        page_no = 1
+        while taken < max_jobs:
+            page = _new_page()
             try:
-                r = await client.get(
-                    BROWSE_API,
-                    params={"limit": PAGE_SIZE, "offset": offset}
+                raw_jobs = _stream_page(
+                    client, SEARCH_API, page,
+                    params={"q": category, "page": page_no, "sort": "recent"},
+                    timeout=REQUEST_TIMEOUT,
                 )
-                r.raise_for_status()
-                data = r.json()
+                async for job in _take_new(raw_jobs, page, since):
+                    if taken < max_jobs:
+                        taken += 1
+                        yield job
             except Exception as e:
-                # Log type AND message — empty message hides the real error
-                logger.error(f"[Himalayas] Browse failed (offset={offset}): {type(e).__name__}: {e}")
+                logger.error(f"[Himalayas] Search failed ({category} p{page_no}): {e}")
                 break
-
-            raw_jobs = data.get("jobs", [])
-            total_count = data.get("totalCount", 0)
-            if not raw_jobs:
+            if not page["raw"] or page["reached_known"]:
                 break
-
-            for j in raw_jobs:
-                n = _normalize(j)
-                if n:
-                    out.append(n)
-
-            offset += PAGE_SIZE
-            if offset >= min(total_count, max_jobs + PAGE_SIZE):
-                break
-
-    logger.info(f"[Himalayas] Done — {len(out)} jobs")
-    return out[:max_jobs]
-
-
-async def _fetch_search(categories: List[str], max_jobs: int) -> List[Dict]:
-    out: List[Dict] = []
-    async with httpx.AsyncClient(timeout=REQUEST_TIMEOUT) as client:
-        for category in categories:
-            page = 1
-            while len(out) < max_jobs:
-                try:
-                    r = await client.get(SEARCH_API, params={"q": category, "page": page, "sort": "recent"})
-                    r.raise_for_status()
-                    raw_jobs = r.json().get("jobs", [])
-                except Exception as e:
-                    logger.error(f"[Himalayas] Search failed ({category} p{page}): {e}")
-                    break
-                if not raw_jobs:
-                    break
-                for j in raw_jobs:
-                    n = _normalize(j)
-                    if n:
-                        out.append(n)
-                page += 1
-    return out[:max_jobs]
+            page_no += 1
 
 
 def _normalize(j: Dict) -> Dict | None:
@@ -176,7 +214,4 @@ def _parse_date(val) -> datetime:
 def _strip_html(html: str) -> str:
     if not html:
         return ""
-    try:
-        return BeautifulSoup(html, "lxml").get_text(separator=" ", strip=True)
-    except Exception:
-        return html
\ No newline at end of file
+    return html_to_text(html)
\ No newline at end of file
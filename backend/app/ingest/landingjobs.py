@@ -1,6 +1,7 @@
-import httpx
 from typing import List, Dict
 from app.core.skills import extract_skills
+from .clients import get_client
+from .conditional import conditional_get
 import re
 
 API = "https://landing.jobs/api/v1/jobs"
@@ -17,14 +18,13 @@ async def fetch_landingjobs() -> List[Dict]:
     Strong presence: Portugal, Spain, Germany, UK
     """
     
-    async with httpx.AsyncClient(timeout=30) as client:
-        r = await client.get(API, params={
-            "remote": "true",
-            "page": 1,
-            "per_page": 100
-        })
-        r.raise_for_status()
-        data = r.json()
+    r = await conditional_get(get_client("landingjobs"), API, params={
+        "remote": "true",
+        "page": 1,
+        "per_page": 100
+    })
+    r.raise_for_status()
+    data = r.json()
 
     # FIX: Check if data is dict or list
     if isinstance(data, dict):
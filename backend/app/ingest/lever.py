@@ -1,18 +1,18 @@
-import httpx
 from typing import List, Dict
 from app.core.skills import extract_skills
+from .clients import get_client
+from .conditional import conditional_get
 
 API = "https://api.lever.co/v0/postings/{org}"
 async def fetch_lever_org(org: str) -> List[Dict]:
     """Returns normalized dicts ready for schemas.JobCreate(**d)
     """
     url = API.format(org=org)
-    async with httpx.AsyncClient(timeout=30) as client:
-        r = await client.get(url, params={"mode": "json"})
-        if r.status_code == 404:
-            raise RuntimeError(f"Lever org not found for '{org}'")
-        r.raise_for_status()
-        data = r.json()
+    r = await conditional_get(get_client("lever"), url, params={"mode": "json"})
+    if r.status_code == 404:
+        raise RuntimeError(f"Lever org not found for '{org}'")
+    r.raise_for_status()
+    data = r.json()
 
     out: List[Dict] = []
     for j in data:
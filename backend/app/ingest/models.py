@@ -0,0 +1,75 @@
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import String, DateTime, Float, Integer
+from datetime import datetime
+from app.core.db import Base
+
+
+class HttpValidator(Base):
+    """
+    Last successful response validators per fetched board URL.
+
+    Sent back as If-None-Match / If-Modified-Since on the next run; the
+    payload hash catches boards that ignore conditional requests.
+    """
+    __tablename__ = "http_validators"
+
+    url: Mapped[str] = mapped_column(String(1024), primary_key=True)
+    source: Mapped[str] = mapped_column(String(128), index=True)
+    etag: Mapped[str | None] = mapped_column(String(256), default=None)
+    last_modified: Mapped[str | None] = mapped_column(String(64), default=None)
+    payload_hash: Mapped[str | None] = mapped_column(String(64), default=None)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+
+
+class IngestCursor(Base):
+    """
+    High-water mark per paginated feed (Remotive, RemoteOK, Himalayas).
+
+    Fetchers stop at postings older than high_water instead of re-reading
+    a fixed window every run; last_full_sync_at drives the periodic full
+    resync (app/ingest/cursors.py).
+    """
+    __tablename__ = "ingest_cursors"
+
+    source: Mapped[str] = mapped_column(String(128), primary_key=True)
+    high_water: Mapped[datetime | None] = mapped_column(DateTime, default=None)
+    last_full_sync_at: Mapped[datetime | None] = mapped_column(DateTime, default=None)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+
+
+class SourceSchedule(Base):
+    """
+    Adaptive polling state per ingest unit (board key from build_ingest_plan).
+
+    change_rate is an EWMA of new+changed jobs per fetch; interval_minutes
+    is stretched for quiet boards and shortened for busy ones
+    (app/ingest/schedule.py).
+    """
+    __tablename__ = "source_schedule"
+
+    source: Mapped[str] = mapped_column(String(128), primary_key=True)
+    label: Mapped[str] = mapped_column(String(64))
+    interval_minutes: Mapped[float] = mapped_column(Float)
+    change_rate: Mapped[float] = mapped_column(Float, default=0.0)
+    runs: Mapped[int] = mapped_column(Integer, default=0)
+    last_status: Mapped[str | None] = mapped_column(String(32), default=None)
+    last_run_at: Mapped[datetime | None] = mapped_column(DateTime, default=None)
+    next_run_at: Mapped[datetime] = mapped_column(DateTime, index=True)
+
+
+class CircuitBreakerState(Base):
+    """
+    Circuit breaker per ingest source (app/ingest/breaker.py).
+
+    state is "closed", "open" or "half_open"; failures counts consecutive
+    failed fetches; an open breaker skips the source until opened_until.
+    """
+    __tablename__ = "circuit_breakers"
+
+    source: Mapped[str] = mapped_column(String(128), primary_key=True)
+    state: Mapped[str] = mapped_column(String(16), default="closed")
+    failures: Mapped[int] = mapped_column(Integer, default=0)
+    opened_until: Mapped[datetime | None] = mapped_column(DateTime, default=None)
+    last_error: Mapped[str | None] = mapped_column(String(512), default=None)
+    last_failure_at: Mapped[datetime | None] = mapped_column(DateTime, default=None)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
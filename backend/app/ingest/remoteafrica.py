@@ -1,26 +1,16 @@
-import httpx
 import logging
 from typing import List, Dict
 from datetime import datetime, timezone
 from urllib.parse import urljoin
 from bs4 import BeautifulSoup
 from app.core.skills import extract_skills
+from .clients import get_client
 
 logger = logging.getLogger(__name__)
 
 BASE_URL = "https://remoteafrica.io"
 JOBS_URL = f"{BASE_URL}/jobs"
 
-HEADERS = {
-    "User-Agent": (
-        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-        "AppleWebKit/537.36 (KHTML, like Gecko) "
-        "Chrome/122.0.0.0 Safari/537.36"
-    ),
-    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
-    "Accept-Language": "en-US,en;q=0.9",
-}
-
 MAX_JOBS = 100
 
 
@@ -36,20 +26,12 @@ async def fetch_remoteafrica_jobs() -> List[Dict]:
     """
     logger.info("[RemoteAfrica] Starting scrape...")
 
-    async with httpx.AsyncClient(
-        timeout=30,
-        headers=HEADERS,
-        follow_redirects=True,
-    ) as client:
-        try:
-            r = await client.get(JOBS_URL)
-            r.raise_for_status()
-        except httpx.HTTPStatusError as e:
-            logger.error(f"[RemoteAfrica] HTTP {e.response.status_code} — {JOBS_URL}")
-            return []
-        except Exception as e:
-            logger.error(f"[RemoteAfrica] Request failed: {e}")
-            return []
+    # Browser headers + redirects are set on the shared "remoteafrica" client.
+    # Errors (e.g. a 403 block) raise so the circuit breaker backs off.
+    r = await get_client("remoteafrica").get(JOBS_URL)
+    if r.is_error:
+        logger.error(f"[RemoteAfrica] HTTP {r.status_code} — {JOBS_URL}")
+    r.raise_for_status()
 
     logger.info(f"[RemoteAfrica] Page fetched ({len(r.text)} chars)")
 
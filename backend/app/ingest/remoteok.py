@@ -1,8 +1,11 @@
-import httpx
 import re
-from typing import List, Dict
+from typing import Dict, AsyncIterator
 from datetime import datetime, timedelta, timezone
 from app.core.skills import extract_skills
+from .clients import get_client
+from .conditional import conditional_stream
+from .stream import iter_json_array
+from . import cursors
 
 API = "https://remoteok.com/api"
 
@@ -13,33 +16,37 @@ def clean_job_title(title: str) -> str:
     title = re.sub(r'\s*\(Ref\.?\s*Nr\.?:?\s*\d+\)\s*', '', title, flags=re.IGNORECASE)
     return ' '.join(title.split()).strip()
 
-async def fetch_remoteok_jobs(hours: int = 72) -> List[Dict]:
+async def fetch_remoteok_jobs(hours: int = 72) -> AsyncIterator[Dict]:
     """
     Fetch from Remote OK
-    Filter: Recent jobs only
+    Filter: Recent jobs only — and, between full resyncs, only postings
+    newer than the stored cursor (app/ingest/cursors.py)
+
+    Yields jobs while the dump is decoded (app/ingest/stream.py) — the
+    full response is never parsed into memory at once.
     """
-    
-    # FIX: Add User-Agent header to avoid 403
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-    }
-    
-    async with httpx.AsyncClient(timeout=30, headers=headers) as client:
-        r = await client.get(API)
-        r.raise_for_status()
-        data = r.json()
+    since = cursors.watermark()
 
-    # FIX: RemoteOK returns array with metadata as first element
-    jobs = data[1:] if isinstance(data, list) and len(data) > 1 else []
-    
     cutoff = datetime.now(timezone.utc) - timedelta(hours=hours)
-    
-    out: List[Dict] = []
-    for j in jobs:
+    if since and since > cutoff:
+        cutoff = since
+
+    # Browser User-Agent (avoids 403) is set on the shared "remoteok" client
+    body = conditional_stream(get_client("remoteok"), API)
+
+    newest = None
+    first = True
+    async for j in iter_json_array(body):
+        # FIX: RemoteOK returns array with metadata as first element
+        if first:
+            first = False
+            continue
+
         epoch = j.get("epoch")
         if epoch:
             try:
                 posted_date = datetime.fromtimestamp(epoch, tz=timezone.utc)
+                newest = posted_date if newest is None or posted_date > newest else newest
                 if posted_date < cutoff:
                     continue
             except:
@@ -53,7 +60,7 @@ async def fetch_remoteok_jobs(hours: int = 72) -> List[Dict]:
         if not clean_title:
             continue
         
-        out.append({
+        yield {
             "title": clean_title,
             "company": j.get("company", ""),
             "location": j.get("location", "Worldwide"),
@@ -66,6 +73,6 @@ async def fetch_remoteok_jobs(hours: int = 72) -> List[Dict]:
             "salary_min": j.get("salary_min"),
             "salary_max": j.get("salary_max"),
             "currency": None,
-        })
+        }
     
-    return out
\ No newline at end of file
+    cursors.advance(newest, full=since is None)
@@ -1,9 +1,11 @@
-import httpx
 import re
 import logging
 from typing import List, Dict
 from datetime import datetime, timedelta, timezone
 from app.core.skills import extract_skills
+from .clients import get_client
+from .conditional import conditional_get
+from . import cursors
 
 logger = logging.getLogger(__name__)
 
@@ -33,19 +35,28 @@ async def fetch_remotive_jobs(hours: int = DEFAULT_LOOKBACK_HOURS) -> List[Dict]
     Focus: global remote jobs with strong EMEA presence.
 
     Rate limit: max 4 calls/day — call once per DAG run only.
+
+    Incremental: postings older than the stored cursor are skipped before
+    normalization (see app/ingest/cursors.py).
     """
-    logger.info(f"[Remotive] Fetching jobs (lookback={hours}h)...")
+    since = cursors.watermark()
+    logger.info(
+        f"[Remotive] Fetching jobs (lookback={hours}h"
+        + (f", since {since.isoformat()})..." if since else ", full)...")
+    )
 
-    async with httpx.AsyncClient(timeout=30) as client:
-        r = await client.get(API)
-        r.raise_for_status()
-        data = r.json()
+    r = await conditional_get(get_client("remotive"), API)
+    r.raise_for_status()
+    data = r.json()
 
     raw_jobs = data.get("jobs", [])
     logger.info(f"[Remotive] API returned {len(raw_jobs)} raw jobs")
 
     cutoff = datetime.now(timezone.utc) - timedelta(hours=hours)
+    if since and since > cutoff:
+        cutoff = since
     out: List[Dict] = []
+    newest = None
     skipped_old = 0
     skipped_no_title = 0
 
@@ -61,6 +72,8 @@ async def fetch_remotive_jobs(hours: int = DEFAULT_LOOKBACK_HOURS) -> List[Dict]
         except Exception:
             # Unparseable date → include rather than silently drop
             pub_date = datetime.now(timezone.utc)
+        else:
+            newest = pub_date if newest is None or pub_date > newest else newest
 
         if pub_date < cutoff:
             skipped_old += 1
@@ -96,9 +109,11 @@ async def fetch_remotive_jobs(hours: int = DEFAULT_LOOKBACK_HOURS) -> List[Dict]
             "source": "remotive",
         })
 
+    cursors.advance(newest, full=since is None)
+
     logger.info(
         f"[Remotive] Result: {len(out)} jobs kept | "
-        f"{skipped_old} too old | {skipped_no_title} no title"
+        f"{skipped_old} too old or already seen | {skipped_no_title} no title"
     )
     return out
 
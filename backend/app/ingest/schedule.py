@@ -0,0 +1,136 @@
+"""
+Adaptive per-source polling.
+
+WHY: every board used to be fetched on the same fixed interval (12h in the
+API scheduler, 6h in the DAG). High-churn feeds (RemoteOK, Himalayas) went
+stale between runs while dead Ashby boards were re-fetched for nothing.
+Now each ingest unit has its own interval:
+- change_rate: EWMA of new + changed jobs per fetch (304 / same payload
+  counts as 0)
+- after every fetch the interval is scaled by
+  INGEST_TARGET_CHANGES / change_rate, at most 2x up or down per run,
+  and clamped to [INGEST_MIN_INTERVAL_MINUTES, INGEST_MAX_INTERVAL_HOURS]
+- boards with an API quota keep a per-source floor (SOURCE_MIN_INTERVAL_MINUTES,
+  e.g. Remotive allows 4 calls/day → 360 min), overridable per label as
+  <LABEL>_MIN_INTERVAL_MINUTES
+- failed fetches keep their interval (the circuit breaker handles those)
+
+Schedulers tick every INGEST_TICK_MINUTES and run only the units that are
+due (orchestrator.run_due_ingest / app.ingest_loop). New units are due
+immediately. The plan is visible at GET /admin/ingest-plan.
+"""
+
+import os
+from datetime import datetime, timedelta
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from .models import SourceSchedule
+
+DEFAULT_INTERVAL_MINUTES = float(os.getenv("INGEST_INTERVAL_HOURS", "12")) * 60
+MIN_INTERVAL_MINUTES = float(os.getenv("INGEST_MIN_INTERVAL_MINUTES", "60"))
+MAX_INTERVAL_MINUTES = float(os.getenv("INGEST_MAX_INTERVAL_HOURS", "48")) * 60
+TARGET_CHANGES = float(os.getenv("INGEST_TARGET_CHANGES", "5"))
+TICK_MINUTES = float(os.getenv("INGEST_TICK_MINUTES", "15"))
+
+# Per-label polling floors for boards with a call quota (label → minutes)
+SOURCE_MIN_INTERVAL_MINUTES = {
+    "Remotive": 360,  # "max 4 calls/day" (app/ingest/remotive.py)
+}
+
+# EWMA weight of the latest fetch, max interval change per run
+_ALPHA = 0.3
+_MAX_STEP = 2.0
+
+
+def _load(db: Session) -> dict[str, SourceSchedule]:
+    return {row.source: row for row in db.execute(select(SourceSchedule)).scalars()}
+
+
+def due_plan(db: Session, plan: list[dict], now: datetime | None = None) -> list[dict]:
+    """Units of `plan` whose next run is due (never-run units are always due)."""
+    now = now or datetime.utcnow()
+    rows = _load(db)
+    return [u for u in plan if u["key"] not in rows or rows[u["key"]].next_run_at <= now]
+
+
+def next_run_plan(db: Session, plan: list[dict]) -> list[dict]:
+    """Per-unit schedule for /admin/ingest-plan, soonest first."""
+    now = datetime.utcnow()
+    rows = _load(db)
+    out = []
+    for u in plan:
+        row = rows.get(u["key"])
+        out.append({
+            "source": u["key"],
+            "label": u["label"],
+            "interval_minutes": round(row.interval_minutes, 1) if row else DEFAULT_INTERVAL_MINUTES,
+            "change_rate": round(row.change_rate, 2) if row else None,
+            "runs": row.runs if row else 0,
+            "last_status": row.last_status if row else None,
+            "last_run_at": row.last_run_at.isoformat() if row and row.last_run_at else None,
+            "next_run_at": row.next_run_at.isoformat() if row else now.isoformat(),
+            "due": row is None or row.next_run_at <= now,
+        })
+    return sorted(out, key=lambda r: r["next_run_at"])
+
+
+def min_interval(label: str) -> float:
+    """Polling floor for an ingest label, in minutes."""
+    prefix = label.upper().replace(" ", "_")
+    default = max(MIN_INTERVAL_MINUTES, SOURCE_MIN_INTERVAL_MINUTES.get(label, 0))
+    return float(os.getenv(f"{prefix}_MIN_INTERVAL_MINUTES", default))
+
+
+def _next_interval(interval: float, change_rate: float, floor: float = MIN_INTERVAL_MINUTES) -> float:
+    factor = TARGET_CHANGES / max(change_rate, 1e-9)
+    factor = min(_MAX_STEP, max(1 / _MAX_STEP, factor))
+    # the floor wins over MAX_INTERVAL_MINUTES — it's a quota, not a preference
+    return max(floor, min(MAX_INTERVAL_MINUTES, interval * factor))
+
+
+def record_results(db: Session, rows: list[dict]):
+    """
+    Update change stats and next run time from run-summary rows.
+
+    Does NOT commit.
+    """
+    if not rows:
+        return
+    now = datetime.utcnow()
+    saved = _load(db)
+    values = []
+    for r in rows:
+        prev = saved.get(r["source"])
+        floor = min_interval(r["label"])
+        # floor also applies to failed runs and rows saved before it existed
+        interval = max(floor, prev.interval_minutes if prev else DEFAULT_INTERVAL_MINUTES)
+        rate = prev.change_rate if prev else None
+
+        if r["status"] in ("ok", "not_modified"):
+            changes = r["inserted"] + r["updated"]
+            rate = changes if rate is None else _ALPHA * changes + (1 - _ALPHA) * rate
+            interval = _next_interval(interval, rate, floor)
+
+        values.append({
+            "source": r["source"],
+            "label": r["label"],
+            "interval_minutes": interval,
+            "change_rate": rate or 0.0,
+            "runs": (prev.runs if prev else 0) + 1,
+            "last_status": r["status"],
+            "last_run_at": now,
+            "next_run_at": now + timedelta(minutes=interval),
+        })
+
+    stmt = pg_insert(SourceSchedule).values(values)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[SourceSchedule.source],
+        set_={
+            c: stmt.excluded[c]
+            for c in ("label", "interval_minutes", "change_rate", "runs",
+                      "last_status", "last_run_at", "next_run_at")
+        },
+    )
+    db.execute(stmt)
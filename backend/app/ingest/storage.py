@@ -10,14 +10,113 @@ WHY THIS EXISTS:
 
 TRADE-OFF:
 - Uses more disk space (raw + processed)
-- But: Can rebuild database from Bronze
+- But: Can rebuild database from Bronze (python -m app.replay)
 - But: Shows "data lake" thinking to recruiters
+
+FORMAT (append-only segments + manifest):
+- One segment per board per run: compressed JSONL, first line is the
+  header (source, ingested_at, metadata), then one record per line.
+  open_segment() writes it incrementally — the orchestrator appends each
+  ingest batch as it arrives, so a streamed feed is never held whole
+  (save_raw_response is the one-shot form).
+  zstd when `zstandard` is installed, gzip otherwise (BRONZE_CODEC).
+  ~10x smaller than the old indent=2 JSON files.
+- data/bronze/_manifest.sqlite indexes every segment: source, run id,
+  ingested_at, posted_at range, record count, byte size, content hash.
+  Latest-file lookups, reports and range reads are index hits instead of
+  rglob + stat over the whole history.
+- Legacy *.json files are indexed on first use and stay readable.
+
+RECORD DEDUP (BRONZE_DEDUP, default on):
+- Stable boards re-send ~95% byte-identical records every run. Each record
+  line is hashed; a record this source already stored is written as a
+  reference line "@<hash>" instead of the full JSON.
+- The manifest's records table maps (source, hash) → the segment + line
+  holding the literal copy. Readers resolve references transparently, so
+  get_latest_raw / iter_packages still return the exact response.
+- iter_packages(changed_only=True) skips references → Silver only sees
+  new or changed records.
+- delete_before() (retention) compacts first: literals still referenced by
+  surviving segments are inlined into the oldest surviving referrer before
+  old segments are deleted.
 """
 
+import os
+import gzip
 import json
+import zlib
+import uuid
+import atexit
+import random
+import sqlite3
+import hashlib
+import threading
 from pathlib import Path
-from datetime import datetime
-from typing import Dict, Any, List
+from datetime import datetime, timedelta
+from typing import Dict, Any, List, Iterator, Iterable
+
+try:
+    import zstandard
+except ImportError:  # optional — gzip fallback
+    zstandard = None
+
+BRONZE_CODEC = os.getenv("BRONZE_CODEC", "zstd" if zstandard else "gzip")
+BRONZE_ZSTD_LEVEL = int(os.getenv("BRONZE_ZSTD_LEVEL", "3"))
+BRONZE_DEDUP = os.getenv("BRONZE_DEDUP", "true").lower() == "true"
+DLQ_FLUSH_EVERY = int(os.getenv("DLQ_FLUSH_EVERY", "500"))
+
+_SUFFIXES = {"zstd": ".jsonl.zst", "gzip": ".jsonl.gz", "json": ".json"}
+
+_SEGMENT_COLUMNS = (
+    "id", "source", "run_id", "path", "codec", "ingested_at",
+    "posted_min", "posted_max", "record_count", "ref_count", "byte_size", "content_hash",
+)
+
+# Reference lines start with a byte no JSON document can start with
+_REF = b"@"
+
+# SQLite bound-parameter budget per IN (...) query
+_IN_CHUNK = 500
+
+
+def _compress(raw: bytes, codec: str) -> bytes:
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError("BRONZE_CODEC=zstd but the zstandard package is not installed")
+        return zstandard.ZstdCompressor(level=BRONZE_ZSTD_LEVEL).compress(raw)
+    if codec == "gzip":
+        return gzip.compress(raw, compresslevel=6)
+    raise ValueError(f"Unknown Bronze codec: {codec}")
+
+
+def _compressor(codec: str):
+    """Incremental compressor (compress()/flush()) producing the same format as _compress."""
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError("BRONZE_CODEC=zstd but the zstandard package is not installed")
+        return zstandard.ZstdCompressor(level=BRONZE_ZSTD_LEVEL).compressobj()
+    if codec == "gzip":
+        return zlib.compressobj(6, zlib.DEFLATED, 31)  # wbits 31 → gzip container
+    raise ValueError(f"Unknown Bronze codec: {codec}")
+
+
+def _decompress(blob: bytes, codec: str) -> bytes:
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError("zstd Bronze segment but the zstandard package is not installed")
+        return zstandard.ZstdDecompressor().decompressobj().decompress(blob)
+    if codec == "gzip":
+        return gzip.decompress(blob)
+    return blob
+
+
+def _record_hash(line: bytes) -> str:
+    return hashlib.blake2b(line, digest_size=16).hexdigest()
+
+
+def _chunks(items: list, size: int = _IN_CHUNK) -> Iterator[list]:
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
 
 
 class BronzeStorage:
@@ -25,74 +124,558 @@ class BronzeStorage:
     Bronze Layer = Raw data exactly as received from APIs
     
     Never overwrite Bronze files - append-only, immutable
+    (compaction only ever inlines referenced records, content is unchanged)
     """
     
-    def __init__(self, base_path: str = "data/bronze"):
+    def __init__(self, base_path: str = "data/bronze", codec: str = BRONZE_CODEC, dedup: bool = BRONZE_DEDUP):
         self.base_path = Path(base_path)
         self.base_path.mkdir(parents=True, exist_ok=True)
-    
+        self.codec = codec
+        self.dedup = dedup
+        # Re-entrant: reference resolution runs inside reindex/compaction
+        self._lock = threading.RLock()
+        self._conn: sqlite3.Connection | None = None
+
+    # ── Manifest ─────────────────────────────────────────────────────
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            manifest = self.base_path / "_manifest.sqlite"
+            is_new = not manifest.exists()
+            # timeout: sharded workers and Airflow share the file
+            conn = sqlite3.connect(manifest, check_same_thread=False, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS segments (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    source TEXT NOT NULL,
+                    run_id TEXT,
+                    path TEXT NOT NULL UNIQUE,
+                    codec TEXT NOT NULL,
+                    ingested_at TEXT NOT NULL,
+                    posted_min TEXT,
+                    posted_max TEXT,
+                    record_count INTEGER NOT NULL,
+                    byte_size INTEGER NOT NULL,
+                    content_hash TEXT NOT NULL
+                )
+            """)
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(segments)")}
+            if "ref_count" not in columns:
+                conn.execute("ALTER TABLE segments ADD COLUMN ref_count INTEGER NOT NULL DEFAULT 0")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_segments_source_time ON segments (source, ingested_at)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_segments_time ON segments (ingested_at)")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS records (
+                    source TEXT NOT NULL,
+                    hash TEXT NOT NULL,
+                    segment_id INTEGER NOT NULL,
+                    line INTEGER NOT NULL,
+                    PRIMARY KEY (source, hash)
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_records_segment ON records (segment_id)")
+            self._conn = conn
+            if is_new:
+                self._reindex()
+        return self._conn
+
+    def _insert_segment(self, row: Dict) -> int:
+        cur = self._db().execute(
+            f"INSERT OR IGNORE INTO segments ({', '.join(_SEGMENT_COLUMNS[1:])}) "
+            f"VALUES ({', '.join('?' * (len(_SEGMENT_COLUMNS) - 1))})",
+            tuple(row[c] for c in _SEGMENT_COLUMNS[1:]),
+        )
+        return cur.lastrowid
+
+    def _index_literals(self, source: str, segment_id: int, lines: List[bytes]):
+        """Register literal record lines of a segment as the copy to reference."""
+        self._index_records(source, segment_id, (
+            (_record_hash(line), i)
+            for i, line in enumerate(lines)
+            if line and not line.startswith(_REF)
+        ))
+
+    def _index_records(self, source: str, segment_id: int, literals: Iterable[tuple[str, int]]):
+        self._db().executemany(
+            "INSERT OR IGNORE INTO records (source, hash, segment_id, line) VALUES (?, ?, ?, ?)",
+            [(source, h, segment_id, line) for h, line in literals],
+        )
+
+    def _known_hashes(self, source: str, hashes: Iterable[str]) -> set[str]:
+        known = set()
+        db = self._db()
+        for chunk in _chunks(list(hashes)):
+            rows = db.execute(
+                f"SELECT hash FROM records WHERE source = ? AND hash IN ({', '.join('?' * len(chunk))})",
+                (source, *chunk),
+            )
+            known.update(row[0] for row in rows)
+        return known
+
+    @staticmethod
+    def _posted_range(data: List[Dict]) -> tuple[str | None, str | None]:
+        posted = [str(r["posted_at"]) for r in data if isinstance(r, dict) and r.get("posted_at")]
+        return (min(posted), max(posted)) if posted else (None, None)
+
+    # ── Write ────────────────────────────────────────────────────────
+
+    def _write_blob(self, filepath: Path, raw: bytes) -> int:
+        blob = _compress(raw, self.codec)
+        # Write-then-rename: a crash never leaves a half segment behind
+        tmp = filepath.with_name(filepath.name + ".tmp")
+        tmp.write_bytes(blob)
+        os.replace(tmp, filepath)
+        return len(blob)
+
+    def open_segment(
+        self,
+        source_name: str,      # e.g. "greenhouse_stripe"
+        metadata: Dict = None,  # Optional: org, source_type, ...
+        run_id: str | None = None,
+    ) -> "BronzeSegment":
+        """
+        Start a segment that records are appended to batch by batch
+        (BronzeSegment.write), sealed with close().
+
+        File Structure: data/bronze/{source}/{YYYY-MM-DD}/{HH-MM-SS}-{id}.jsonl.zst
+
+        WHY date partitions: Easy to delete old data, query by date
+        WHY timestamp + id: Multiple runs per second don't conflict
+        """
+        return BronzeSegment(self, source_name, metadata, run_id)
+
     def save_raw_response(
         self, 
         source_name: str,      # e.g. "greenhouse_stripe"
         data: List[Dict],      # Raw API response (list of jobs)
-        metadata: Dict = None  # Optional: total_found, fetch_duration, etc.
+        metadata: Dict = None,  # Optional: total_found, fetch_duration, etc.
+        run_id: str | None = None,
     ) -> str:
         """
-        Save raw API response to Bronze layer
-        
-        File Structure: data/bronze/{source}/{YYYY-MM-DD}/{HH-MM-SS}.json
-        
-        WHY date partitions: Easy to delete old data, query by date
-        WHY timestamp: Multiple runs per day don't conflict
-        
+        Save a whole raw API response to Bronze layer as one segment.
+
         Returns: filepath where data was saved
         """
-        today = datetime.now().strftime("%Y-%m-%d")
-        timestamp = datetime.now().strftime("%H-%M-%S")
-        
-        # Create directory: bronze/{source}/{date}/
-        source_path = self.base_path / source_name / today
-        source_path.mkdir(parents=True, exist_ok=True)
-        
-        # Filename with timestamp
-        filename = f"{timestamp}.json"
-        filepath = source_path / filename
-        
-        # Package with metadata
-        package = {
-            "source": source_name,
-            "ingested_at": datetime.now().isoformat(),
-            "record_count": len(data),
-            "metadata": metadata or {},
-            "data": data  # The actual raw jobs
-        }
-        
-        # Write to disk
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(package, f, indent=2, default=str, ensure_ascii=False)
-        
-        print(f"📦 [Bronze] Saved {len(data)} records → {filepath.relative_to(self.base_path.parent)}")
-        return str(filepath)
-    
+        segment = self.open_segment(source_name, metadata=metadata, run_id=run_id)
+        try:
+            segment.write(data)
+        except BaseException:
+            segment.abort()
+            raise
+        return segment.close()
+
+    # ── Read ─────────────────────────────────────────────────────────
+
+    def list_segments(
+        self,
+        source: str | None = None,
+        since: datetime | None = None,
+        until: datetime | None = None,
+    ) -> List[Dict]:
+        """
+        Manifest rows, oldest first. since/until filter on ingested_at
+        (local time, same clock as the segment names).
+        """
+        where, params = [], []
+        if source:
+            where.append("source = ?")
+            params.append(source)
+        if since:
+            where.append("ingested_at >= ?")
+            params.append(since.isoformat())
+        if until:
+            where.append("ingested_at < ?")
+            params.append(until.isoformat())
+        sql = f"SELECT {', '.join(_SEGMENT_COLUMNS)} FROM segments"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY ingested_at, id"
+        with self._lock:
+            rows = self._db().execute(sql, params).fetchall()
+        return [dict(zip(_SEGMENT_COLUMNS, row)) for row in rows]
+
+    def _read_lines(self, segment: Dict) -> tuple[bytes, List[bytes]]:
+        """(header line, stored record lines) of a JSONL segment."""
+        raw = _decompress((self.base_path / segment["path"]).read_bytes(), segment["codec"])
+        header_line, _, body = raw.partition(b"\n")
+        return header_line, body.split(b"\n")[:-1] if body else []
+
+    def _resolve(self, source: str, hashes: Iterable[str]) -> Dict[str, bytes]:
+        """Literal record lines for reference hashes (one read per segment)."""
+        locations: Dict[int, List[tuple[str, int]]] = {}
+        with self._lock:
+            db = self._db()
+            for chunk in _chunks(list(hashes)):
+                rows = db.execute(
+                    f"SELECT hash, segment_id, line FROM records "
+                    f"WHERE source = ? AND hash IN ({', '.join('?' * len(chunk))})",
+                    (source, *chunk),
+                )
+                for h, segment_id, line in rows:
+                    locations.setdefault(segment_id, []).append((h, line))
+            segments = {}
+            for chunk in _chunks(list(locations)):
+                rows = db.execute(
+                    f"SELECT {', '.join(_SEGMENT_COLUMNS)} FROM segments "
+                    f"WHERE id IN ({', '.join('?' * len(chunk))})",
+                    chunk,
+                )
+                segments.update({row[0]: dict(zip(_SEGMENT_COLUMNS, row)) for row in rows})
+
+        resolved = {}
+        for segment_id, wanted in locations.items():
+            _, lines = self._read_lines(segments[segment_id])
+            for h, line in wanted:
+                resolved[h] = lines[line]
+        return resolved
+
+    def read_segment(self, segment: Dict, changed_only: bool = False) -> Dict[str, Any]:
+        """
+        Package for a manifest row: {source, ingested_at, record_count, metadata, data}.
+
+        References are resolved, so data is exactly what was saved.
+        changed_only=True drops records stored as references (unchanged
+        since an earlier run of the same source).
+        """
+        if segment["codec"] == "json":
+            return json.loads((self.base_path / segment["path"]).read_bytes())
+
+        header_line, lines = self._read_lines(segment)
+        package = json.loads(header_line)
+        # Streamed segments write the header before the count is known
+        package.setdefault("record_count", len(lines))
+        refs = {line[1:].decode("ascii") for line in lines if line.startswith(_REF)}
+        if changed_only:
+            lines = [line for line in lines if not line.startswith(_REF)]
+        elif refs:
+            resolved = self._resolve(package["source"], refs)
+            missing = refs - resolved.keys()
+            if missing:
+                raise ValueError(f"{segment['path']}: {len(missing)} unresolvable record references")
+            lines = [resolved[line[1:].decode("ascii")] if line.startswith(_REF) else line for line in lines]
+        package["data"] = [json.loads(line) for line in lines]
+        return package
+
+    def iter_packages(
+        self,
+        source: str | None = None,
+        since: datetime | None = None,
+        until: datetime | None = None,
+        changed_only: bool = False,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Range replay: reconstructed packages for a source/time range, oldest
+        first, one segment at a time (bounded memory).
+        """
+        for segment in self.list_segments(source, since, until):
+            yield self.read_segment(segment, changed_only=changed_only)
+
     def get_latest_raw(self, source_name: str) -> Dict[str, Any] | None:
         """
         Get most recent Bronze file for a source
         
         USE CASE: Replay pipeline, debugging
         """
-        source_path = self.base_path / source_name
-        if not source_path.exists():
-            return None
-        
-        all_files = list(source_path.rglob("*.json"))
-        if not all_files:
+        with self._lock:
+            row = self._db().execute(
+                f"SELECT {', '.join(_SEGMENT_COLUMNS)} FROM segments "
+                "WHERE source = ? ORDER BY ingested_at DESC, id DESC LIMIT 1",
+                (source_name,),
+            ).fetchone()
+        if row is None:
             return None
-        
-        # Most recent file
-        latest = max(all_files, key=lambda p: p.stat().st_mtime)
-        
-        with open(latest, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        return self.read_segment(dict(zip(_SEGMENT_COLUMNS, row)))
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Per-source segment / record / reference / byte totals from the manifest."""
+        with self._lock:
+            rows = self._db().execute(
+                "SELECT source, COUNT(*), SUM(record_count), SUM(ref_count), SUM(byte_size) "
+                "FROM segments GROUP BY source"
+            ).fetchall()
+        return {
+            source: {"segments": n, "records": records or 0, "refs": refs or 0, "bytes": size or 0}
+            for source, n, records, refs, size in rows
+        }
+
+    # ── Maintenance ──────────────────────────────────────────────────
+
+    def _relocate_literals(self, doomed: List[Dict], cutoff: datetime) -> int:
+        """
+        Compaction: for records whose literal copy lives in a doomed segment
+        but are still referenced by a surviving one, inline the record into
+        the oldest surviving referrer and point the records index there.
+
+        Returns the number of segments rewritten.
+        """
+        rewritten = 0
+        db = self._db()
+        by_source: Dict[str, List[int]] = {}
+        for segment in doomed:
+            by_source.setdefault(segment["source"], []).append(segment["id"])
+
+        for source, ids in by_source.items():
+            orphaned = set()
+            for chunk in _chunks(ids):
+                rows = db.execute(
+                    f"SELECT hash FROM records WHERE source = ? AND segment_id IN ({', '.join('?' * len(chunk))})",
+                    (source, *chunk),
+                )
+                orphaned.update(row[0] for row in rows)
+
+            for segment in self.list_segments(source=source, since=cutoff):
+                if not orphaned:
+                    break
+                if not segment["ref_count"]:
+                    continue
+                header_line, lines = self._read_lines(segment)
+                first_ref: Dict[str, int] = {}
+                for i, line in enumerate(lines):
+                    if line.startswith(_REF):
+                        h = line[1:].decode("ascii")
+                        if h in orphaned and h not in first_ref:
+                            first_ref[h] = i
+                if not first_ref:
+                    continue
+
+                resolved = self._resolve(source, first_ref)
+                for h, i in first_ref.items():
+                    lines[i] = resolved[h]
+                raw = header_line + b"\n" + b"".join(line + b"\n" for line in lines)
+                byte_size = self._write_blob(self.base_path / segment["path"], raw)
+                db.execute(
+                    "UPDATE segments SET byte_size = ?, ref_count = ref_count - ? WHERE id = ?",
+                    (byte_size, len(first_ref), segment["id"]),
+                )
+                db.executemany(
+                    "UPDATE records SET segment_id = ?, line = ? WHERE source = ? AND hash = ?",
+                    [(segment["id"], i, source, h) for h, i in first_ref.items()],
+                )
+                orphaned -= first_ref.keys()
+                rewritten += 1
+        return rewritten
+
+    def delete_before(self, cutoff: datetime) -> int:
+        """
+        Retention: delete segments ingested before cutoff (files + manifest
+        rows), compacting first so newer segments stay fully replayable.
+        """
+        with self._lock:
+            segments = self.list_segments(until=cutoff)
+            if not segments:
+                return 0
+            rewritten = self._relocate_literals(segments, cutoff)
+            db = self._db()
+            for chunk in _chunks([s["id"] for s in segments]):
+                marks = ", ".join("?" * len(chunk))
+                db.execute(f"DELETE FROM records WHERE segment_id IN ({marks})", chunk)
+                db.execute(f"DELETE FROM segments WHERE id IN ({marks})", chunk)
+        for segment in segments:
+            (self.base_path / segment["path"]).unlink(missing_ok=True)
+        # Drop emptied date partitions
+        for date_dir in {(self.base_path / s["path"]).parent for s in segments}:
+            if date_dir.exists() and not any(date_dir.iterdir()):
+                date_dir.rmdir()
+        if rewritten:
+            print(f"🗜️  [Bronze] Compacted {rewritten} segments before deleting {len(segments)}")
+        return len(segments)
+
+    def reindex(self) -> int:
+        """Add segment files missing from the manifest (legacy JSON, lost index)."""
+        with self._lock:
+            self._db()
+            return self._reindex()
+
+    def _reindex(self) -> int:
+        db = self._conn
+        known = {row[0] for row in db.execute("SELECT path FROM segments")}
+        added = 0
+        # Oldest first within a source, so literals are indexed before the
+        # segments that reference them
+        for codec, suffix in _SUFFIXES.items():
+            for path in sorted(self.base_path.glob(f"*/*/*{suffix}")):
+                rel = path.relative_to(self.base_path).as_posix()
+                if rel in known:
+                    continue
+                segment = {"path": rel, "codec": codec}
+                try:
+                    if codec == "json":
+                        package = self.read_segment(segment)
+                        stored = [json.dumps(r, default=str, ensure_ascii=False).encode("utf-8")
+                                  for r in package.get("data", [])]
+                    else:
+                        header_line, stored = self._read_lines(segment)
+                        package = json.loads(header_line)
+                except Exception as e:
+                    print(f"⚠️  [Bronze] Skipping unreadable {rel}: {e}")
+                    continue
+
+                source = package.get("source") or path.parent.parent.name
+                refs = [line[1:].decode("ascii") for line in stored if line.startswith(_REF)]
+                segment_id = self._insert_segment({
+                    "source": source,
+                    "run_id": package.get("run_id"),
+                    "path": rel,
+                    "codec": codec,
+                    "ingested_at": package.get("ingested_at")
+                        or datetime.fromtimestamp(path.stat().st_mtime).isoformat(),
+                    "posted_min": None,
+                    "posted_max": None,
+                    "record_count": len(stored),
+                    "ref_count": len(refs),
+                    "byte_size": path.stat().st_size,
+                    "content_hash": "",
+                })
+                if codec != "json":
+                    self._index_literals(source, segment_id, stored)
+
+                resolved = self._resolve(source, set(refs)) if refs else {}
+                lines = [resolved.get(line[1:].decode("ascii"), line) if line.startswith(_REF) else line
+                         for line in stored]
+                posted_min, posted_max = self._posted_range(
+                    [json.loads(line) for line in lines if not line.startswith(_REF)]
+                )
+                db.execute(
+                    "UPDATE segments SET content_hash = ?, posted_min = ?, posted_max = ? WHERE id = ?",
+                    (hashlib.sha256(b"".join(line + b"\n" for line in lines)).hexdigest(),
+                     posted_min, posted_max, segment_id),
+                )
+                added += 1
+        if added:
+            print(f"📇 [Bronze] Indexed {added} existing segments")
+        return added
+
+
+class BronzeSegment:
+    """
+    One Bronze segment being written (BronzeStorage.open_segment).
+
+    write() dedups, compresses and appends a batch of records straight to
+    a temp file; close() renames it into place and registers it in the
+    manifest. Memory is one batch plus a hash per record, whatever the
+    feed size. Not thread-safe: one writer per board, batches in order.
+    """
+
+    def __init__(self, storage: BronzeStorage, source_name: str, metadata: Dict | None, run_id: str | None):
+        self.storage = storage
+        self.source = source_name
+        self.run_id = run_id
+        self.started = datetime.now()
+        self.path = (
+            storage.base_path / source_name / self.started.strftime("%Y-%m-%d")
+            / f"{self.started.strftime('%H-%M-%S')}-{uuid.uuid4().hex[:8]}{_SUFFIXES[storage.codec]}"
+        )
+        self.header = {
+            "source": source_name,
+            "ingested_at": self.started.isoformat(),
+            "run_id": run_id,
+            "metadata": metadata or {},
+        }
+        self.record_count = 0
+        self.refs = 0
+        self.closed = False
+        self._file = None
+        self._compressor = None
+        self._content_hash = hashlib.sha256()
+        self._dedup = storage.dedup
+        self._stored_hashes: set[str] = set()   # later copies become references
+        self._literals: List[tuple[str, int]] = []
+        self._posted_min: str | None = None
+        self._posted_max: str | None = None
+
+    @property
+    def _tmp(self) -> Path:
+        return self.path.with_name(self.path.name + ".tmp")
+
+    def _open(self):
+        # Build a new manifest now — its first-use reindex would otherwise
+        # read this segment back in once it's renamed into place
+        with self.storage._lock:
+            self.storage._db()
+        # Write-then-rename: a crash never leaves a half segment behind
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self._tmp, "wb")
+        self._compressor = _compressor(self.storage.codec)
+        self._append(json.dumps(self.header, default=str, ensure_ascii=False).encode("utf-8") + b"\n")
+
+    def _append(self, raw: bytes):
+        self._file.write(self._compressor.compress(raw))
+
+    def write(self, data: List[Dict]):
+        """Append a batch of records."""
+        if self.closed:
+            raise ValueError(f"Bronze segment {self.path.name} is already closed")
+        if self._file is None:
+            self._open()
+
+        lines = [json.dumps(r, default=str, ensure_ascii=False).encode("utf-8") for r in data]
+        for line in lines:
+            self._content_hash.update(line + b"\n")
+
+        # Records already stored for this source (or earlier in this
+        # segment) become references
+        stored = list(lines)
+        if self._dedup and lines:
+            hashes = [_record_hash(line) for line in lines]
+            with self.storage._lock:
+                self._stored_hashes |= self.storage._known_hashes(self.source, set(hashes) - self._stored_hashes)
+            for i, h in enumerate(hashes):
+                if h in self._stored_hashes:
+                    stored[i] = _REF + h.encode("ascii")
+                    self.refs += 1
+                else:
+                    self._stored_hashes.add(h)
+                    self._literals.append((h, self.record_count + i))
+
+        self._append(b"".join(line + b"\n" for line in stored))
+        self.record_count += len(lines)
+
+        posted_min, posted_max = self.storage._posted_range(data)
+        if posted_min is not None:
+            self._posted_min = min(posted_min, self._posted_min or posted_min)
+            self._posted_max = max(posted_max, self._posted_max or posted_max)
+
+    def close(self) -> str:
+        """Seal the segment and index it. Returns the filepath."""
+        if self._file is None:
+            self._open()  # an empty fetch is still recorded
+        self._file.write(self._compressor.flush())
+        self._file.close()
+        os.replace(self._tmp, self.path)
+        self.closed = True
+        byte_size = self.path.stat().st_size
+
+        storage = self.storage
+        with storage._lock:
+            segment_id = storage._insert_segment({
+                "source": self.source,
+                "run_id": self.run_id,
+                "path": self.path.relative_to(storage.base_path).as_posix(),
+                "codec": storage.codec,
+                "ingested_at": self.header["ingested_at"],
+                "posted_min": self._posted_min,
+                "posted_max": self._posted_max,
+                "record_count": self.record_count,
+                "ref_count": self.refs,
+                "byte_size": byte_size,
+                "content_hash": self._content_hash.hexdigest(),
+            })
+            if self._dedup:
+                storage._index_records(self.source, segment_id, self._literals)
+
+        print(
+            f"📦 [Bronze] Saved {self.record_count} records ({self.refs} unchanged) → "
+            f"{self.path.relative_to(storage.base_path.parent)} ({byte_size / 1024:.1f} KB)"
+        )
+        return str(self.path)
+
+    def abort(self):
+        """Drop an unfinished segment (nothing reaches the manifest)."""
+        if self._file is not None and not self._file.closed:
+            self._file.close()
+        self._tmp.unlink(missing_ok=True)
+        self.closed = True
 
 
 class DeadLetterQueue:
@@ -102,11 +685,61 @@ class DeadLetterQueue:
     WHY: One bad record shouldn't crash entire pipeline
     
     CONCEPT FROM: AWS SQS, Kafka, RabbitMQ (industry standard)
+
+    BUFFERED: filter_worldwide_jobs rejects thousands of postings per run.
+    log_failure only appends to an in-memory buffer; flush() (every
+    DLQ_FLUSH_EVERY records, at the end of each ingest run and at exit)
+    writes one append per partition file and bumps a counters index
+    (data/dlq/_counters.sqlite, keyed by day/error_type/source). Stats come
+    from the index — O(days × types) instead of a line scan of every file.
     """
     
-    def __init__(self, base_path: str = "data/dlq"):
+    def __init__(self, base_path: str = "data/dlq", flush_every: int = DLQ_FLUSH_EVERY):
         self.base_path = Path(base_path)
         self.base_path.mkdir(parents=True, exist_ok=True)
+        self.flush_every = flush_every
+        self._buffer: Dict[tuple[str, str, str], List[str]] = {}
+        self._buffered = 0
+        self._lock = threading.RLock()
+        self._conn: sqlite3.Connection | None = None
+        atexit.register(self.flush)
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            index = self.base_path / "_counters.sqlite"
+            is_new = not index.exists()
+            conn = sqlite3.connect(index, check_same_thread=False, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS counters (
+                    day TEXT NOT NULL,
+                    error_type TEXT NOT NULL,
+                    source TEXT NOT NULL,
+                    count INTEGER NOT NULL,
+                    PRIMARY KEY (day, error_type, source)
+                )
+            """)
+            self._conn = conn
+            if is_new:
+                self._backfill_counters()
+        return self._conn
+
+    def _backfill_counters(self):
+        """Count pre-index JSONL files once, when the index is created."""
+        rows = []
+        for jsonl_file in self.base_path.glob("*/*/*.jsonl"):
+            with open(jsonl_file, "r", encoding="utf-8") as f:
+                count = sum(1 for line in f if line.strip())
+            if count:
+                rows.append((jsonl_file.parent.name, jsonl_file.parent.parent.name, jsonl_file.stem, count))
+        self._bump(rows)
+
+    def _bump(self, rows: List[tuple[str, str, str, int]]):
+        self._conn.executemany(
+            "INSERT INTO counters (day, error_type, source, count) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT(day, error_type, source) DO UPDATE SET count = count + excluded.count",
+            rows,
+        )
     
     def log_failure(
         self,
@@ -116,31 +749,49 @@ class DeadLetterQueue:
         error_type: str = "filter"  # Category: filter, validation, parsing
     ):
         """
-        Log a failed record to DLQ
+        Log a failed record to DLQ (buffered — see flush())
         
         File Format: JSONL (one JSON per line)
         WHY JSONL: Can append without reading entire file
         
         Structure: data/dlq/{error_type}/{YYYY-MM-DD}/{source}.jsonl
         """
-        today = datetime.now().strftime("%Y-%m-%d")
-        dlq_path = self.base_path / error_type / today
-        dlq_path.mkdir(parents=True, exist_ok=True)
-        
-        filename = f"{source}.jsonl"
-        filepath = dlq_path / filename
-        
+        now = datetime.now()
         failure_record = {
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": now.isoformat(),
             "source": source,
             "error": error,
             "error_type": error_type,
             "record": record
         }
-        
-        # Append one line
-        with open(filepath, 'a', encoding='utf-8') as f:
-            f.write(json.dumps(failure_record, default=str, ensure_ascii=False) + '\n')
+        line = json.dumps(failure_record, default=str, ensure_ascii=False)
+
+        with self._lock:
+            self._buffer.setdefault((error_type, now.strftime("%Y-%m-%d"), source), []).append(line)
+            self._buffered += 1
+            if self._buffered >= self.flush_every:
+                self.flush()
+
+    def flush(self) -> int:
+        """Write buffered failures (one append per file) and update counters."""
+        with self._lock:
+            if not self._buffered:
+                return 0
+            buffer, self._buffer = self._buffer, {}
+            flushed, self._buffered = self._buffered, 0
+
+            # Open (and backfill) the index before appending, so this
+            # batch isn't counted twice
+            self._db()
+            counts = []
+            for (error_type, day, source), lines in buffer.items():
+                dlq_path = self.base_path / error_type / day
+                dlq_path.mkdir(parents=True, exist_ok=True)
+                with open(dlq_path / f"{source}.jsonl", "a", encoding="utf-8") as f:
+                    f.write("\n".join(lines) + "\n")
+                counts.append((day, error_type, source, len(lines)))
+            self._bump(counts)
+        return flushed
     
     def get_failure_stats(self, days: int = 7) -> Dict[str, int]:
         """
@@ -148,23 +799,111 @@ class DeadLetterQueue:
         
         Returns: {"filter": 45, "validation": 12, ...}
         """
-        from datetime import timedelta
-        
-        cutoff = datetime.now() - timedelta(days=days)
-        cutoff_str = cutoff.strftime("%Y-%m-%d")
-        
-        stats = {}
-        for error_dir in self.base_path.iterdir():
-            if not error_dir.is_dir():
+        return self.get_counts(days=days, by="error_type")
+
+    def get_counts(
+        self,
+        days: int | None = 7,
+        by: str = "error_type",
+        error_type: str | None = None,
+        source: str | None = None,
+    ) -> Dict[str, int]:
+        """
+        Failure counts from the counters index, grouped by "error_type",
+        "source" or "day". days=None covers all history.
+        """
+        if by not in ("error_type", "source", "day"):
+            raise ValueError(f"Unknown grouping: {by}")
+        self.flush()
+
+        where, params = [], []
+        if days is not None:
+            where.append("day >= ?")
+            params.append((datetime.now() - timedelta(days=days)).strftime("%Y-%m-%d"))
+        if error_type:
+            where.append("error_type = ?")
+            params.append(error_type)
+        if source:
+            where.append("source = ?")
+            params.append(source)
+        sql = f"SELECT {by}, SUM(count) FROM counters"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += f" GROUP BY {by} ORDER BY SUM(count) DESC"
+        with self._lock:
+            return dict(self._db().execute(sql, params).fetchall())
+
+    def _partition_files(self, error_type: str | None, source: str | None, days: int) -> List[Path]:
+        """JSONL files for the window, newest day first (partition pruning by path)."""
+        cutoff = (datetime.now() - timedelta(days=days)).strftime("%Y-%m-%d")
+        type_dirs = [self.base_path / error_type] if error_type else [
+            d for d in self.base_path.iterdir() if d.is_dir()
+        ]
+        files = []
+        for type_dir in type_dirs:
+            if not type_dir.is_dir():
                 continue
-            
-            count = 0
-            for date_dir in error_dir.iterdir():
-                if date_dir.name >= cutoff_str:
-                    for jsonl_file in date_dir.glob("*.jsonl"):
-                        with open(jsonl_file, 'r') as f:
-                            count += sum(1 for _ in f)
-            
-            stats[error_dir.name] = count
-        
-        return stats
\ No newline at end of file
+            for date_dir in type_dir.iterdir():
+                if not date_dir.is_dir() or date_dir.name < cutoff:
+                    continue
+                if source:
+                    path = date_dir / f"{source}.jsonl"
+                    if path.exists():
+                        files.append(path)
+                else:
+                    files.extend(date_dir.glob("*.jsonl"))
+        return sorted(files, key=lambda p: p.parent.name, reverse=True)
+
+    def query(
+        self,
+        error_type: str | None = None,
+        source: str | None = None,
+        days: int = 7,
+        contains: str | None = None,
+        limit: int = 100,
+    ) -> List[Dict]:
+        """
+        Rejected records, newest day first. Only the partitions matching
+        error_type/source/days are read; contains filters on the error text.
+        """
+        self.flush()
+        out = []
+        for path in self._partition_files(error_type, source, days):
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    entry = json.loads(line)
+                    if contains and contains.lower() not in (entry.get("error") or "").lower():
+                        continue
+                    out.append(entry)
+                    if len(out) >= limit:
+                        return out
+        return out
+
+    def sample(
+        self,
+        error_type: str | None = None,
+        source: str | None = None,
+        days: int = 7,
+        k: int = 20,
+        seed: int | None = None,
+    ) -> List[Dict]:
+        """Uniform random sample of k rejected records (reservoir sampling, one pass)."""
+        self.flush()
+        rng = random.Random(seed)
+        reservoir: List[str] = []
+        seen = 0
+        for path in self._partition_files(error_type, source, days):
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    seen += 1
+                    if len(reservoir) < k:
+                        reservoir.append(line)
+                    else:
+                        j = rng.randrange(seen)
+                        if j < k:
+                            reservoir[j] = line
+        return [json.loads(line) for line in reservoir]
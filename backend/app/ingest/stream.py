@@ -0,0 +1,197 @@
+"""
+Streaming JSON decoding for large feed responses.
+
+WHY: fetchers used to r.json() the whole response — RemoteOK's dump is
+every posting of the last weeks — then build a normalized list, then the
+orchestrator dumped a Bronze copy and built a filtered list: four copies
+of the feed alive at peak, on a 512MB instance. Now the records of the
+feed's job array are decoded one at a time from the byte stream:
+
+    async for item in iter_json_array(r.aiter_bytes(STREAM_CHUNK), key="data"):
+        ...
+
+- JsonArrayParser is a push parser: feed() it byte chunks, it returns the
+  array items completed so far. Only the undecoded tail of the buffer
+  (at most one partial item) is kept.
+- key=None streams a top-level array ([meta, job, job, ...] on RemoteOK);
+  key="jobs" streams the "jobs" array of a top-level object. The object's
+  other members (totalCount, links, ...) are decoded normally into
+  parser.meta — they are small.
+- Items themselves are decoded with json's C scanner (raw_decode), so this
+  is about as fast as json.loads, just bounded by the largest item instead
+  of the whole body.
+
+No new dependency (ijson would need a C backend to be this fast).
+"""
+
+import re
+import json
+import codecs
+from typing import Any, AsyncIterator, Iterable
+
+# Bytes per read from the response stream
+STREAM_CHUNK = 64 * 1024
+
+_WS = re.compile(r"[ \t\n\r]*")
+# What may still follow a number's accepted prefix ("1500." → "1500.0")
+_NUMBER_TAIL = re.compile(r"[0-9.eE+-]*")
+
+# Parser states
+_START, _MEMBERS, _ITEMS, _DONE = "start", "members", "items", "done"
+
+
+class JsonArrayParser:
+    """
+    Incremental decoder for the items of one JSON array.
+
+        parser = JsonArrayParser(key="data")
+        for chunk in chunks:
+            for item in parser.feed(chunk):
+                ...
+        parser.close()   # raises ValueError on a truncated document
+    """
+
+    def __init__(self, key: str | None = None):
+        self.key = key
+        self.meta: dict[str, Any] = {}
+        self._buf = ""
+        self._pos = 0
+        self._state = _START
+        self._text = codecs.getincrementaldecoder("utf-8")()
+        self._decoder = json.JSONDecoder()
+
+    def feed(self, chunk: bytes) -> list:
+        """Add bytes; returns the items they completed."""
+        self._buf = self._buf[self._pos:] + self._text.decode(chunk)
+        self._pos = 0
+        return self._drain(final=False)
+
+    def close(self) -> list:
+        """End of input; returns the last items."""
+        self._buf = self._buf[self._pos:] + self._text.decode(b"", final=True)
+        self._pos = 0
+        items = self._drain(final=True)
+        if self._state != _DONE:
+            raise ValueError(f"Truncated JSON: stream ended inside the {self.key or 'top-level'} array")
+        return items
+
+    def _skip_ws(self, pos: int) -> int:
+        return _WS.match(self._buf, pos).end()
+
+    def _decode(self, pos: int, final: bool, closers: str) -> tuple[Any, int] | None:
+        """
+        (value, end) for the JSON value at pos, or None if the buffer ends
+        inside it.
+
+        The value must be followed by "," or one of `closers`: raw_decode
+        accepts a number's prefix, so a chunk ending in "1500." or "2e"
+        would otherwise decode as 1500 / 2 and leave a stray tail. A value
+        running to the end of the buffer, or followed only by characters
+        that could still continue a number, counts as incomplete.
+        """
+        try:
+            value, end = self._decoder.raw_decode(self._buf, pos)
+        except json.JSONDecodeError:
+            if final:
+                raise
+            return None
+        after = self._skip_ws(end)
+        if after < len(self._buf) and self._buf[after] in "," + closers:
+            return value, end
+        if not final and (after >= len(self._buf) or _NUMBER_TAIL.match(self._buf, end).end() == len(self._buf)):
+            return None
+        if final and after >= len(self._buf):
+            return value, end  # let close() report the missing closer
+        raise ValueError(f"Expected ',' or {' or '.join(repr(c) for c in closers)} after a value at {end}")
+
+    def _drain(self, final: bool) -> list:
+        items = []
+        buf = self._buf
+        while True:
+            pos = self._skip_ws(self._pos)
+            if pos >= len(buf):
+                self._pos = pos
+                return items
+            char = buf[pos]
+
+            if self._state == _START:
+                expected = "[" if self.key is None else "{"
+                if char != expected:
+                    raise ValueError(f"Expected '{expected}' at the start of the feed, got {char!r}")
+                self._pos = pos + 1
+                self._state = _ITEMS if self.key is None else _MEMBERS
+
+            elif self._state == _MEMBERS:
+                if char == ",":
+                    self._pos = pos + 1
+                    continue
+                if char == "}":
+                    self._pos = pos + 1
+                    self._state = _DONE
+                    continue
+                try:
+                    name, end = self._decoder.raw_decode(buf, pos)
+                except json.JSONDecodeError:
+                    if final:
+                        raise
+                    return items
+                colon = self._skip_ws(end)
+                if colon >= len(buf):
+                    return items
+                if buf[colon] != ":":
+                    raise ValueError(f"Expected ':' after member {name!r}")
+                start = self._skip_ws(colon + 1)
+                if start >= len(buf):
+                    return items
+                if name == self.key and buf[start] == "[":
+                    self._pos = start + 1
+                    self._state = _ITEMS
+                    continue
+                decoded = self._decode(start, final, "}")
+                if decoded is None:
+                    return items
+                self.meta[name], self._pos = decoded
+
+            elif self._state == _ITEMS:
+                if char == ",":
+                    self._pos = pos + 1
+                    continue
+                if char == "]":
+                    self._pos = pos + 1
+                    self._state = _DONE if self.key is None else _MEMBERS
+                    continue
+                decoded = self._decode(pos, final, "]")
+                if decoded is None:
+                    return items
+                item, self._pos = decoded
+                items.append(item)
+
+            else:  # _DONE — ignore trailing whitespace/bytes
+                self._pos = len(buf)
+                return items
+
+
+async def iter_json_array(chunks: AsyncIterator[bytes], key: str | None = None,
+                          meta: dict | None = None) -> AsyncIterator[Any]:
+    """
+    Items of the feed's job array, decoded as the bytes arrive.
+
+    meta (optional) is filled with the object's other top-level members
+    once the stream is consumed.
+    """
+    parser = JsonArrayParser(key)
+    async for chunk in chunks:
+        for item in parser.feed(chunk):
+            yield item
+    for item in parser.close():
+        yield item
+    if meta is not None:
+        meta.update(parser.meta)
+
+
+def json_array_items(chunks: Iterable[bytes], key: str | None = None) -> Iterable[Any]:
+    """Sync counterpart of iter_json_array (files, benchmarks)."""
+    parser = JsonArrayParser(key)
+    for chunk in chunks:
+        yield from parser.feed(chunk)
+    yield from parser.close()
@@ -0,0 +1,180 @@
+"""
+Per-host request budgets for the ingest fan-out.
+
+WHY: ingest_source fetches every org of an ATS concurrently. Without a cap,
+150 Greenhouse boards would open 150 simultaneous requests against
+boards-api.greenhouse.io and get us rate-limited. Each host gets:
+- a concurrency cap (max requests in flight)
+- a requests-per-second budget (evenly spaced request starts)
+
+The budget is enforced per HTTP request by HostLimitTransport, which every
+pooled client (clients.py) puts under its RetryTransport — so detail
+fetches, pagination and retries all count, not just one slot per org.
+A request holds its concurrency slot until its response is closed
+(streamed feeds included).
+
+Config (per ATS label, upper-cased):
+    GREENHOUSE_CONCURRENCY=8   GREENHOUSE_RPS=5
+    LEVER_CONCURRENCY=8        LEVER_RPS=5
+    ASHBY_CONCURRENCY=8        ASHBY_RPS=5
+Falls back to INGEST_HOST_CONCURRENCY / INGEST_HOST_RPS. Other sources
+use their client name (REMOTEOK_RPS, DETAIL_RPS, ...). Limiters are keyed
+by request host and shared by every client that hits it; the first client
+to reach a host sets its budget.
+"""
+
+import os
+import math
+import asyncio
+import time
+import httpx
+
+DEFAULT_CONCURRENCY = int(os.getenv("INGEST_HOST_CONCURRENCY", "8"))
+DEFAULT_RPS = float(os.getenv("INGEST_HOST_RPS", "5"))
+
+
+class HostLimiter:
+    """
+    Semaphore + request-rate spacing for one host.
+
+    Usage:
+        async with limiter:
+            await client.get(...)
+    """
+
+    def __init__(self, concurrency: int = DEFAULT_CONCURRENCY, rps: float = DEFAULT_RPS):
+        self.concurrency = max(1, concurrency)
+        self.rps = rps
+        self._sema = asyncio.Semaphore(self.concurrency)
+        self._interval = 1.0 / rps if rps > 0 else 0.0
+        self._next_slot = 0.0
+        self._lock = asyncio.Lock()
+
+    async def _wait_for_slot(self):
+        if not self._interval:
+            return
+        async with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self._interval
+        delay = slot - now
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    async def acquire(self):
+        await self._sema.acquire()
+        try:
+            await self._wait_for_slot()
+        except BaseException:
+            self._sema.release()
+            raise
+
+    def release(self):
+        self._sema.release()
+
+    async def __aenter__(self):
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.release()
+        return False
+
+
+def limiter_for(label: str, share: float = 1.0) -> HostLimiter:
+    """
+    Build a limiter for an ATS label ("Greenhouse", "Lever", ...) from env.
+
+    share scales the budget down when several worker processes hit the same
+    host (each of N workers gets 1/N).
+
+    Create one per ingest run — asyncio primitives are bound to the event
+    loop they're first used on.
+    """
+    prefix = label.upper().replace(" ", "_")
+    concurrency = int(os.getenv(f"{prefix}_CONCURRENCY", DEFAULT_CONCURRENCY))
+    rps = float(os.getenv(f"{prefix}_RPS", DEFAULT_RPS))
+    return HostLimiter(concurrency=math.ceil(concurrency * share), rps=rps * share)
+
+
+def host_concurrency(label: str, share: float = 1.0) -> int:
+    """Concurrency cap for an ATS label — also bounds how many orgs ingest_source fetches at once."""
+    prefix = label.upper().replace(" ", "_")
+    return math.ceil(int(os.getenv(f"{prefix}_CONCURRENCY", DEFAULT_CONCURRENCY)) * share)
+
+
+# ── Per-request limiting ─────────────────────────────────────────────
+
+_limiters: dict[str, HostLimiter] = {}
+_limiters_loop = None
+_share = 1.0
+
+
+def reset_host_limiters(share: float = 1.0):
+    """
+    Fresh per-host limiters for an ingest run. share scales every budget
+    (sharded workers pass 1/N). The caller holds the run lock.
+    """
+    global _share, _limiters_loop
+    _limiters.clear()
+    _limiters_loop = None
+    _share = share
+
+
+def host_limiter(host: str, label: str) -> HostLimiter:
+    """The limiter for a request host, built from `label`'s budget on first use."""
+    # asyncio primitives are loop-bound; each ingest run may use a new loop
+    global _limiters_loop
+    loop = asyncio.get_running_loop()
+    if _limiters_loop is not loop:
+        _limiters.clear()
+        _limiters_loop = loop
+    limiter = _limiters.get(host)
+    if limiter is None:
+        limiter = _limiters[host] = limiter_for(label, share=_share)
+    return limiter
+
+
+class _ReleasingStream(httpx.AsyncByteStream):
+    """Response body that gives the host slot back when it is closed."""
+
+    def __init__(self, stream: httpx.AsyncByteStream, release):
+        self._stream = stream
+        self._release = release
+
+    async def __aiter__(self):
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self):
+        try:
+            await self._stream.aclose()
+        finally:
+            if self._release is not None:
+                self._release()
+                self._release = None
+
+
+class HostLimitTransport(httpx.AsyncBaseTransport):
+    """Wraps a transport; every request waits for its host's HostLimiter."""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, label: str):
+        self._transport = transport
+        self.label = label
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        limiter = host_limiter(request.url.host, self.label)
+        await limiter.acquire()
+        try:
+            response = await self._transport.handle_async_request(request)
+        except BaseException:
+            limiter.release()
+            raise
+        if response.is_closed:  # body already read (in-memory responses)
+            limiter.release()
+        else:
+            response.stream = _ReleasingStream(response.stream, limiter.release)
+        return response
+
+    async def aclose(self):
+        await self._transport.aclose()
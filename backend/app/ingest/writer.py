@@ -0,0 +1,68 @@
+"""
+Off-loop executor for ingest persistence.
+
+WHY: ingest_source / ingest_api_source are async but used to call the
+sync SessionLocal + bulk upsert (plus Bronze JSON dumps and filtering)
+inline, freezing the FastAPI event loop for the whole write — that's
+what caused login stalls while ingest ran inside the web process.
+
+Now every blocking step after the HTTP fetch goes through IngestWriter:
+- a small dedicated thread pool (INGEST_DB_WORKERS, default 2) so ingest
+  never holds more than that many pooled DB connections
+- a bounded queue (INGEST_WRITE_QUEUE, default 8): when writes fall
+  behind, fetch tasks wait instead of piling parsed boards up in memory
+"""
+
+import os
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+
+INGEST_DB_WORKERS = int(os.getenv("INGEST_DB_WORKERS", "2"))
+INGEST_WRITE_QUEUE = int(os.getenv("INGEST_WRITE_QUEUE", "8"))
+
+
+class IngestWriter:
+    """
+    Usage:
+        counts = await writer.run(persist_fn, source_name, jobs)
+    """
+
+    def __init__(self, workers: int = INGEST_DB_WORKERS, max_pending: int = INGEST_WRITE_QUEUE):
+        self.workers = max(1, workers)
+        self.max_pending = max(self.workers, max_pending)
+        self._executor: ThreadPoolExecutor | None = None
+        self._slots: asyncio.Semaphore | None = None
+        self._slots_loop = None
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.workers, thread_name_prefix="ingest-writer"
+            )
+        return self._executor
+
+    def _get_slots(self) -> asyncio.Semaphore:
+        # asyncio primitives are loop-bound; scheduler runs and run_ingest.py
+        # may use different loops over the life of the process
+        loop = asyncio.get_running_loop()
+        if self._slots is None or self._slots_loop is not loop:
+            self._slots = asyncio.Semaphore(self.max_pending)
+            self._slots_loop = loop
+        return self._slots
+
+    async def run(self, fn, *args, **kwargs):
+        """Run a blocking callable on the writer pool and await its result."""
+        async with self._get_slots():
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                self._get_executor(), functools.partial(fn, *args, **kwargs)
+            )
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+
+writer = IngestWriter()
@@ -0,0 +1,164 @@
+"""
+Standalone ingest worker
+========================
+
+Runs ingestion outside the API process, sharded across N processes.
+
+WHY:
+- Parsing (BeautifulSoup, extract_skills, filter_worldwide_jobs) is
+  CPU-bound; inside the API process it could only ever use one core.
+- Ingest load no longer competes with API requests at all.
+
+How it works:
+- build_ingest_plan() lists every unit of work (one per ATS org, one per
+  API board); shard_plan() spreads them across N shards.
+- Each shard runs run_ingest_once(plan=shard) in its own process: fetch,
+  parse, filter and write through the bulk upsert path.
+- Per-shard summaries are merged into one run summary.
+- Each worker gets 1/N of every ATS host budget, so N workers together
+  stay within <LABEL>_CONCURRENCY / <LABEL>_RPS.
+- Loop mode wakes every INGEST_TICK_MINUTES and only runs the sources
+  whose adaptive interval has elapsed (app/ingest/schedule.py).
+
+Usage:
+    python -m app.ingest_loop                 # loop forever (Render worker)
+    python -m app.ingest_loop --once -w 4     # one full sharded run, then exit
+
+Set INGEST_IN_PROCESS=false on the API service when this worker runs, so
+the API stops scheduling its own ingest.
+"""
+
+import os
+import time
+import asyncio
+import argparse
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+from dotenv import load_dotenv
+
+from app.ingest.schedule import TICK_MINUTES
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+INGEST_WORKERS = int(os.getenv("INGEST_WORKERS", str(max(1, (os.cpu_count() or 2) - 1))))
+
+
+def shard_plan(plan: list[dict], shards: int) -> list[list[dict]]:
+    """
+    Split a plan into `shards` roughly equal parts.
+
+    Round-robin per label so every shard gets a mix of ATS orgs and API
+    boards (one huge ATS doesn't land on a single worker).
+    """
+    shards = max(1, min(shards, len(plan)))
+    out: list[list[dict]] = [[] for _ in range(shards)]
+    for i, unit in enumerate(sorted(plan, key=lambda u: (u["label"], u["key"]))):
+        out[i % shards].append(unit)
+    return [s for s in out if s]
+
+
+def _run_shard(shard: list[dict], host_share: float) -> dict:
+    """Process entry point — fresh interpreter, own event loop and DB pool."""
+    from app.orchestrator import run_ingest_once
+    return asyncio.run(run_ingest_once(plan=shard, host_share=host_share))
+
+
+def merge_summaries(summaries: list[dict], started_at: datetime, duration_s: float) -> dict:
+    sources = [row for s in summaries for row in s.get("sources", [])]
+    return {
+        "started_at": started_at.isoformat(),
+        "finished_at": datetime.utcnow().isoformat(),
+        "duration_s": round(duration_s, 2),
+        "workers": len(summaries),
+        "sources": sources,
+    }
+
+
+def run_sharded(workers: int = INGEST_WORKERS, due_only: bool = False, spawn: bool = False) -> dict:
+    """
+    One ingest run split across `workers` processes. Blocks until done.
+
+    due_only: only sources whose adaptive interval has elapsed.
+    spawn:    run even a single shard in a worker process. For callers
+              that hold this process's orchestrator.run_lock (the API's
+              /internal/trigger-ingest) — an in-process shard would wait
+              on that lock forever.
+
+    Returns the merged summary (same shape as run_ingest_once + "workers").
+    """
+    from app.orchestrator import build_ingest_plan, _print_run_summary, _due_plan
+
+    started_at = datetime.utcnow()
+    started = time.perf_counter()
+
+    plan = build_ingest_plan()
+    if not plan:
+        print("⚠️  No sources configured. Check your .env file.")
+        return merge_summaries([], started_at, 0.0)
+    if due_only:
+        plan = _due_plan(plan)
+        if not plan:
+            return merge_summaries([], started_at, 0.0)
+
+    shards = shard_plan(plan, workers)
+    print(f"🧩 Ingest: {len(plan)} sources across {len(shards)} worker processes")
+
+    summaries = []
+    if len(shards) == 1 and not spawn:
+        summaries.append(_run_shard(shards[0], 1.0))
+    else:
+        # spawn: never fork a process holding DB connections / event loops
+        ctx = multiprocessing.get_context("spawn")
+        host_share = 1.0 / len(shards)
+        with ProcessPoolExecutor(max_workers=len(shards), mp_context=ctx) as pool:
+            futures = [pool.submit(_run_shard, shard, host_share) for shard in shards]
+            for shard, future in zip(shards, futures):
+                try:
+                    summaries.append(future.result())
+                except Exception as e:
+                    # A crashed worker shows up as failed rows, not a lost run
+                    print(f"❌ Worker for {len(shard)} sources crashed: {e}")
+                    summaries.append({"sources": [
+                        {
+                            "source": u["key"], "label": u["label"], "status": "error",
+                            "fetched": 0, "kept": 0,
+                            "inserted": 0, "updated": 0, "unchanged": 0,
+                            "duration_s": 0.0, "error": f"worker crashed: {e}",
+                        }
+                        for u in shard
+                    ]})
+
+    summary = merge_summaries(summaries, started_at, time.perf_counter() - started)
+    if len(shards) > 1:
+        _print_run_summary(summary)
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="MyJobPhase standalone ingest worker")
+    parser.add_argument("-w", "--workers", type=int, default=INGEST_WORKERS,
+                        help="worker processes (default: INGEST_WORKERS or cpu_count-1)")
+    parser.add_argument("--once", action="store_true", help="run every source once and exit")
+    parser.add_argument("--tick-minutes", type=float, default=TICK_MINUTES,
+                        help="how often loop mode checks for due sources (default: 15)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+
+    while True:
+        try:
+            run_sharded(args.workers, due_only=not args.once)
+        except Exception as e:
+            logger.error(f"[Ingest worker] Run failed: {type(e).__name__}: {e}")
+        if args.once:
+            break
+        time.sleep(args.tick_minutes * 60)
+
+
+if __name__ == "__main__":
+    main()
@@ -9,10 +9,11 @@ from sqlalchemy import select, func
 from contextlib import asynccontextmanager
 
 from app.core import models
-from app.core.db import init_db, get_db, ensure_indexes, engine
+from app.core.db import init_db, get_db, ensure_columns, ensure_indexes, engine
 from app.core import crud, schemas
 from app.core import trends as trends_svc
-from app.orchestrator import run_ingest_once
+from app.orchestrator import run_ingest_once, run_due_ingest, run_lock, build_ingest_plan, dlq
+from app.ingest import schedule as ingest_schedule
 from app.services.auth.router import router as auth_router
 from app.services.applications.router import router as applications_router
 from app.services.email.router import router as email_router
@@ -34,6 +35,9 @@ logger = logging.getLogger(__name__)
 
 scheduler: AsyncIOScheduler | None = None
 
+# false when the standalone worker (python -m app.ingest_loop) owns ingest
+INGEST_IN_PROCESS = os.getenv("INGEST_IN_PROCESS", "true").lower() == "true"
+
 
 async def _deferred_ingest(delay_seconds: int = 15):
     """
@@ -42,7 +46,7 @@ async def _deferred_ingest(delay_seconds: int = 15):
     """
     await asyncio.sleep(delay_seconds)
     logger.info("🔄 Starting deferred ingest...")
-    await run_ingest_once()
+    await run_due_ingest()
 
 
 @asynccontextmanager
@@ -52,16 +56,23 @@ async def lifespan(app: FastAPI):
     init_db()
 
     with engine.connect() as conn:
+        ensure_columns(conn)
         ensure_indexes(conn)
         logger.info("📊 Database indexes ready")
 
-    asyncio.create_task(_deferred_ingest(delay_seconds=15))
+    if INGEST_IN_PROCESS:
+        asyncio.create_task(_deferred_ingest(delay_seconds=15))
 
     global scheduler
     scheduler = AsyncIOScheduler()
 
-    # ── Ingest: every 12 hours ────────────────────────────────────────
-    scheduler.add_job(run_ingest_once, trigger="interval", hours=12)
+    # ── Ingest: adaptive per source, checked every tick ──────────────
+    # (unless the ingest worker owns it)
+    if INGEST_IN_PROCESS:
+        scheduler.add_job(
+            run_due_ingest, trigger="interval",
+            minutes=ingest_schedule.TICK_MINUTES, max_instances=1, coalesce=True,
+        )
 
 
     # ── Follow-up reminders: daily at 9 AM ───────────────────────────
@@ -90,7 +101,7 @@ async def lifespan(app: FastAPI):
     scheduler.add_job(run_weekly_digest, "cron", day_of_week="sun", hour=10, minute=0)
 
     scheduler.start()
-    logger.info("✅ Scheduler started — ingest:12h | scoring:6h | followup:9am | digest:Sunday")
+    logger.info("✅ Scheduler started — ingest:adaptive | scoring:6h | followup:9am | digest:Sunday")
 
     yield
 
@@ -175,7 +186,7 @@ def list_jobs_page(
     limit: int = Query(50, ge=1, le=500),
     offset: int = Query(0, ge=0),
     skill: str | None = Query(None, description="filter by a skill keyword"),
-    location: str | None = Query(None, description="substring match, e.g. 'london' or 'remote'"),
+    location: str | None = Query(None, description="region, country or 'remote' (indexed), else substring, e.g. 'europe', 'germany', 'london'"),
     remote: bool | None = Query(None, description="true/false"),
     db: Session = Depends(get_db),
 ):
@@ -222,11 +233,85 @@ def admin_status(db: Session = Depends(get_db)):
         select(func.count()).select_from(models.Job).where(models.Job.scraped_at >= cutoff)
     ) or 0
 
+    from app.ingest.breaker import breaker_status
+    from app.core.lifecycle import lifecycle_stats
+
     return {
         "sources": {"greenhouse": gh, "lever": lever, "ashby": ashby},
         "counts": {"total": total, "last_7d": recent_7d},
+        "lifecycle": lifecycle_stats(db),
+        "breakers": breaker_status(db),
+    }
+
+@app.get("/admin/ingest-plan")
+def admin_ingest_plan(db: Session = Depends(get_db)):
+    """Adaptive polling plan: interval, change rate and next run per source."""
+    rows = ingest_schedule.next_run_plan(db, build_ingest_plan())
+    return {
+        "tick_minutes": ingest_schedule.TICK_MINUTES,
+        "due": sum(r["due"] for r in rows),
+        "sources": rows,
     }
 
+@app.get("/admin/dlq")
+def admin_dlq(
+    error_type: str | None = Query(None, description="filter, validation, parsing"),
+    source: str | None = None,
+    days: int = Query(7, ge=1, le=90),
+    contains: str | None = Query(None, description="substring of the rejection reason"),
+    limit: int = Query(50, ge=1, le=500),
+    sample: bool = Query(False, description="random sample instead of newest first"),
+):
+    """Rejected records with per-type / per-source counts (from the counters index)."""
+    if sample:
+        records = dlq.sample(error_type=error_type, source=source, days=days, k=limit)
+    else:
+        records = dlq.query(error_type=error_type, source=source, days=days, contains=contains, limit=limit)
+    return {
+        "counts": {
+            "by_type": dlq.get_counts(days=days, by="error_type", source=source),
+            "by_source": dlq.get_counts(days=days, by="source", error_type=error_type),
+        },
+        "records": records,
+    }
+
+
+@app.post("/internal/trigger-ingest")
+async def trigger_ingest(
+    request: Request,
+    workers: int = Query(1, ge=1, le=16),
+    due: bool = Query(False, description="only sources whose adaptive interval has elapsed"),
+):
+    """
+    Run one ingest and return its summary (called by the Airflow DAG).
+    workers > 1 shards the run across processes like app.ingest_loop.
+    Protected by INTERNAL_SECRET header.
+
+    409 when INGEST_IN_PROCESS=false: ingest belongs to the app.ingest_loop
+    worker then, and a second run here would fetch the same due boards and
+    overwrite its validators, cursors and schedule.
+
+    Sharded runs hold this process's run lock while the worker processes
+    fetch, so the scheduler tick or startup ingest here can't write the
+    same boards at the same time.
+    """
+    secret = request.headers.get("X-Internal-Secret", "")
+    if secret != os.getenv("INTERNAL_SECRET", ""):
+        return JSONResponse(status_code=403, content={"detail": "Forbidden"})
+    if not INGEST_IN_PROCESS:
+        return JSONResponse(
+            status_code=409,
+            content={"detail": "Ingest runs in the ingest worker (INGEST_IN_PROCESS=false)"},
+        )
+    if workers > 1:
+        from app.ingest_loop import run_sharded
+        async with run_lock():
+            return await asyncio.to_thread(run_sharded, workers, due, spawn=True)
+    if due:
+        return await run_due_ingest() or {"sources": []}
+    return await run_ingest_once()
+
+
 @app.post("/internal/trigger-scoring")
 async def trigger_scoring(background_tasks: BackgroundTasks, request: Request):
     """Manually trigger the scoring job. Protected by INTERNAL_SECRET header."""
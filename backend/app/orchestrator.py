@@ -1,12 +1,20 @@
 import os
 from dotenv import load_dotenv
 import asyncio
+import time
+import uuid
+import inspect
+import threading
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+from contextvars import ContextVar
+from datetime import datetime
 from sqlalchemy import func, and_
 from sqlalchemy.orm import Session
 from .core.models import Job
 from .core.db import SessionLocal
-from .core import crud, schemas
-from .core.location_filter import is_worldwide_remote, clean_location
+from .core import crud, schemas, lifecycle
+from .core.location_filter import classify_many, clean_location
 from .ingest.greenhouse import fetch_greenhouse_org
 from .ingest.lever import fetch_lever_org
 from .ingest.ashby import fetch_ashby_org
@@ -18,9 +26,35 @@ from .ingest.europeremotely import fetch_europeremotely_jobs
 from .ingest.remoteafrica import fetch_remoteafrica_jobs
 from .ingest.himalayas import fetch_himalayas_jobs
 from .ingest.storage import BronzeStorage, DeadLetterQueue
+from .ingest.throttle import host_concurrency, reset_host_limiters
+from .ingest.clients import ingest_session
+from .ingest.writer import writer
+from .ingest.detail import DETAIL_FETCH
+from .ingest.detail_cache import detail_cache
+from .ingest.conditional import (
+    NotModified, current_source, load_validators, commit_validators, discard_validators,
+)
+from .ingest.cursors import (
+    load_cursors, commit_cursors, discard_cursors, is_incremental, last_full_sync,
+)
+from .ingest import schedule, breaker
 
 load_dotenv()
 
+# Id of the ingest run in progress — recorded on every Bronze segment
+current_run_id: ContextVar[str | None] = ContextVar("current_run_id", default=None)
+
+# Per-org fetch budget — a board slower than this is abandoned for the run
+ORG_TIMEOUT = float(os.getenv("ORG_TIMEOUT", "120"))
+
+# Records per Bronze → filter → upsert step: peak memory of a board's
+# ingest scales with this, not with the feed size
+INGEST_BATCH_SIZE = int(os.getenv("INGEST_BATCH_SIZE", "200"))
+
+# One ingest run at a time per process — see run_lock()
+_lock = threading.Lock()
+RUN_LOCK_POLL = 0.5  # seconds between attempts while another run holds it
+
 # Initialize Bronze and DLQ
 bronze = BronzeStorage()
 dlq = DeadLetterQueue()
@@ -30,12 +64,13 @@ def get_env_list(key: str) -> list[str]:
     return [x.strip() for x in raw.split(",") if x.strip()]
 
 
-def filter_worldwide_jobs(jobs: list[dict], source_name: str) -> list[dict]:
+def filter_worldwide_jobs(jobs: list[dict], source_name: str, log_rejects: bool = True) -> list[dict]:
     """
     Filter jobs to only include worldwide/EMEA remote positions
     Exclude US-only remote jobs
     
-    Logs rejected jobs to DLQ for analysis
+    Logs rejected jobs to DLQ for analysis (log_rejects=False for Bronze
+    replays, which would only duplicate what the original run logged)
     
     WHY: Before, we just silently dropped US-only jobs
          Now: We can analyze them, track filtering trends
@@ -43,17 +78,15 @@ def filter_worldwide_jobs(jobs: list[dict], source_name: str) -> list[dict]:
     filtered = []
     rejected_count = 0
     
-    for job in jobs:
-        location = job.get("location", "")
-        description = job.get("description_text", "")
-        
-        # Clean location first
-        location = clean_location(location)
-        
-        # Check if worldwide remote
-        if is_worldwide_remote(location, description):
+    for job, decision in zip(jobs, classify_many(jobs)):
+        if decision["accept"]:
             filtered.append(job)
-        else:
+            continue
+
+        rejected_count += 1
+        if log_rejects:
+            location = clean_location(job.get("location", ""))
+            reason = decision["rule"] + (f" '{decision['match']}'" if decision["match"] else "")
             # Log to DLQ instead of just counting
             dlq.log_failure(
                 source=source_name,
@@ -63,10 +96,9 @@ def filter_worldwide_jobs(jobs: list[dict], source_name: str) -> list[dict]:
                     "location": location,
                     "url": job.get("url")
                 },
-                error=f"US-only location: {location}",
+                error=f"US-only location: {location} ({reason})",
                 error_type="filter"
             )
-            rejected_count += 1
     
     if rejected_count > 0:
         print(f"  🌍 Filtered out {rejected_count} US-only positions")
@@ -74,155 +106,458 @@ def filter_worldwide_jobs(jobs: list[dict], source_name: str) -> list[dict]:
     return filtered
 
 
-def _bulk_upsert(db: Session, jobs: list[dict]):
-    from app.core.translate import translate_to_english, is_english
-    for jd in jobs:
-        payload = schemas.JobCreate(**jd)
-        crud.upsert_job(db, payload)
+def _bulk_upsert(db: Session, jobs: list[dict]) -> dict[str, int]:
+    """
+    Validate and write a whole source batch in a handful of statements.
+
+    Returns inserted/updated/unchanged counts from crud.bulk_upsert_jobs.
+    """
+    payloads = [schemas.JobCreate(**jd) for jd in jobs]
+    return crud.bulk_upsert_jobs(db, payloads)
+
+
+def _load_run_state():
+    with SessionLocal() as db:
+        load_validators(db)
+        load_cursors(db)
+        breaker.load_breakers(db)
+
+
+def _record_run(rows: list[dict]):
+    with SessionLocal() as db:
+        schedule.record_results(db, rows)
+        breaker.save_breakers(db)
+        db.commit()
+
+
+def _due_plan(plan: list[dict]) -> list[dict]:
+    with SessionLocal() as db:
+        return schedule.due_plan(db, plan)
+
+
+def _format_counts(counts: dict[str, int]) -> str:
+    line = f"{counts['inserted']} new, {counts['updated']} updated, {counts['unchanged']} unchanged"
+    if counts.get("duplicates"):
+        line += f", {counts['duplicates']} near-duplicates linked"
+    return line
+
+
+def _touch_board(source_name: str) -> int:
+    """Unchanged board: bump last_seen_at on its jobs. Runs on the writer pool."""
+    with SessionLocal() as db:
+        touched = crud.touch_source_jobs(db, source_name, seen_since=last_full_sync(source_name))
+        db.commit()
+    return touched
+
+
+def _run_lifecycle() -> dict[str, int]:
+    """Close stale jobs, promote duplicates of closed ones, archive old closures."""
+    with SessionLocal() as db:
+        return lifecycle.run_lifecycle(db)
+
+
+async def _batches(fetched, size: int = INGEST_BATCH_SIZE) -> AsyncIterator[list[dict]]:
+    """
+    A fetcher's jobs in batches of `size`. Board fetchers return a list
+    (awaitable); streamed feeds (RemoteOK, Arbeitnow, Himalayas) are async
+    generators, and only one batch of theirs is ever buffered here.
+    """
+    if inspect.isawaitable(fetched):
+        fetched = await fetched
+    if isinstance(fetched, list):
+        for i in range(0, len(fetched), size):
+            yield fetched[i:i + size]
+        return
+    batch = []
+    async for job in fetched:
+        batch.append(job)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _process_batch(source_name: str, jobs: list[dict], segment) -> tuple[int, dict | None]:
+    """
+    Bronze → filter → upsert for one batch of a board. Runs on the writer
+    pool so JSON dumps, filtering and DB round trips never block the event
+    loop. Commits per batch — upserts are idempotent, so a board that fails
+    halfway is simply redone next run (its validators/cursors aren't saved).
+
+    Returns (kept, upsert counts — None if nothing survived the filter).
+    """
+    # Save to Bronze FIRST (before any processing)
+    segment.write(jobs)
+
+    # THEN filter for worldwide remote
+    jobs = filter_worldwide_jobs(jobs, source_name)
+    if not jobs:
+        return 0, None
+
+    with SessionLocal() as db:
+        counts = _bulk_upsert(db, jobs)
+        db.commit()
+    return len(jobs), counts
+
+
+def _finish_board(source_name: str, segment, seen_at: datetime, complete: bool) -> int:
+    """
+    After a board's last batch: seal its Bronze segment, then (one
+    transaction) refresh/close its other jobs and persist validators and
+    cursors. Runs on the writer pool.
 
+    complete: the fetch returned every open posting on the board (ATS
+    boards), so the board's jobs it didn't deliver are closed.
 
-async def ingest_source(orgs: list[str], fetcher, label: str):
+    Returns jobs closed.
+    """
+    segment.close()
+    with SessionLocal() as db:
+        # Incremental fetch skipped postings it already knew — they were
+        # still on the feed, so keep them fresh like an unchanged board
+        if is_incremental(source_name):
+            crud.touch_source_jobs(db, source_name, seen_since=last_full_sync(source_name))
+        closed = lifecycle.close_missing(db, source_name, seen_at) if complete else 0
+        # Only remember validators/cursors once the board's jobs are safely written
+        commit_validators(db, source_name)
+        commit_cursors(db, source_name)
+        db.commit()
+    return closed
+
+
+def _settle_segment(segment):
+    """Failed board: keep what already reached Bronze (it may be upserted), drop an empty segment."""
+    if segment.record_count:
+        segment.close()
+    else:
+        segment.abort()
+
+
+async def _ingest_board(source_name: str, label: str, fetch, display: str, metadata: dict) -> dict:
+    """
+    Fetch → Bronze → filter → upsert for one board/feed, INGEST_BATCH_SIZE
+    jobs at a time as the fetch delivers them.
+
+    Only the HTTP fetch (and JSON decoding) runs on the event loop;
+    everything blocking goes through the bounded ingest writer pool
+    (app/ingest/writer.py). While a batch is written the stream isn't
+    read, so a slow DB throttles the download instead of buffering it.
+
+    Never raises: failures are recorded in the returned result so one bad
+    board can't take down the rest of the run.
+
+    status is "ok", "not_modified" (304 / same payload — pipeline skipped,
+    last_seen_at bumped), "circuit_open" (skipped by the source's circuit
+    breaker, app/ingest/breaker.py), "timeout" or "error".
+    Fetch failures count against the breaker.
+
+    Returns a run-summary row:
+        {"source", "label", "status", "fetched", "kept",
+         "inserted", "updated", "unchanged", "closed", "duration_s", "error"}
+    """
+    result = {
+        "source": source_name, "label": label, "status": "ok",
+        "fetched": 0, "kept": 0,
+        "inserted": 0, "updated": 0, "unchanged": 0, "closed": 0,
+        "duration_s": 0.0, "error": None,
+    }
+    started = time.perf_counter()
+    source_token = current_source.set(source_name)
+    writing = False  # failures while writing (DB, filter) don't trip the breaker
+    segment = None
+    try:
+        # Open breaker → skip without a single request
+        if not breaker.allow(source_name):
+            until = breaker.opened_until(source_name)
+            result["status"] = "circuit_open"
+            result["error"] = f"circuit open until {until:%Y-%m-%d %H:%M} UTC" if until else "circuit open"
+            print(f"⛔ {display}: Skipped — {result['error']}")
+            return result
+
+        print(f"🔍 {display}: Fetching...")
+
+        # Every row this run writes gets last_seen_at >= seen_at (close_missing)
+        seen_at = datetime.utcnow()
+        segment = bronze.open_segment(source_name, metadata=metadata, run_id=current_run_id.get())
+
+        # Fetch from API — raises NotModified (before the first job) if the
+        # board didn't change
+        try:
+            async for batch in _batches(fetch()):
+                # Stamp the board so unchanged boards can be touched by source later
+                for jd in batch:
+                    jd["source"] = source_name
+                result["fetched"] += len(batch)
+
+                # Bronze → filter → upsert, off the event loop
+                writing = True
+                kept, counts = await writer.run(_process_batch, source_name, batch, segment)
+                writing = False
+                result["kept"] += kept
+                for key, n in (counts or {}).items():
+                    result[key] = result.get(key, 0) + n
+        except NotModified as nm:
+            touched = await writer.run(_touch_board, source_name)
+            result["status"] = "not_modified"
+            result["unchanged"] = touched
+            print(f"♻️  {display}: Unchanged since last run ({nm.reason}) — touched {touched} jobs")
+            return result
+
+        writing = True
+        print(f"📦 {display}: Fetched {result['fetched']} jobs")
+        result["closed"] = await writer.run(
+            _finish_board, source_name, segment, seen_at,
+            # ATS boards list every open posting; an empty fetch is more
+            # likely a glitch than a board with no jobs
+            label in ORG_SOURCES and result["fetched"] > 0,
+        )
+        kept = result["kept"]
+        print(f"✅ {display}: {kept} worldwide remote jobs")
+
+        if kept:
+            print(f"💾 {display}: Upserted {kept} jobs ({_format_counts(result)})")
+        else:
+            print(f"⚠️  {display}: No worldwide remote jobs found")
+        if result["closed"]:
+            print(f"🔒 {display}: Closed {result['closed']} jobs no longer on the board")
+
+    except asyncio.TimeoutError:
+        result["status"] = "timeout"
+        result["error"] = f"timed out after {ORG_TIMEOUT}s"
+        breaker.record_failure(source_name, result["error"])
+        print(f"⏱️  {display}: {result['error']}")
+    except Exception as e:
+        result["status"] = "error"
+        result["error"] = f"{type(e).__name__}: {e}"
+        if not writing:
+            breaker.record_failure(source_name, result["error"], breaker.failure_retry_after(e))
+        print(f"❌ {display}: {e}")
+    finally:
+        if segment is not None and not segment.closed:
+            await writer.run(_settle_segment, segment)
+        if result["status"] in ("ok", "not_modified"):
+            breaker.record_success(source_name)
+        if result["status"] != "ok":
+            discard_validators(source_name)
+            discard_cursors(source_name)
+        current_source.reset(source_token)
+        result["duration_s"] = round(time.perf_counter() - started, 2)
+
+    return result
+
+
+async def ingest_source(orgs: list[str], fetcher, label: str, concurrency: int | None = None) -> list[dict]:
     """
     Ingest from company job boards (Greenhouse, Lever, Ashby)
-    
-    Now saves to Bronze layer before processing
-    
-    WHY: 
+
+    Orgs are fetched concurrently, at most `concurrency` at a time (the
+    host's concurrency cap by default). The per-host requests/second and
+    in-flight budget is enforced on each HTTP request by the pooled
+    client (ingest/throttle.py HostLimitTransport). Each org also gets its
+    own ORG_TIMEOUT so one slow or 404ing board can't stall the others.
+
+    Saves to Bronze layer before processing
+
+    WHY:
     - Disaster recovery: Can replay if database fails
     - Audit trail: Know exactly what API returned
     - Data engineering best practice: Immutable raw data
+
+    Returns one run-summary row per org.
     """
-    for org in orgs:
-        try:
-            print(f"🔍 [{label}] {org}: Fetching...")
-            
-            # Fetch from API
-            jobs = await fetcher(org)
-            print(f"📦 [{label}] {org}: Fetched {len(jobs)} jobs")
-            
-            # ⭐ NEW: Save to Bronze FIRST (before any processing)
-            source_name = f"{label.lower()}_{org}"
-            bronze.save_raw_response(
-                source_name=source_name,
-                data=jobs,
-                metadata={
-                    "org": org,
-                    "source_type": label,
-                    "total_fetched": len(jobs)
-                }
-            )
-            
-            # THEN filter for worldwide remote
-            jobs = filter_worldwide_jobs(jobs, source_name)
-            print(f"✅ [{label}] {org}: {len(jobs)} worldwide remote jobs")
-            
-            if jobs:
-                with SessionLocal() as db:
-                    _bulk_upsert(db, jobs)
-                    db.commit()
-                print(f"💾 [{label}] {org}: Upserted {len(jobs)} jobs")
-            else:
-                print(f"⚠️  [{label}] {org}: No worldwide remote jobs found")
-                
-        except Exception as e:
-            print(f"❌ [{label}] {org}: {e}")
-
-
-async def ingest_api_source(fetcher, label: str, *args):
+    # bounds the fan-out so ORG_TIMEOUT isn't spent queueing for the host
+    orgs_at_once = asyncio.Semaphore(max(1, concurrency or host_concurrency(label)))
+
+    async def fetch_org(org: str):
+        async with orgs_at_once:
+            return await asyncio.wait_for(fetcher(org), timeout=ORG_TIMEOUT)
+
+    async def run_org(org: str) -> dict:
+        result = await _ingest_board(
+            source_name=f"{label.lower()}_{org}",
+            label=label,
+            fetch=lambda: fetch_org(org),
+            display=f"[{label}] {org}",
+            metadata={"org": org, "source_type": label},
+        )
+        result["org"] = org
+        return result
+
+    return list(await asyncio.gather(*(run_org(org) for org in orgs)))
+
+
+async def ingest_api_source(fetcher, label: str, *args) -> list[dict]:
     """
     For APIs that don't need org tokens (Remotive, Arbeitnow, etc.)
-    
-    ⭐ ENHANCED: Now saves to Bronze layer
+
+    Saves to Bronze layer before processing.
+    Returns a single-row run summary (same shape as ingest_source).
     """
-    try:
-        print(f"🔍 [{label}]: Fetching...")
-        
-        # Fetch from API
-        jobs = await fetcher(*args)
-        print(f"📦 [{label}]: Fetched {len(jobs)} jobs")
-        
-        # ⭐ NEW: Save to Bronze FIRST
-        source_name = label.lower().replace(" ", "_")
-        bronze.save_raw_response(
-            source_name=source_name,
-            data=jobs,
-            metadata={
-                "source_type": label,
-                "total_fetched": len(jobs)
-            }
+    result = await _ingest_board(
+        source_name=label.lower().replace(" ", "_"),
+        label=label,
+        fetch=lambda: fetcher(*args),
+        display=f"[{label}]",
+        metadata={"source_type": label},
+    )
+    return [result]
+
+
+def _print_run_summary(summary: dict):
+    rows = sorted(summary["sources"], key=lambda r: r["duration_s"], reverse=True)
+    print(f"\n⏱️  Per-source timing (run took {summary['duration_s']}s):")
+    for r in rows:
+        marker = {"ok": "✅", "not_modified": "♻️ ", "circuit_open": "⛔"}.get(r["status"], "❌")
+        print(
+            f"  {marker} {r['source']:<40} {r['duration_s']:>7.2f}s  "
+            f"fetched={r['fetched']} kept={r['kept']} "
+            f"new={r['inserted']} upd={r['updated']} same={r['unchanged']}"
+            + (f" closed={r['closed']}" if r.get("closed") else "")
+            + (f"  ({r['error']})" if r["error"] else "")
         )
-        
-        # THEN filter for worldwide remote
-        jobs = filter_worldwide_jobs(jobs, source_name)
-        print(f"✅ [{label}]: {len(jobs)} worldwide remote jobs")
-        
-        if jobs:
-            with SessionLocal() as db:
-                _bulk_upsert(db, jobs)
-                db.commit()
-            print(f"💾 [{label}]: Upserted {len(jobs)} jobs")
-        else:
-            print(f"⚠️  [{label}]: No worldwide remote jobs found")
-            
-    except Exception as e:
-        print(f"❌ [{label}]: {e}")
 
 
-async def run_ingest_once():
-    """Run job ingestion from all enabled sources"""
-    
+# ATS label → (env var with org tokens, per-org fetcher)
+ORG_SOURCES = {
+    "Greenhouse": ("GH_ORGS", fetch_greenhouse_org),
+    "Lever": ("LEVER_ORGS", fetch_lever_org),
+    "Ashby": ("ASHBY_ORGS", fetch_ashby_org),
+}
+
+# Board label → (enable flag, fetcher, fetcher args)
+API_SOURCES = {
+    "Remotive": ("ENABLE_REMOTIVE", fetch_remotive_jobs, (168,)),
+    "Arbeitnow": ("ENABLE_ARBEITNOW", fetch_arbeitnow_jobs, ()),
+    "RemoteOK": ("ENABLE_REMOTEOK", fetch_remoteok_jobs, (168,)),
+    "LandingJobs": ("ENABLE_LANDINGJOBS", fetch_landingjobs, ()),
+    "EuropeRemotely": ("ENABLE_EUROPEREMOTELY", fetch_europeremotely_jobs, ()),
+    "RemoteAfrica": ("ENABLE_REMOTEAFRICA", fetch_remoteafrica_jobs, ()),
+    "Himalayas": ("ENABLE_HIMALAYAS", fetch_himalayas_jobs, ()),
+}
+
+
+def build_ingest_plan() -> list[dict]:
+    """
+    Every unit of ingest work for a run, from env config.
+
+    One entry per ATS org and one per API board. Plain dicts so a plan can
+    be sharded across worker processes (app/ingest_loop.py):
+        {"key": "greenhouse_stripe", "label": "Greenhouse", "org": "stripe"}
+        {"key": "remotive", "label": "Remotive", "org": None}
+    key matches the Bronze/DLQ source name.
+    """
+    plan = []
+
+    # Company ATS scrapers
+    for label, (env_key, _) in ORG_SOURCES.items():
+        for org in get_env_list(env_key):
+            plan.append({"key": f"{label.lower()}_{org}", "label": label, "org": org})
+
+    # Remote job board APIs (enable/disable via ENABLE_* flags)
+    for label, (flag, _, _) in API_SOURCES.items():
+        if os.getenv(flag, "true").lower() == "true":
+            plan.append({"key": label.lower().replace(" ", "_"), "label": label, "org": None})
+
+    return plan
+
+
+@asynccontextmanager
+async def run_lock():
+    """
+    Serializes ingest runs in this process.
+
+    Validators (conditional.py), cursors (cursors.py), breakers
+    (breaker.py) and host limiters (throttle.py) are per-run module state:
+    each run loads them at start and stages changes until its boards are
+    written. The deferred startup ingest, the APScheduler tick and
+    /internal/trigger-ingest can overlap, and a second run's load would
+    wipe the first run's staged state.
+
+    A threading.Lock, not an asyncio.Lock: runs also start on other event
+    loops in this process (asyncio.run in a thread, e.g. a single-shard
+    run_sharded), and a per-loop lock wouldn't see them. Polled instead of
+    acquired in a thread so a cancelled waiter can't leave it held.
+    """
+    while not _lock.acquire(blocking=False):
+        await asyncio.sleep(RUN_LOCK_POLL)
+    try:
+        yield
+    finally:
+        _lock.release()
+
+
+async def run_ingest_once(plan: list[dict] | None = None, host_share: float = 1.0) -> dict:
+    """
+    Run job ingestion from all enabled sources (waits for a run already
+    in progress in this process to finish first)
+
+    Args:
+        plan:       Units to ingest (default: build_ingest_plan()). Worker
+                    processes pass their shard here.
+        host_share: Fraction of each ATS host budget this run may use —
+                    N sharded workers each get 1/N so the combined rate
+                    stays within the configured per-host limits.
+
+    Returns the run summary:
+        {"run_id", "started_at", "finished_at", "duration_s", "sources": [per-board rows],
+         "lifecycle": {"closed_stale", "promoted", "archived"}}
+    """
+    async with run_lock():
+        return await _run_ingest(plan, host_share)
+
+
+async def _run_ingest(plan: list[dict] | None, host_share: float) -> dict:
+    started_at = datetime.utcnow()
+    started = time.perf_counter()
+    run_id = f"{started_at:%Y%m%dT%H%M%S}-{uuid.uuid4().hex[:6]}"
+    current_run_id.set(run_id)
+
     print("=" * 70)
     print("🚀 STARTING WORLDWIDE REMOTE JOB INGESTION")
     print("=" * 70)
-    
-    gh_orgs = get_env_list("GH_ORGS")
-    lever_orgs = get_env_list("LEVER_ORGS")
-    ashby_orgs = get_env_list("ASHBY_ORGS")
-    
-    # Enable/disable remote job sources
-    enable_remotive = os.getenv("ENABLE_REMOTIVE", "true").lower() == "true"
-    enable_arbeitnow = os.getenv("ENABLE_ARBEITNOW", "true").lower() == "true"
-    enable_remoteok = os.getenv("ENABLE_REMOTEOK", "true").lower() == "true"
-    enable_landingjobs = os.getenv("ENABLE_LANDINGJOBS", "true").lower() == "true"
-    enable_europeremotely = os.getenv("ENABLE_EUROPEREMOTELY", "true").lower() == "true"
-    enable_remoteafrica = os.getenv("ENABLE_REMOTEAFRICA", "true").lower() == "true"
-    enable_himalayas = os.getenv("ENABLE_HIMALAYAS", "true").lower() == "true"
+
+    plan = build_ingest_plan() if plan is None else plan
 
     tasks = []
-    
-    # Company ATS scrapers
-    if gh_orgs:
-        tasks.append(ingest_source(gh_orgs, fetch_greenhouse_org, "Greenhouse"))
-    if lever_orgs:
-        tasks.append(ingest_source(lever_orgs, fetch_lever_org, "Lever"))
-    if ashby_orgs:
-        tasks.append(ingest_source(ashby_orgs, fetch_ashby_org, "Ashby"))
-    
-    # Remote job board APIs
-    if enable_remotive:
-        tasks.append(ingest_api_source(fetch_remotive_jobs, "Remotive", 168))
-    
-    if enable_arbeitnow:
-        tasks.append(ingest_api_source(fetch_arbeitnow_jobs, "Arbeitnow"))
+    orgs_by_label: dict[str, list[str]] = {}
+    for unit in plan:
+        if unit["org"] is not None:
+            orgs_by_label.setdefault(unit["label"], []).append(unit["org"])
+        else:
+            _, fetcher, args = API_SOURCES[unit["label"]]
+            tasks.append(ingest_api_source(fetcher, unit["label"], *args))
 
-    if enable_remoteok:
-        tasks.append(ingest_api_source(fetch_remoteok_jobs, "RemoteOK", 168))
-    
-    if enable_landingjobs:
-        tasks.append(ingest_api_source(fetch_landingjobs, "LandingJobs"))
-    
-    if enable_europeremotely:
-        tasks.append(ingest_api_source(fetch_europeremotely_jobs, "EuropeRemotely"))
-    
-    if enable_remoteafrica:
-        tasks.append(ingest_api_source(fetch_remoteafrica_jobs, "RemoteAfrica"))
+    for label, orgs in orgs_by_label.items():
+        fetcher = ORG_SOURCES[label][1]
+        tasks.append(ingest_source(orgs, fetcher, label, host_concurrency(label, share=host_share)))
+
+    summary = {"run_id": run_id, "started_at": started_at.isoformat(), "sources": []}
 
-    if enable_himalayas:
-        tasks.append(ingest_api_source(fetch_himalayas_jobs, "Himalayas"))
-    
     if tasks:
-        await asyncio.gather(*tasks)
-        
+        # Stored ETag/Last-Modified/payload hashes + feed cursors
+        await writer.run(_load_run_state)
+        # Per-host request budgets, scaled to this worker's share
+        reset_host_limiters(host_share)
+
+        # One pooled client per source for the whole run, closed at the end
+        async with ingest_session():
+            for rows in await asyncio.gather(*tasks):
+                summary["sources"].extend(rows)
+        summary["finished_at"] = datetime.utcnow().isoformat()
+        summary["duration_s"] = round(time.perf_counter() - started, 2)
+
+        # Change stats → next run time per source (adaptive polling),
+        # breaker state changes
+        await writer.run(_record_run, summary["sources"])
+
+        # Lifecycle after the schedule update: stale windows need this
+        # run's statuses (a failed source's jobs are never judged stale)
+        summary["lifecycle"] = await writer.run(_run_lifecycle)
+
+        # Rejects are buffered during the run — one batched write here
+        dlq.flush()
+
         # ⭐ NEW: Show DLQ stats at end
         print("\n" + "=" * 70)
         print("✅ WORLDWIDE REMOTE JOB INGESTION COMPLETE")
@@ -234,9 +569,44 @@ async def run_ingest_once():
             print(f"\n📊 Data Quality (Last 24 hours):")
             for error_type, count in dlq_stats.items():
                 print(f"  - {error_type}: {count} records")
+
+        if DETAIL_FETCH:
+            summary["detail_cache"] = detail_cache.snapshot()
+            c = summary["detail_cache"]
+            print(
+                f"\n🗂️  Detail cache: hits={c['hits']} revalidated={c['revalidated']} "
+                f"misses={c['misses']} evicted={c['evicted']} "
+                f"({c['entries']} pages, {c['size_mb']} MB, hit rate {c['hit_rate']:.0%})"
+            )
+
+        lc = summary["lifecycle"]
+        print(
+            f"\n🔒 Lifecycle: {sum(r.get('closed', 0) for r in summary['sources'])} closed (missing), "
+            f"{lc['closed_stale']} closed (stale), {lc['promoted']} duplicates promoted, "
+            f"{lc['archived']} archived"
+        )
+
+        _print_run_summary(summary)
     else:
         print("⚠️  No sources configured. Check your .env file.")
 
+    return summary
+
+
+async def run_due_ingest() -> dict | None:
+    """
+    Scheduler tick: ingest only the sources whose adaptive interval has
+    elapsed (app/ingest/schedule.py). Returns None when nothing is due.
+
+    The due plan is computed under the run lock, so a tick that waited
+    for another run doesn't re-fetch the boards that run just did.
+    """
+    async with run_lock():
+        plan = await writer.run(_due_plan, build_ingest_plan())
+        if not plan:
+            return None
+        return await _run_ingest(plan, 1.0)
+
 
 if __name__ == "__main__":
     asyncio.run(run_ingest_once())
\ No newline at end of file
@@ -0,0 +1,247 @@
+"""
+Bronze replay
+=============
+
+Rebuilds the jobs table from Bronze segments — no re-scrape.
+
+WHY:
+- Disaster recovery: the Bronze docstring always promised "can rebuild
+  database from Bronze", but nothing did it.
+- Re-filtering: after a location_filter rule change, re-run
+  filter_worldwide_jobs over history in minutes instead of waiting for
+  (or hammering) every board again. Live rows whose stored copy the new
+  rules reject are closed ("filtered", lifecycle.close_filtered), so a
+  stricter rule tightens the board too.
+
+How it works:
+- The Bronze manifest lists segments for the date range (and sources).
+- Segments are grouped by source and spread across a process pool; each
+  worker reads its sources' segments oldest → newest, so the newest copy
+  of a posting wins.
+- Each source: collapse to the newest copy per posting (postings with
+  no URL have no dedupe key and are skipped) →
+  filter_worldwide_jobs (no DLQ writes — the original run
+  already logged its rejects) → JobCreate validation → one bulk upsert
+  (crud.bulk_upsert_jobs, same merge rules and content hashes as ingest).
+- Progress and throughput are printed as sources finish.
+
+Loads straight into `jobs`: the upsert is idempotent, so replaying over a
+live table is safe, and a table swap would orphan the foreign keys from
+applications / user_job_scores.
+
+Replayed postings count as seen when their segment was fetched, not
+now (bulk_upsert_jobs replay mode): last_seen_at never moves backwards,
+and a job closed since then (app/core/lifecycle.py) stays closed — only
+a copy fetched after closed_at reopens it.
+
+Usage:
+    python -m app.replay --since 2026-01-01                   # everything since
+    python -m app.replay --since 2026-03-01 --until 2026-03-08 -w 4
+    python -m app.replay --source remotive --dry-run          # filter only, no writes
+"""
+
+import os
+import time
+import argparse
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime, timezone
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+REPLAY_WORKERS = int(os.getenv("INGEST_WORKERS", str(max(1, (os.cpu_count() or 2) - 1))))
+
+
+def _fetched_at(segment: dict) -> datetime:
+    """Segment ingested_at (Bronze writes local time) as naive UTC, like the jobs table."""
+    return datetime.fromisoformat(segment["ingested_at"]).astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def _replay_source(source: str, segments: list[dict], base_path: str, dry_run: bool) -> dict:
+    """Worker entry point — replays one source's segments in order."""
+    from pydantic import ValidationError
+    from app.core import crud, schemas, lifecycle
+    from app.core.db import SessionLocal
+    from app.ingest.storage import BronzeStorage
+    from app.orchestrator import filter_worldwide_jobs
+
+    started = time.perf_counter()
+    bronze = BronzeStorage(base_path=base_path)
+
+    # Oldest → newest, keyed like the jobs table: the newest copy of each
+    # posting wins and history collapses before any filtering work
+    latest: dict[str, dict] = {}
+    seen_at: dict[int, datetime] = {}  # id(record) → when its segment was fetched
+    records = keyless = 0
+    for segment in segments:
+        fetched_at = _fetched_at(segment)
+        for record in bronze.read_segment(segment)["data"]:
+            record.setdefault("source", source)
+            key = crud.job_dedupe_key(
+                record.get("title") or "", record.get("company") or "", record.get("canonical_url"),
+                record.get("source"), record.get("apply_url"),
+            )
+            records += 1
+            if key is None:
+                # No URL → no identity: it can't be matched to its row, and
+                # inserting it again would break replay idempotency
+                keyless += 1
+                continue
+            latest[key] = record
+            seen_at[id(record)] = fetched_at
+
+    kept = filter_worldwide_jobs(list(latest.values()), source, log_rejects=False)
+
+    # Postings the current rules reject → key + content hash to close
+    kept_ids = {id(record) for record in kept}
+    rejected: dict[str, str] = {}
+    for key, record in latest.items():
+        if id(record) in kept_ids:
+            continue
+        try:
+            rejected[key] = crud.job_content_hash(schemas.JobCreate(**record))
+        except ValidationError:
+            pass
+
+    payloads, fetched, invalid = [], [], 0
+    for record in kept:
+        try:
+            payload = schemas.JobCreate(**record)
+        except ValidationError:
+            invalid += 1
+            continue
+        payloads.append(payload)
+        fetched.append(seen_at[id(record)])
+
+    counts = {"inserted": 0, "updated": 0, "unchanged": 0}
+    closed = 0
+    if (payloads or rejected) and not dry_run:
+        with SessionLocal() as db:
+            if payloads:
+                counts = crud.bulk_upsert_jobs(db, payloads, seen_at=fetched)
+            if rejected:
+                closed = lifecycle.close_filtered(db, rejected)
+                lifecycle.promote_duplicates(db)
+            db.commit()
+
+    return {
+        "source": source,
+        "segments": len(segments),
+        "records": records,
+        "postings": len(latest),
+        "keyless": keyless,
+        "kept": len(kept),
+        "rejected": len(rejected),
+        "invalid": invalid,
+        **counts,
+        "closed": closed,
+        "duration_s": round(time.perf_counter() - started, 2),
+    }
+
+
+def replay(
+    since: datetime | None = None,
+    until: datetime | None = None,
+    sources: list[str] | None = None,
+    workers: int = REPLAY_WORKERS,
+    dry_run: bool = False,
+    base_path: str = "data/bronze",
+) -> dict:
+    """
+    Replay Bronze segments ingested in [since, until) into jobs.
+
+    Returns {"sources": [per-source rows], "records", "kept", "rejected",
+    "inserted", "updated", "unchanged", "closed", "duration_s"}.
+    """
+    from app.ingest.storage import BronzeStorage
+
+    started = time.perf_counter()
+    bronze = BronzeStorage(base_path=base_path)
+
+    by_source: dict[str, list[dict]] = {}
+    for segment in bronze.list_segments(since=since, until=until):
+        if sources and segment["source"] not in sources:
+            continue
+        by_source.setdefault(segment["source"], []).append(segment)
+
+    total_records = sum(s["record_count"] for segs in by_source.values() for s in segs)
+    print(
+        f"⏪ Replay: {sum(len(s) for s in by_source.values())} segments, "
+        f"{total_records} records, {len(by_source)} sources, {workers} workers"
+        + (" (dry run)" if dry_run else "")
+    )
+
+    rows: list[dict] = []
+    done_records = 0
+
+    def report(row: dict):
+        nonlocal done_records
+        rows.append(row)
+        done_records += row["records"]
+        elapsed = time.perf_counter() - started
+        print(
+            f"  [{len(rows)}/{len(by_source)}] {row['source']:<40} "
+            f"records={row['records']} kept={row['kept']} rejected={row['rejected']} "
+            f"new={row['inserted']} upd={row['updated']} same={row['unchanged']} closed={row['closed']}  "
+            f"({done_records / max(elapsed, 1e-9):.0f} rec/s)"
+        )
+
+    # Biggest sources first so one large board doesn't finish last alone
+    work = sorted(by_source.items(), key=lambda kv: -sum(s["record_count"] for s in kv[1]))
+    if workers <= 1 or len(work) <= 1:
+        for source, segments in work:
+            report(_replay_source(source, segments, base_path, dry_run))
+    else:
+        # spawn: never fork a process holding DB connections
+        ctx = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=workers, mp_context=ctx) as pool:
+            futures = {
+                pool.submit(_replay_source, source, segments, base_path, dry_run): source
+                for source, segments in work
+            }
+            for future in as_completed(futures):
+                try:
+                    report(future.result())
+                except Exception as e:
+                    print(f"❌ {futures[future]}: {type(e).__name__}: {e}")
+
+    duration = time.perf_counter() - started
+    totals = {
+        k: sum(r[k] for r in rows)
+        for k in ("records", "kept", "rejected", "inserted", "updated", "unchanged", "closed")
+    }
+    print(
+        f"✅ Replay complete in {duration:.1f}s — {totals['records']} records "
+        f"({totals['records'] / max(duration, 1e-9):.0f} rec/s), {totals['kept']} kept, "
+        f"{totals['inserted']} new, {totals['updated']} updated, {totals['unchanged']} unchanged, "
+        f"{totals['closed']} closed of {totals['rejected']} rejected"
+    )
+    return {"sources": rows, **totals, "duration_s": round(duration, 2)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild jobs from Bronze segments")
+    parser.add_argument("--since", type=datetime.fromisoformat, help="ingested at or after (YYYY-MM-DD[THH:MM])")
+    parser.add_argument("--until", type=datetime.fromisoformat, help="ingested before (YYYY-MM-DD[THH:MM])")
+    parser.add_argument("--source", action="append", dest="sources",
+                        help="only this source (repeatable), e.g. greenhouse_stripe")
+    parser.add_argument("-w", "--workers", type=int, default=REPLAY_WORKERS,
+                        help="worker processes (default: INGEST_WORKERS or cpu_count-1)")
+    parser.add_argument("--dry-run", action="store_true", help="filter and validate only, no DB writes")
+    parser.add_argument("--bronze-path", default="data/bronze")
+    args = parser.parse_args()
+
+    replay(
+        since=args.since,
+        until=args.until,
+        sources=args.sources,
+        workers=args.workers,
+        dry_run=args.dry_run,
+        base_path=args.bronze_path,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -185,6 +185,7 @@ def test_job_alert(
 ):
     """Test job alert email with actual matching jobs"""
     from app.core.models import Job
+    from app.core.crud import live_jobs_clause
     from sqlalchemy import select
     from app.services.matching.scorer import calculate_match_score
     from app.services.auth.models import UserProfile
@@ -199,7 +200,7 @@ def test_job_alert(
     
     # Get recent jobs
     jobs = db.scalars(
-        select(Job).where(Job.is_active == True).limit(20)
+        select(Job).where(live_jobs_clause()).order_by(Job.scraped_at.desc()).limit(20)
     ).all()
     
     # Score and filter jobs
@@ -4,6 +4,7 @@ from sqlalchemy import select, and_
 from app.services.auth.models import User, Application, EmailPreferences
 from app.services.profile.models import UserProfile 
 from app.core.models import Job
+from app.core.crud import live_jobs_clause
 from app.services.email.service import send_followup_reminder, send_weekly_digest, send_job_digest
 from app.services.matching.scorer import calculate_match_score
 
@@ -89,9 +90,9 @@ def should_send_alert(prefs: EmailPreferences) -> bool:
 
 def get_matching_jobs_for_user(profile: UserProfile, min_match_score: int, remote_only: bool, db: Session):
     """Get jobs matching user's profile and preferences"""
-    # Get recent active jobs
+    # Get recent active jobs (open, canonical copies only)
     jobs = db.scalars(
-        select(Job).where(Job.is_active == True).limit(50)
+        select(Job).where(live_jobs_clause()).order_by(Job.scraped_at.desc()).limit(50)
     ).all()
     
     # Score and filter jobs
@@ -31,6 +31,8 @@ from sqlalchemy import text
 from sqlalchemy.orm import Session
 
 from app.core import crud
+from app.core.locations import location_filter_target
+from app.core.skills import extract_skills_many
 from app.services.profile.models import UserProfile
 from .scorer import keyword_prescore, _fallback_score, is_tech_role
 
@@ -135,6 +137,7 @@ def _bootstrap_scores(db: Session, user_id: int, profile_dict: Dict, **filters):
         SELECT id, title, company, location, description_text
         FROM jobs
         WHERE scraped_at >= NOW() - INTERVAL '{days} days'
+          AND is_active AND canonical_job_id IS NULL
         ORDER BY scraped_at DESC
         LIMIT 2000
     """)).fetchall()
@@ -144,8 +147,11 @@ def _bootstrap_scores(db: Session, user_id: int, profile_dict: Dict, **filters):
 
     logger.info(f"[Matcher] Bootstrapping scores for user {user_id} — {len(rows)} jobs")
 
+    # One taxonomy pass per description, shared by both scorers below
+    job_skills = extract_skills_many(row.description_text for row in rows)
+
     batch = []
-    for row in rows:
+    for row, skills in zip(rows, job_skills):
         job_id, title, company, location, description = row
         job_dict = {
             "id": job_id,
@@ -154,6 +160,7 @@ def _bootstrap_scores(db: Session, user_id: int, profile_dict: Dict, **filters):
             "location": location or "",
             "description": description or "",
             "description_text": description or "",
+            "skills": skills,
         }
 
         score = keyword_prescore(job_dict, profile_dict)
@@ -209,6 +216,8 @@ def _serve_from_db(
         "ujs.match_score >= :min_score",
         f"ujs.match_score <= {_MAX_VALID_SCORE}",
         f"j.scraped_at >= NOW() - INTERVAL '{days} days'",
+        # Live rows only: open, and the canonical copy of near-duplicates
+        "j.is_active AND j.canonical_job_id IS NULL",
     ]
     params: Dict[str, Any] = {
         "user_id": user_id,
@@ -228,8 +237,17 @@ def _serve_from_db(
         params["skill"] = f"%{skill.lower()}%"
 
     if location:
-        where_clauses.append("LOWER(j.location) LIKE :location")
-        params["location"] = f"%{location.lower()}%"
+        # Indexed lookup on the structured location columns when possible
+        target = location_filter_target(location)
+        if target is None:
+            where_clauses.append("LOWER(j.location) LIKE :location")
+            params["location"] = f"%{location.lower()}%"
+        elif target[0] == "remote_scope":
+            where_clauses.append("j.remote_scope = ANY(:location)")
+            params["location"] = target[1]
+        else:
+            where_clauses.append(f"j.{target[0]} @> :location")
+            params["location"] = target[1]
 
     if remote is not None:
         where_clauses.append("j.remote_flag = :remote")
@@ -288,7 +306,10 @@ def _serve_from_db(
 
     # Total jobs in DB for "Showing X of Y" display
     total_in_db = db.execute(
-        text(f"SELECT COUNT(*) FROM jobs WHERE scraped_at >= NOW() - INTERVAL '{days} days'")
+        text(f"""
+            SELECT COUNT(*) FROM jobs
+            WHERE scraped_at >= NOW() - INTERVAL '{days} days' AND is_active AND canonical_job_id IS NULL
+        """)
     ).scalar() or 0
 
     return {
@@ -22,6 +22,8 @@ import logging
 from typing import List, Dict, Any
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
+from app.core.skills import extract_skills, canonical_skills
+
 logger = logging.getLogger(__name__)
 
 _groq_client = None
@@ -96,21 +98,6 @@ _NON_TECH_OVERRIDES = [
     r'\bdata\s+insights\b',
 ]
 
-# Skills for keyword matching — git removed (too universal, inflates all scores)
-_TECH_SKILLS = [
-    "python", "typescript", "javascript", "react", "node.js", "next.js",
-    "postgresql", "mongodb", "redis", "aws", "gcp", "azure", "docker",
-    "kubernetes", "fastapi", "django", "flask", "kafka", "apache kafka",
-    "airflow", "apache airflow", "dbt", "spark", "apache spark",
-    "sql", "pandas", "numpy", "pytorch", "tensorflow", "scikit-learn",
-    "rust", "golang", "java", "c++", "graphql", "grpc",
-    "terraform", "ansible", "ci/cd", "github actions", "jenkins",
-    "data engineering", "data pipeline", "etl", "elt",
-    "elasticsearch", "redis", "celery", "rabbitmq",
-    "next.js", "tailwind", "tailwindcss", "vue", "angular", "svelte",
-]
-
-
 # ── Helper: extract user languages ────────────────────────────────────
 
 def _user_languages(user_profile: Dict) -> set:
@@ -130,15 +117,24 @@ def _user_languages(user_profile: Dict) -> set:
 
 
 def _user_all_skills(user_profile: Dict) -> set:
-    """Skills + certifications merged into one set."""
-    skills = {s.lower().strip() for s in (user_profile.get("skills") or [])}
-    certs = {c.lower().strip() for c in (user_profile.get("certifications") or [])}
-    # Extract cert keywords (e.g. "AWS Certified Solutions Architect" → "aws")
-    for cert in list(certs):
-        for word in cert.split():
-            if len(word) > 2:
-                skills.add(word.lower())
-    return skills | certs
+    """
+    Skills + certifications as canonical taxonomy skills
+    (e.g. "AWS Certified Solutions Architect" → "aws").
+    """
+    names = list(user_profile.get("skills") or []) + list(user_profile.get("certifications") or [])
+    return canonical_skills(names)
+
+
+def _job_skills(job: Dict) -> set:
+    """
+    Canonical skills of a job — the extracted `skills` if the caller
+    already has them (ingest / extract_skills_many), else one pass over
+    the description. Same taxonomy as jobs.skills (app/core/skills.py).
+    """
+    skills = job.get("skills")
+    if skills is None:
+        skills = extract_skills(job.get("description", "") or job.get("description_text", "") or "")
+    return set(skills)
 
 
 # ── is_tech_role ──────────────────────────────────────────────────────
@@ -214,8 +210,7 @@ def keyword_prescore(job: Dict, user_profile: Dict) -> int:
 
     # Skill overlap (skills + certifications)
     user_skills = _user_all_skills(user_profile)
-    desc_lower = description.lower()
-    job_skills = {s for s in _TECH_SKILLS if s in desc_lower}
+    job_skills = _job_skills(job)
 
     if not job_skills:
         return 30  # Tech role but no recognizable skills in description
@@ -413,8 +408,7 @@ def score_jobs_batch(jobs: List[Dict], user_profile: Dict, max_workers: int = 8)
 def _fallback_score(job: Dict, user_profile: Dict) -> Dict[str, Any]:
     """Keyword-only fallback when AI unavailable. Conservative."""
     user_skills = _user_all_skills(user_profile)
-    desc = (job.get("description", "") or job.get("description_text", "") or "").lower()
-    job_skills = {s for s in _TECH_SKILLS if s in desc}
+    job_skills = _job_skills(job)
     matched = list(job_skills.intersection(user_skills))
     score = min(int((len(matched) / max(len(job_skills), 1)) * 65), 65) if job_skills else 15
     return {
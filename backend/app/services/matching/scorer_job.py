@@ -5,6 +5,13 @@ Scheduled pre-compute job. Runs every 6 hours via APScheduler.
 Uses the same is_tech_role() whitelist logic as scorer.py.
 Non-tech roles get score=8 instantly without an AI call.
 This prevents wasting Groq tokens on Art Directors and Fraud Analysts.
+
+Picks up new jobs AND jobs whose content changed (jobs.content_changed_at,
+set by ingest only when a posting's content hash moves). A changed job is
+re-scored for users whose score predates the change; unchanged jobs are
+never re-scored. Closed jobs and near-duplicates (jobs.canonical_job_id
+set) are skipped — only live canonical copies are shown, so only they are
+worth an AI call.
 """
 
 import os
@@ -94,16 +101,18 @@ def run_scoring_job():
     try:
         cutoff = datetime.utcnow() - timedelta(hours=25)
         new_jobs = db.execute(text("""
-            SELECT id, title, company, location, description_text
-            FROM jobs WHERE scraped_at >= :cutoff
-            ORDER BY scraped_at DESC LIMIT 300
+            SELECT id, title, company, location, description_text, content_changed_at
+            FROM jobs
+            WHERE (scraped_at >= :cutoff OR content_changed_at >= :cutoff)
+              AND is_active AND canonical_job_id IS NULL
+            ORDER BY COALESCE(content_changed_at, scraped_at) DESC LIMIT 300
         """), {"cutoff": cutoff}).fetchall()
 
         if not new_jobs:
-            logger.info("[Scorer Job] No new jobs in last 25h — skipping")
+            logger.info("[Scorer Job] No new or changed jobs in last 25h — skipping")
             return
 
-        logger.info(f"[Scorer Job] {len(new_jobs)} new jobs to score")
+        logger.info(f"[Scorer Job] {len(new_jobs)} new/changed jobs to score")
 
         active_users = db.execute(text("""
             SELECT u.id, up.skills, up.experience, up.preferences
@@ -133,7 +142,20 @@ def run_scoring_job():
             ), {"uid": user_id}).fetchall()
             scored_ids = {row[0] for row in existing}
 
-            to_score = [j for j in new_jobs if j[0] not in scored_ids]
+            # Scores computed before the posting's content last changed.
+            # Resume-tailoring scores are never overwritten (see the upsert
+            # below), so they'd stay stale and cost an LLM call every run.
+            stale = db.execute(text("""
+                SELECT ujs.job_id
+                FROM user_job_scores ujs JOIN jobs j ON j.id = ujs.job_id
+                WHERE ujs.user_id = :uid
+                  AND j.content_changed_at >= :cutoff
+                  AND ujs.computed_at < j.content_changed_at
+                  AND ujs.reason IS DISTINCT FROM 'Scored from resume tailoring'
+            """), {"uid": user_id, "cutoff": cutoff}).fetchall()
+            stale_ids = {row[0] for row in stale}
+
+            to_score = [j for j in new_jobs if j[0] not in scored_ids or j[0] in stale_ids]
             if not to_score:
                 total_skipped += len(new_jobs)
                 continue
@@ -149,7 +171,7 @@ def run_scoring_job():
             has_experience = len(user_experience) >= 2
 
             for job_row in to_score:
-                job_id, title, company, location, description = job_row
+                job_id, title, company, location, description, _ = job_row
                 full_text = f"{title} {description or ''}"
 
                 try:
@@ -181,6 +203,7 @@ def run_scoring_job():
                             missing_skills=EXCLUDED.missing_skills,
                             reason=EXCLUDED.reason,
                             computed_at=NOW()
+                        WHERE user_job_scores.reason IS DISTINCT FROM 'Scored from resume tailoring'
                     """), {
                         "uid": user_id, "jid": job_id,
                         "score": result["match_score"],
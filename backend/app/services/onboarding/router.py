@@ -191,6 +191,7 @@ def _ai_score_jobs_for_new_user(user_id: int):
             SELECT id, title, company, location, description_text
             FROM jobs
             WHERE scraped_at >= NOW() - INTERVAL '30 days'
+              AND is_active AND canonical_job_id IS NULL
             ORDER BY scraped_at DESC
             LIMIT 500
         """)).fetchall()
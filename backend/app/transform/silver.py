@@ -21,7 +21,9 @@ import pandas as pd
 from pathlib import Path
 from datetime import datetime
 from typing import List, Dict, Any
-from app.core.translate import translate_to_english, is_english
+from app.core.translate import translate_many, is_english_many
+from app.core.translation_cache import translation_cache
+from app.core.near_duplicates import find_near_duplicates
 
 
 class SilverLayer:
@@ -73,18 +75,25 @@ class SilverLayer:
 
         # ── Translate non-English descriptions 
         # WHY: Jobs from European/African sources (EuropeRemotely, LandingJobs,
-        # Arbeitnow, Himalayas) often have descriptions in German, French, Portuguese etc. Translate only what needs it — English jobs are skipped by fast keyword heuristic (no API call).
+        # Arbeitnow, Himalayas) often have descriptions in German, French, Portuguese etc. Translate only what needs it — English jobs are skipped by the bundled language detector (no API call).
 
         if 'description_text' in df.columns:
-            mask = ~df['description_text'].fillna('').apply(is_english)
+            # One batched language-detection pass over the column
+            mask = ~pd.Series(
+                is_english_many(df['description_text'].fillna('').tolist()), index=df.index
+            )
             non_english_count = mask.sum()
             if non_english_count > 0:
                 print(f"  🌍 Translating {non_english_count} non-English descriptions...")
-                df.loc[mask, 'description_text'] = (
-                    df.loc[mask, 'description_text']
-                    .apply(translate_to_english)
+                # One batched cache lookup; only texts never translated before hit the LLM
+                df.loc[mask, 'description_text'] = translate_many(
+                    df.loc[mask, 'description_text'].tolist(), assume_non_english=True
+                )
+                c = translation_cache.snapshot()
+                print(
+                    f"  ✅ Translation complete — cache hits={c['hits']} misses={c['misses']} "
+                    f"(hit rate {c['hit_rate']:.0%}, ~{c['tokens_saved']} tokens saved)"
                 )
-                print(f"  ✅ Translation complete")
 
         # Deduplicate
         # WHY: Greenhouse + Lever might list same job. Duplicates inflate metrics.
@@ -96,6 +105,19 @@ class SilverLayer:
             if before != after:
                 print(f"  🔄 Deduplicated: {before} → {after} records")
 
+        # Near-duplicates
+        # WHY: the exact check misses "Sr. Backend Engineer" @ "Acme Inc." vs
+        # "Senior Backend Engineer" @ "Acme" — MinHash over title/company/
+        # description catches them. The first (earliest) copy is kept.
+        if 'title' in df.columns and 'company' in df.columns:
+            desc = df['description_text'] if 'description_text' in df.columns else pd.Series('', index=df.index)
+            canonical = find_near_duplicates(zip(df['title'], df['company'], desc))
+            keep = [c is None for c in canonical]
+            if not all(keep):
+                before = len(df)
+                df = df[keep]
+                print(f"  🧬 Near-duplicates dropped: {before} → {len(df)} records")
+
         # Add Silver metadata (data lineage)
         # WHY: Know WHEN data was processed, not just when it was ingested
         df['silver_processed_at'] = datetime.now()
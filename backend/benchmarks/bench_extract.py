@@ -0,0 +1,127 @@
+"""
+Benchmark: app.ingest.extract vs the old BeautifulSoup get_text() path.
+
+Runs both extractors over recorded detail pages and reports time, peak
+memory and output size per page.
+
+Record pages first (saved as <dir>/<n>.html, URL in <dir>/urls.txt):
+    python -m benchmarks.bench_extract --record https://boards.greenhouse.io/acme/jobs/123 ...
+
+Then benchmark:
+    python -m benchmarks.bench_extract                 # default dir: data/bench/pages
+    python -m benchmarks.bench_extract --dir my_pages --repeat 20
+"""
+
+import sys
+import time
+import argparse
+import tracemalloc
+from pathlib import Path
+
+import httpx
+from bs4 import BeautifulSoup
+
+from app.ingest.extract import extract_main_text
+
+DEFAULT_DIR = "data/bench/pages"
+
+
+def legacy_extract(html: str, url: str | None = None) -> str:
+    """What detail.fetch_job_text did before app.ingest.extract."""
+    return BeautifulSoup(html, "lxml").get_text(" ", strip=True)[:20000]
+
+
+def new_extract(html: str, url: str | None = None) -> str:
+    return extract_main_text(html, url=url)
+
+
+def record(urls: list[str], out_dir: Path):
+    out_dir.mkdir(parents=True, exist_ok=True)
+    index = out_dir / "urls.txt"
+    existing = index.read_text().splitlines() if index.exists() else []
+    with httpx.Client(follow_redirects=True, timeout=30, headers={"User-Agent": "Mozilla/5.0"}) as client:
+        for url in urls:
+            r = client.get(url)
+            if not r.is_success:
+                print(f"⚠️  {url}: HTTP {r.status_code}, skipped")
+                continue
+            n = len(existing)
+            (out_dir / f"{n}.html").write_text(r.text, encoding="utf-8")
+            existing.append(url)
+            print(f"💾 {n}.html ← {url} ({len(r.text)} chars)")
+    index.write_text("\n".join(existing) + "\n")
+
+
+def load_pages(out_dir: Path) -> list[tuple[str | None, str]]:
+    index = out_dir / "urls.txt"
+    urls = index.read_text().splitlines() if index.exists() else []
+    pages = []
+    for path in sorted(out_dir.glob("*.html"), key=lambda p: int(p.stem) if p.stem.isdigit() else 0):
+        n = int(path.stem) if path.stem.isdigit() else -1
+        url = urls[n] if 0 <= n < len(urls) else None
+        pages.append((url, path.read_text(encoding="utf-8", errors="replace")))
+    return pages
+
+
+def measure(fn, pages, repeat: int) -> dict:
+    # Time: best of `repeat` passes over all pages
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for url, html in pages:
+            fn(html, url)
+        best = min(best, time.perf_counter() - start)
+
+    # Memory + output size: one traced pass
+    peak = 0
+    chars = 0
+    for url, html in pages:
+        tracemalloc.start()
+        text = fn(html, url)
+        peak = max(peak, tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+        chars += len(text)
+
+    n = len(pages)
+    return {
+        "ms_per_page": best / n * 1000,
+        "peak_kb": peak / 1024,
+        "avg_chars": chars / n,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark detail-page text extraction")
+    parser.add_argument("--dir", default=DEFAULT_DIR, help=f"recorded pages (default: {DEFAULT_DIR})")
+    parser.add_argument("--repeat", type=int, default=5, help="timing passes (best is reported)")
+    parser.add_argument("--record", nargs="+", metavar="URL", help="fetch and save pages, then exit")
+    args = parser.parse_args()
+
+    out_dir = Path(args.dir)
+    if args.record:
+        record(args.record, out_dir)
+        return
+
+    pages = load_pages(out_dir)
+    if not pages:
+        print(f"No recorded pages in {out_dir}. Record some with --record URL ...")
+        sys.exit(1)
+
+    print(f"📄 {len(pages)} pages, best of {args.repeat} passes\n")
+    print(f"{'extractor':<12} {'ms/page':>10} {'peak KB':>10} {'avg chars':>10}")
+    results = {}
+    for name, fn in (("bs4", legacy_extract), ("extract", new_extract)):
+        r = measure(fn, pages, args.repeat)
+        results[name] = r
+        print(f"{name:<12} {r['ms_per_page']:>10.2f} {r['peak_kb']:>10.0f} {r['avg_chars']:>10.0f}")
+
+    old, new = results["bs4"], results["extract"]
+    print(
+        f"\n⚡ {old['ms_per_page'] / new['ms_per_page']:.1f}x faster, "
+        f"{old['peak_kb'] / max(new['peak_kb'], 1):.1f}x less peak memory, "
+        f"{1 - new['avg_chars'] / max(old['avg_chars'], 1):.0%} shorter text"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""
+Benchmark: app.core.langid vs the old is_english marker scan.
+
+On a labeled sample (benchmarks/langid_sample.jsonl: {"lang", "text"}) it
+reports, for the "needs translation?" decision (positive = not English):
+- false positives: English text that would have been sent to the LLM
+- misses: non-English text that would have stayed untranslated
+- precision / recall of "needs translation"
+for the old marker scan, the best-guess rule (lang != "en" with confidence
+>= threshold) and the shipped rule (1 - P(en) >= threshold), then sweeps
+the threshold, prints the detector's language accuracy and per-row time
+(single vs batch).
+
+    python -m benchmarks.bench_langid
+    python -m benchmarks.bench_langid --sample my_labeled.jsonl --repeat 20
+    python -m benchmarks.bench_langid --bronze data/bronze --export 200 > to_label.jsonl
+
+--export writes a random sample of Bronze descriptions with the detector's
+guess as "lang" — fix the labels by hand, then pass the file as --sample
+and pick TRANSLATE_MIN_CONFIDENCE from the sweep.
+"""
+
+import sys
+import json
+import time
+import random
+import argparse
+from pathlib import Path
+
+from app.core.langid import detect, detect_many, probability_many
+from app.core.translate import TRANSLATE_MIN_CONFIDENCE, is_english_many
+
+SWEEP = (0.5, 0.6, 0.7, 0.8, 0.9, 0.95, 0.99)
+
+DEFAULT_SAMPLE = Path(__file__).with_name("langid_sample.jsonl")
+
+_OLD_MARKERS = [
+    "und ", "der ", "die ", "das ", "ist ", "ein ", "eine ",
+    "für ", "mit ", "von ", "auf ", "bei ", "wir ", "sie ",
+    "les ", "des ", "est ", "que ", "une ", "dans ", "pour ",
+    "para ", "com ", "que ", "uma ", "não ", "são ", "pelo ",
+    "per ", "del ", "che ", "una ", "non ", "con ", "alla ",
+]
+
+
+def legacy_is_english(text: str) -> bool:
+    """What translate.is_english did before app.core.langid."""
+    if not text or len(text.strip()) < 20:
+        return True
+    sample = text[:500].lower()
+    return not any(marker in sample for marker in _OLD_MARKERS)
+
+
+def best_guess_is_english(texts: list[str], threshold: float = TRANSLATE_MIN_CONFIDENCE) -> list[bool]:
+    """The first langid rule: English unless the best guess is confident."""
+    return [lang in (None, "en") or confidence < threshold for lang, confidence in detect_many(texts)]
+
+
+def p_en_is_english(texts: list[str], threshold: float) -> list[bool]:
+    """translate.is_english_many at a given TRANSLATE_MIN_CONFIDENCE."""
+    return [p is None or 1.0 - p < threshold for p in probability_many(texts, "en")]
+
+
+def scores(rows: list[dict], english: list[bool]) -> tuple[int, int, float, float]:
+    """(false positives, misses, precision, recall) of "needs translation"."""
+    tp = sum(1 for r, e in zip(rows, english) if r["lang"] != "en" and not e)
+    fp = sum(1 for r, e in zip(rows, english) if r["lang"] == "en" and not e)
+    miss = sum(1 for r, e in zip(rows, english) if r["lang"] != "en" and e)
+    return fp, miss, tp / max(tp + fp, 1), tp / max(tp + miss, 1)
+
+
+def export_bronze(bronze: str, n: int):
+    from app.ingest.storage import BronzeStorage
+    texts = []
+    for package in BronzeStorage(base_path=bronze).iter_packages():
+        texts.extend(r.get("description_text") or "" for r in package["data"])
+    texts = [t for t in texts if len(t.strip()) >= 20]
+    for text in random.sample(texts, min(n, len(texts))):
+        lang, confidence = detect(text)
+        print(json.dumps({"lang": lang, "confidence": round(confidence, 3), "text": text[:1000]}, ensure_ascii=False))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark language detection for translation")
+    parser.add_argument("--sample", default=str(DEFAULT_SAMPLE), help="labeled JSONL {lang, text}")
+    parser.add_argument("--repeat", type=int, default=5, help="timing passes (best is reported)")
+    parser.add_argument("--bronze", metavar="DIR", help="with --export: sample descriptions from Bronze")
+    parser.add_argument("--export", type=int, metavar="N", help="print N Bronze descriptions to label, then exit")
+    args = parser.parse_args()
+
+    if args.export:
+        if not args.bronze:
+            parser.error("--export needs --bronze")
+        export_bronze(args.bronze, args.export)
+        return
+
+    rows = [json.loads(line) for line in Path(args.sample).read_text(encoding="utf-8").splitlines() if line.strip()]
+    if not rows:
+        print(f"No labeled rows in {args.sample}")
+        sys.exit(1)
+    texts = [r["text"] for r in rows]
+
+    print(f"📄 {len(rows)} labeled texts ({sum(r['lang'] == 'en' for r in rows)} English)\n")
+    print(f"threshold {TRANSLATE_MIN_CONFIDENCE} (TRANSLATE_MIN_CONFIDENCE)")
+    print(f"{'detector':<11} {'false pos':>10} {'misses':>8} {'precision':>10} {'recall':>8}")
+    for name, english in (
+        ("markers", [legacy_is_english(t) for t in texts]),
+        ("best guess", best_guess_is_english(texts)),
+        ("1 - P(en)", is_english_many(texts)),
+    ):
+        fp, miss, precision, recall = scores(rows, english)
+        print(f"{name:<11} {fp:>10} {miss:>8} {precision:>10.1%} {recall:>8.1%}")
+
+    print(f"\n{'threshold':<11} {'false pos':>10} {'misses':>8} {'precision':>10} {'recall':>8}   (1 - P(en))")
+    for threshold in SWEEP:
+        fp, miss, precision, recall = scores(rows, p_en_is_english(texts, threshold))
+        print(f"{threshold:<11} {fp:>10} {miss:>8} {precision:>10.1%} {recall:>8.1%}")
+
+    guesses = detect_many(texts)
+    correct = sum(1 for r, (lang, _) in zip(rows, guesses) if lang == r["lang"])
+    print(f"\n🌍 langid accuracy: {correct}/{len(rows)} ({correct / len(rows):.0%})")
+    for r, (lang, confidence) in zip(rows, guesses):
+        if lang != r["lang"]:
+            print(f"   ✗ {r['lang']} → {lang} ({confidence:.2f}): {r['text'][:60]!r}")
+
+    def best(fn):
+        t = float("inf")
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            fn()
+            t = min(t, time.perf_counter() - start)
+        return t / len(texts) * 1e6
+
+    detect_many(texts)  # model load outside the timings
+    print(f"\n{'mode':<10} {'µs/row':>10}")
+    print(f"{'markers':<10} {best(lambda: [legacy_is_english(t) for t in texts]):>10.1f}")
+    print(f"{'single':<10} {best(lambda: [detect(t) for t in texts]):>10.1f}")
+    print(f"{'batch':<10} {best(lambda: detect_many(texts)):>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""
+Benchmark + regression corpus: app.core.location_filter.
+
+1. Checks every case in benchmarks/location_corpus.jsonl against
+   classify_location (accept + rule) and lists where the old substring
+   filter decided differently. Exits 1 on a corpus mismatch.
+2. Times the old per-job is_worldwide_remote loop against classify_many
+   over the same batch.
+
+    python -m benchmarks.bench_location                      # corpus × 2000 jobs
+    python -m benchmarks.bench_location --jobs 50000 --repeat 10
+    python -m benchmarks.bench_location --bronze data/bronze # real postings from Bronze
+    python -m benchmarks.bench_location --check              # corpus only (CI)
+"""
+
+import re
+import sys
+import json
+import time
+import argparse
+from pathlib import Path
+
+from app.core.location_filter import (
+    US_ONLY_KEYWORDS,
+    WORLDWIDE_KEYWORDS,
+    EMEA_KEYWORDS,
+    classify_location,
+    classify_many,
+    clean_location,
+)
+
+CORPUS = Path(__file__).with_name("location_corpus.jsonl")
+
+
+def legacy_is_worldwide_remote(location, description=None) -> bool:
+    """What location_filter.is_worldwide_remote did before the compiled classifier."""
+    if not location:
+        return False
+    location_lower = location.lower()
+    desc_lower = (description or "").lower()
+    for keyword in US_ONLY_KEYWORDS:
+        if keyword in location_lower:
+            return False
+    for keyword in WORLDWIDE_KEYWORDS + EMEA_KEYWORDS + ["remote"]:
+        if keyword in location_lower:
+            return True
+    for pattern in (
+        r"must be (located|based|residing) in (the )?us",
+        r"us work authorization required",
+        r"authorized to work in (the )?us",
+        r"us citizens only",
+        r"only considering us-based",
+    ):
+        if re.search(pattern, desc_lower):
+            return False
+    return True
+
+
+def legacy_filter(jobs: list[dict]) -> list[bool]:
+    return [
+        legacy_is_worldwide_remote(clean_location(j.get("location", "")), j.get("description_text", ""))
+        for j in jobs
+    ]
+
+
+def new_filter(jobs: list[dict]) -> list[bool]:
+    return [d["accept"] for d in classify_many(jobs)]
+
+
+def check_corpus() -> bool:
+    cases = [json.loads(line) for line in CORPUS.read_text(encoding="utf-8").splitlines() if line.strip()]
+    failures = 0
+    changed = []
+    for case in cases:
+        d = classify_location(case["location"], case["description"])
+        if (d["accept"], d["rule"]) != (case["accept"], case["rule"]):
+            failures += 1
+            print(f"❌ {case['location']!r}: expected {case['accept']}/{case['rule']}, "
+                  f"got {d['accept']}/{d['rule']} (match={d['match']!r})")
+        if legacy_is_worldwide_remote(case["location"], case["description"]) != case["accept"]:
+            changed.append(case)
+
+    print(f"📋 Corpus: {len(cases) - failures}/{len(cases)} cases pass")
+    for case in changed:
+        print(f"   ↪ changed vs old filter: {case['location']!r} → {case['accept']} ({case['rule']})")
+    return failures == 0
+
+
+def load_jobs(args) -> list[dict]:
+    if args.bronze:
+        from app.ingest.storage import BronzeStorage
+        jobs = []
+        for package in BronzeStorage(base_path=args.bronze).iter_packages():
+            jobs.extend(package["data"])
+        return jobs
+    cases = [json.loads(line) for line in CORPUS.read_text(encoding="utf-8").splitlines() if line.strip()]
+    base = [{"location": c["location"] or "", "description_text": c["description"] or ""} for c in cases]
+    return (base * (args.jobs // len(base) + 1))[:args.jobs]
+
+
+def measure(fn, jobs, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(jobs)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the worldwide-remote location filter")
+    parser.add_argument("--jobs", type=int, default=2000, help="synthetic batch size (from the corpus)")
+    parser.add_argument("--bronze", metavar="DIR", help="use every posting in this Bronze store instead")
+    parser.add_argument("--repeat", type=int, default=5, help="timing passes (best is reported)")
+    parser.add_argument("--check", action="store_true", help="corpus check only, no timing")
+    args = parser.parse_args()
+
+    ok = check_corpus()
+    if args.check or not ok:
+        sys.exit(0 if ok else 1)
+
+    jobs = load_jobs(args)
+    if not jobs:
+        print("No jobs to benchmark.")
+        sys.exit(1)
+
+    old_s = measure(legacy_filter, jobs, args.repeat)
+    new_s = measure(new_filter, jobs, args.repeat)
+    differ = sum(a != b for a, b in zip(legacy_filter(jobs), new_filter(jobs)))
+
+    print(f"\n📄 {len(jobs)} jobs, best of {args.repeat} passes\n")
+    print(f"{'filter':<12} {'µs/job':>10} {'total ms':>10}")
+    for name, s in (("legacy", old_s), ("compiled", new_s)):
+        print(f"{name:<12} {s / len(jobs) * 1e6:>10.2f} {s * 1000:>10.1f}")
+    print(f"\n⚡ {old_s / new_s:.1f}x faster, {differ} decisions differ from the old filter")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,221 @@
+"""
+Benchmark: near-duplicate detection (app.core.near_duplicates).
+
+Builds a synthetic feed the way boards mangle a posting — "Sr." vs
+"Senior", "(m/w/d)" / "- Remote" suffixes, "Acme Inc." vs "Acme",
+reordered or dropped paragraphs, a board footer, a different URL — next to
+distinct postings at the same company (shared "about us" text, often the
+same title) and hard negatives: a second role at the same company whose
+posting reuses most of the first one's text (7 of 9 sentences) under a
+different title. Reports, against the known truth:
+- exact:       crud.job_dedupe_key (title|company|canonical_url) — what ingest had
+- body only:   LSH index without the title check (title_threshold=0)
+- minhash:     LSH index as ingest runs it, recall / precision of the links
+plus hard negatives wrongly linked, and time for the LSH pass vs
+comparing every pair.
+
+    python -m benchmarks.bench_near_duplicates
+    python -m benchmarks.bench_near_duplicates --roles 2000 --copies 3 --siblings 0.3
+    python -m benchmarks.bench_near_duplicates --bronze data/bronze   # clusters in real postings
+"""
+
+import sys
+import time
+import random
+import argparse
+from itertools import combinations
+
+from app.core.near_duplicates import (
+    NearDuplicateIndex, NEAR_DUP_THRESHOLD, NEAR_DUP_TITLE_THRESHOLD, signature, similarity,
+)
+
+TITLES = [
+    "Senior Backend Engineer", "Backend Engineer", "Senior Frontend Engineer", "Data Engineer",
+    "Senior Data Engineer", "Platform Engineer", "Site Reliability Engineer", "Full Stack Developer",
+    "Machine Learning Engineer", "Engineering Manager", "DevOps Engineer", "Analytics Engineer",
+]
+COMPANIES = ["Acme", "Globex", "Initech", "Umbrella", "Hooli", "Stark", "Wayne", "Soylent",
+             "Tyrell", "Cyberdyne", "Vandelay", "Wonka"]
+SUFFIXES = ["Inc.", "GmbH", "Ltd", "LLC", ""]
+VOCAB = (
+    "design operate services requests python fastapi postgres kubernetes aws written communication "
+    "asynchronous collaboration production systems observability testing event streaming kafka mentor "
+    "roadmap react typescript interfaces merchants pipelines airflow dbt warehouse equity learning budget "
+    "flexible hours ship changes feature flags partner product designers discovery launch call alert "
+    "noise remote first teammates countries terraform infrastructure latency cost inference privacy "
+    "customers billing payments search ranking mobile platform security compliance analytics growth "
+    "experiments migrations reliability scale performance caching queues workers api contracts schema"
+).split()
+# Other roles a company posts with its template text
+SIBLING_TITLES = ["Data Analyst", "Product Designer", "QA Engineer", "Technical Writer", "Sales Engineer",
+                  "Customer Success Manager", "Security Engineer", "Product Manager"]
+FOOTERS = [
+    "Apply via our careers page.",
+    "This job was posted on a remote job board. Mention us when applying!",
+    "Equal opportunity employer.",
+]
+
+
+def _sentence(rng: random.Random) -> str:
+    return " ".join(rng.choice(VOCAB) for _ in range(rng.randint(9, 16))).capitalize() + "."
+
+
+def job_dedupe_key(title, company, canonical_url) -> tuple:
+    """Same normalization as crud.job_dedupe_key (without the DB imports)."""
+    return tuple(" ".join((p or "").split()).lower() for p in (title, company, canonical_url))
+
+
+def make_feed(roles: int, copies: int, siblings: float = 0.2,
+              seed: int = 7) -> tuple[list[dict], list[int], set[int]]:
+    """Postings in arrival order, the role each one belongs to, and the sibling (hard negative) roles."""
+    rng = random.Random(seed)
+    # Roles at the same company share its "about us" paragraph — the hard
+    # negatives: same company, same boilerplate, different job
+    about = {c: [_sentence(rng) for _ in range(3)] for c in COMPANIES}
+    originals = []
+    sibling_roles = set()
+    for role in range(roles):
+        title = rng.choice(TITLES)
+        company = rng.choice(COMPANIES)
+        body = [_sentence(rng) for _ in range(6)] + about[company]
+        originals.append({"title": title, "company": company, "body": body, "role": role})
+    # Same company, same template, different title: 7 of 9 sentences shared
+    for o in list(originals):
+        if rng.random() < siblings:
+            body = list(o["body"])
+            for i in rng.sample(range(6), 2):
+                body[i] = _sentence(rng)
+            role = len(originals)
+            sibling_roles.add(role)
+            originals.append({"title": rng.choice(SIBLING_TITLES), "company": o["company"], "body": body, "role": role})
+
+    feed = []
+    for o in originals:
+        feed.append({**o, "company": f"{o['company']} {rng.choice(SUFFIXES)}".strip(),
+                     "description": " ".join(o["body"]), "url": f"https://a.example/{o['role']}"})
+        for c in range(rng.randint(0, copies)):
+            title = o["title"].replace("Senior", rng.choice(["Senior", "Sr.", "Sr"]))
+            title += rng.choice(["", " (m/w/d)", " - Remote", " (Remote)"])
+            body = list(o["body"])
+            if rng.random() < 0.5:
+                body.pop(rng.randrange(len(body)))
+            if rng.random() < 0.5:
+                i = rng.randrange(len(body) - 1)
+                body[i], body[i + 1] = body[i + 1], body[i]
+            feed.append({
+                "title": title,
+                "company": f"{o['company']} {rng.choice(SUFFIXES)}".strip(),
+                "description": " ".join(body) + " " + rng.choice(FOOTERS),
+                "url": f"https://board{c}.example/jobs/{rng.getrandbits(32):x}",
+                "role": o["role"],
+            })
+    rng.shuffle(feed)
+    return feed, [f["role"] for f in feed], sibling_roles
+
+
+def sibling_links(links: list[int | None], roles: list[int], siblings: set[int]) -> int:
+    """Hard negatives linked to another role."""
+    return sum(1 for i, c in enumerate(links)
+               if c is not None and roles[c] != roles[i] and (roles[i] in siblings or roles[c] in siblings))
+
+
+def score(links: list[int | None], roles: list[int]) -> tuple[int, int, int]:
+    """(true links, false links, missed duplicates) — a link is right if it joins the same role."""
+    first_of_role: dict[int, int] = {}
+    true_pos = false_pos = missed = 0
+    for i, role in enumerate(roles):
+        is_dup = role in first_of_role
+        first_of_role.setdefault(role, i)
+        if links[i] is None:
+            missed += is_dup
+        elif roles[links[i]] == role:
+            true_pos += 1
+        else:
+            false_pos += 1
+    return true_pos, false_pos, missed
+
+
+def run_bronze(path: str):
+    from app.ingest.storage import BronzeStorage
+    postings, seen = [], set()
+    for package in BronzeStorage(base_path=path).iter_packages():
+        for r in package["data"]:
+            key = job_dedupe_key(r.get("title"), r.get("company"), r.get("canonical_url"))
+            if key in seen:
+                continue
+            seen.add(key)
+            postings.append({**r, "source": package["source"]})
+    start = time.perf_counter()
+    index = NearDuplicateIndex()
+    links = [index.add(i, signature(p.get("title"), p.get("company"), p.get("description_text")), p.get("title"))
+             for i, p in enumerate(postings)]
+    elapsed = time.perf_counter() - start
+    dups = [(i, c) for i, c in enumerate(links) if c is not None]
+    cross = sum(1 for i, c in dups if postings[i]["source"] != postings[c]["source"])
+    print(f"📦 {len(postings)} distinct postings (by dedupe_key) from {path}")
+    print(f"🧬 {len(dups)} near-duplicates ({cross} across sources) in {elapsed:.2f}s\n")
+    for i, c in dups[:15]:
+        a, b = postings[c], postings[i]
+        print(f"  {a['source']:<28} {a.get('title')!r} @ {a.get('company')!r}")
+        print(f"  {b['source']:<28} {b.get('title')!r} @ {b.get('company')!r}\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark MinHash/LSH near-duplicate detection")
+    parser.add_argument("--roles", type=int, default=1000, help="distinct roles in the synthetic feed")
+    parser.add_argument("--copies", type=int, default=3, help="max extra copies per role from other boards")
+    parser.add_argument("--siblings", type=float, default=0.2,
+                        help="share of roles with a same-template, different-title sibling role")
+    parser.add_argument("--pairs-limit", type=int, default=1500, help="max postings for the all-pairs timing")
+    parser.add_argument("--bronze", metavar="DIR", help="report clusters in real Bronze postings instead")
+    args = parser.parse_args()
+
+    if args.bronze:
+        run_bronze(args.bronze)
+        return
+
+    feed, roles, siblings = make_feed(args.roles, args.copies, args.siblings)
+    role_count = len(set(roles))
+    print(f"📄 {len(feed)} postings, {role_count} roles ({len(siblings)} same-template siblings), "
+          f"{len(feed) - role_count} cross-board copies "
+          f"(threshold {NEAR_DUP_THRESHOLD}, title {NEAR_DUP_TITLE_THRESHOLD})\n")
+
+    # Exact key, as ingest / Silver deduplicated before
+    first_key: dict[str, int] = {}
+    exact = []
+    for i, f in enumerate(feed):
+        key = job_dedupe_key(f["title"], f["company"], f["url"])
+        exact.append(first_key.get(key))
+        first_key.setdefault(key, i)
+
+    start = time.perf_counter()
+    sigs = [signature(f["title"], f["company"], f["description"]) for f in feed]
+    t_sign = time.perf_counter() - start
+    body_index = NearDuplicateIndex(title_threshold=0.0)
+    body_only = [body_index.add(i, sig, f["title"]) for i, (sig, f) in enumerate(zip(sigs, feed))]
+    start = time.perf_counter()
+    index = NearDuplicateIndex()
+    links = [index.add(i, sig, f["title"]) for i, (sig, f) in enumerate(zip(sigs, feed))]
+    t_lsh = time.perf_counter() - start
+
+    print(f"{'method':<10} {'linked':>8} {'wrong':>7} {'siblings':>9} {'missed':>8} {'recall':>8}")
+    dup_total = len(feed) - role_count
+    for name, result in (("exact", exact), ("body only", body_only), ("minhash", links)):
+        tp, fp, missed = score(result, roles)
+        sib = sibling_links(result, roles, siblings)
+        print(f"{name:<10} {tp:>8} {fp:>7} {sib:>9} {missed:>8} {tp / max(dup_total, 1):>8.1%}")
+
+    n = min(len(sigs), args.pairs_limit)
+    start = time.perf_counter()
+    for a, b in combinations(sigs[:n], 2):
+        similarity(a, b)
+    t_pairs = (time.perf_counter() - start) * (len(sigs) * (len(sigs) - 1)) / max(n * (n - 1), 1)
+
+    print(f"\n⏱️  signatures: {t_sign * 1e3:.0f} ms ({t_sign / len(feed) * 1e6:.0f} µs/posting)")
+    print(f"⏱️  LSH index:  {t_lsh * 1e3:.0f} ms")
+    print(f"⏱️  all pairs:  {t_pairs * 1e3:.0f} ms" + (" (extrapolated)" if n < len(sigs) else ""))
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
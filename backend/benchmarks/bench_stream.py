@@ -0,0 +1,255 @@
+"""
+Benchmark: peak memory of one feed ingest, whole-body vs streamed.
+
+Builds a RemoteOK-style dump ([legal notice, job, job, ...] with HTML
+descriptions), writes it to a temp file (standing in for the socket /
+conditional_stream's spool) and runs both pipelines up to the DB write:
+- legacy:   r.json() of the whole body → normalized list → Bronze
+            save_raw_response → filtered list (what ingest did)
+- streamed: JsonArrayParser over 64KB chunks → normalize → batches of
+            INGEST_BATCH_SIZE → Bronze segment write → filter
+            (app/ingest/stream.py + orchestrator._process_batch)
+
+Reports tracemalloc peaks (Python heap) and, per mode in a fresh
+process, peak RSS. Checks both kept the same jobs.
+
+First, a chunk-split fuzz check of JsonArrayParser: feeds and documents
+with numbers in every form ("1500.0", "-2.5e-3", "3E+2") and meta members
+are split at every chunk size up to FUZZ_MAX_CHUNK plus random cuts, and
+must decode exactly like json.loads.
+
+    python -m benchmarks.bench_stream
+    python -m benchmarks.bench_stream --jobs 20000 --batch 200
+    python -m benchmarks.bench_stream --check      # parser fuzz only (CI)
+"""
+
+import io
+import sys
+import json
+import time
+import random
+import argparse
+import tempfile
+import resource
+import subprocess
+import contextlib
+import tracemalloc
+from pathlib import Path
+
+from app.core.skills import extract_skills
+from app.core.location_filter import classify_many
+from app.ingest.storage import BronzeStorage
+from app.ingest.stream import JsonArrayParser, json_array_items, STREAM_CHUNK
+
+LOCATIONS = ["Worldwide", "Remote", "USA", "Europe", "Remote - US only", "EMEA", "Berlin, Germany", ""]
+WORDS = (
+    "python react postgres kubernetes aws remote team product customers design build ship "
+    "scale platform data pipelines ownership async written communication senior engineer"
+).split()
+
+
+def make_dump(jobs: int, seed: int = 11) -> bytes:
+    rng = random.Random(seed)
+    items = [{"legal": "API Terms of Service: please link back to Remote OK"}]
+    for i in range(jobs):
+        paragraphs = [" ".join(rng.choice(WORDS) for _ in range(60)) for _ in range(rng.randint(4, 10))]
+        items.append({
+            "id": str(i),
+            "epoch": 1_760_000_000 + i * 60,
+            "position": f"{rng.choice(['Senior', 'Staff', ''])} {rng.choice(['Backend', 'Data', 'Frontend'])} Engineer",
+            "company": f"Company {rng.randrange(500)}",
+            "location": rng.choice(LOCATIONS),
+            "tags": rng.sample(WORDS, 5),
+            "description": "".join(f"<p>{p}</p>" for p in paragraphs),
+            "url": f"https://remoteok.com/remote-jobs/{i}",
+            "salary_min": rng.choice([None, 60000, 90000]),
+            "salary_max": rng.choice([None, 120000, 150000]),
+        })
+    return json.dumps(items).encode("utf-8")
+
+
+FUZZ_MAX_CHUNK = 80
+
+# (key, document) — numbers next to every delimiter, meta before and after
+FUZZ_DOCS = [
+    ("data", {
+        "total": 1500.0, "rate": -2.5e-3,
+        "data": [1500.0, -0.5, 2e10, 3e-2, 3E+2, 12, 0, -7, {"a": 1.25, "b": [1, 2.0, -3e1]}, "1.5", True, None],
+        "page": 42, "scale": -1e5,
+    }),
+    ("jobs", {"jobs": [], "next": None, "count": 0.0}),
+    (None, [{"legal": "terms"}, 1.5, -2e3, 10, [0.5, 6], {"salary": 120000.0, "epoch": 1760000000}]),
+]
+
+
+def _parse_chunks(key: str | None, chunks: list[bytes]) -> tuple[list, dict]:
+    parser = JsonArrayParser(key)
+    items = []
+    for chunk in chunks:
+        items.extend(parser.feed(chunk))
+    items.extend(parser.close())
+    return items, parser.meta
+
+
+def check_parser(seed: int = 7) -> bool:
+    """Every chunking of FUZZ_DOCS decodes like json.loads (compact and indented)."""
+    rng = random.Random(seed)
+    cases = failures = 0
+    for key, doc in FUZZ_DOCS:
+        expected = (doc, {}) if key is None else (doc[key], {k: v for k, v in doc.items() if k != key})
+        for raw in (json.dumps(doc).encode(), json.dumps(doc, indent=1).encode()):
+            splits = [list(range(0, len(raw), size)) for size in range(1, FUZZ_MAX_CHUNK + 1)]
+            splits += [sorted({0, *rng.sample(range(1, len(raw)), rng.randint(1, 10))}) for _ in range(200)]
+            for cuts in splits:
+                chunks = [raw[a:b] for a, b in zip(cuts, cuts[1:] + [len(raw)])]
+                cases += 1
+                try:
+                    got = _parse_chunks(key, chunks)
+                except ValueError as e:
+                    got = f"{type(e).__name__}: {e}"
+                if got != expected:
+                    failures += 1
+                    if failures <= 5:
+                        print(f"❌ key={key!r} chunks={[len(c) for c in chunks][:8]}…: {str(got)[:120]}")
+    print(f"🧩 Parser fuzz: {cases - failures}/{cases} chunkings decode like json.loads")
+    return failures == 0
+
+
+def normalize(j: dict) -> dict | None:
+    """fetch_remoteok_jobs' output record (without the DB-backed cursor)."""
+    title = " ".join((j.get("position") or "").split())
+    if not title:
+        return None
+    return {
+        "title": title,
+        "company": j.get("company", ""),
+        "location": j.get("location", "Worldwide"),
+        "remote_flag": True,
+        "skills": extract_skills(title, j.get("description", "")),
+        "description_text": j.get("description", "")[:10000],
+        "apply_url": j.get("url", ""),
+        "canonical_url": j.get("url", ""),
+        "posted_at": j.get("epoch"),
+        "source": "remoteok",
+    }
+
+
+def keep(jobs: list[dict]) -> list[dict]:
+    return [j for j, d in zip(jobs, classify_many(jobs)) if d["accept"]]
+
+
+def run_legacy(path: Path, bronze: BronzeStorage, batch: int) -> list[str]:
+    data = json.loads(path.read_bytes())
+    jobs = [n for n in (normalize(j) for j in data[1:]) if n]
+    bronze.save_raw_response("remoteok", jobs, {"source_type": "RemoteOK"})
+    return [j["apply_url"] for j in keep(jobs)]
+
+
+def run_streamed(path: Path, bronze: BronzeStorage, batch: int) -> list[str]:
+    kept: list[str] = []
+    segment = bronze.open_segment("remoteok", {"source_type": "RemoteOK"})
+
+    def flush(jobs: list[dict]):
+        segment.write(jobs)
+        kept.extend(j["apply_url"] for j in keep(jobs))
+
+    with open(path, "rb") as f:
+        items = json_array_items(iter(lambda: f.read(STREAM_CHUNK), b""))
+        next(items)  # legal notice
+        jobs = []
+        for j in items:
+            n = normalize(j)
+            if n:
+                jobs.append(n)
+            if len(jobs) >= batch:
+                flush(jobs)
+                jobs = []
+        if jobs:
+            flush(jobs)
+    segment.close()
+    return kept
+
+
+MODES = {"legacy": run_legacy, "streamed": run_streamed}
+
+
+def measure(mode: str, path: Path, batch: int) -> tuple[list[str], int, float]:
+    with tempfile.TemporaryDirectory() as bronze_dir:
+        bronze = BronzeStorage(base_path=bronze_dir, codec="gzip", dedup=False)
+        tracemalloc.start()
+        start = time.perf_counter()
+        kept = MODES[mode](path, bronze, batch)
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return kept, peak, elapsed
+
+
+def peak_rss_mb() -> float:
+    """
+    This process's peak RSS. VmHWM, not ru_maxrss: Linux carries
+    ru_maxrss over fork + exec, so a child would report the parent's peak.
+    """
+    try:
+        for line in Path("/proc/self/status").read_text().splitlines():
+            if line.startswith("VmHWM:"):
+                return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def max_rss_mb(mode: str, path: Path, batch: int) -> float:
+    """Peak RSS of a fresh process running only `mode`."""
+    out = subprocess.run(
+        [sys.executable, "-m", "benchmarks.bench_stream", "--only", mode, "--dump", str(path), "--batch", str(batch)],
+        capture_output=True, text=True, check=True,
+    )
+    return float(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Peak memory of whole-body vs streamed feed ingest")
+    parser.add_argument("--jobs", type=int, default=5000, help="jobs in the synthetic dump")
+    parser.add_argument("--batch", type=int, default=200, help="records per batch (INGEST_BATCH_SIZE)")
+    parser.add_argument("--check", action="store_true", help="parser fuzz check only, no benchmark")
+    parser.add_argument("--only", choices=sorted(MODES), help=argparse.SUPPRESS)
+    parser.add_argument("--dump", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if not args.only:
+        ok = check_parser()
+        if args.check or not ok:
+            sys.exit(0 if ok else 1)
+        print()
+
+    if args.only:
+        # redirect: Bronze prints
+        with tempfile.TemporaryDirectory() as bronze_dir, contextlib.redirect_stdout(io.StringIO()):
+            MODES[args.only](Path(args.dump), BronzeStorage(base_path=bronze_dir, codec="gzip", dedup=False), args.batch)
+        print(peak_rss_mb())
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "remoteok.json"
+        path.write_bytes(make_dump(args.jobs))
+        size = path.stat().st_size
+        print(f"📄 {args.jobs} jobs, {size / 1e6:.1f} MB body, batch {args.batch}\n")
+
+        with contextlib.redirect_stdout(io.StringIO()):  # Bronze prints
+            results = {mode: measure(mode, path, args.batch) for mode in MODES}
+        rss = {mode: max_rss_mb(mode, path, args.batch) for mode in MODES}
+
+    print(f"{'mode':<10} {'heap peak':>10} {'max RSS':>9} {'time':>8} {'kept':>6}")
+    for mode, (kept, peak, elapsed) in results.items():
+        print(f"{mode:<10} {peak / 1e6:>8.1f}MB {rss[mode]:>7.0f}MB {elapsed:>7.2f}s {len(kept):>6}")
+
+    if results["legacy"][0] != results["streamed"][0]:
+        print("\n❌ streamed pipeline kept different jobs")
+        sys.exit(1)
+    legacy_peak, streamed_peak = results["legacy"][1], results["streamed"][1]
+    print(f"\n✅ same {len(results['streamed'][0])} jobs kept; heap peak {legacy_peak / max(streamed_peak, 1):.1f}x lower")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+Benchmark: the async translation stage against a local mock LLM.
+
+Starts an OpenAI-compatible mock (/v1/chat/completions, fixed latency per
+request, "[en] "-prefixed echo; packed JSON-array requests are answered
+item by item) and translates the same synthetic German descriptions:
+
+    1. sequential   — one request per text, no concurrency (the old .apply path)
+    2. pipeline     — packing + concurrency + token buckets
+    3. cached rerun — same texts again: expect 0 requests
+
+Nothing leaves the machine: TRANSLATE_BASE_URL points at the mock and the
+translation cache lives in a temp dir.
+
+    python -m benchmarks.bench_translate
+    python -m benchmarks.bench_translate --texts 300 --latency 0.5 --rpm 600
+    python -m benchmarks.bench_translate --serve 8765   # just run the mock
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+SAMPLE = (
+    "Wir suchen eine erfahrene Backend-Entwicklerin (m/w/d) für unser Team in Berlin. "
+    "Du arbeitest mit Python, PostgreSQL und Kubernetes und gestaltest unsere Plattform mit. "
+)
+
+
+class MockLLM(BaseHTTPRequestHandler):
+    latency = 0.2
+    requests = 0
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers.get("content-length", 0))))
+        type(self).requests += 1
+        time.sleep(self.latency)
+        system, user = body["messages"][0]["content"], body["messages"][1]["content"]
+        if "JSON array" in system:
+            content = json.dumps([f"[en] {t}" for t in json.loads(user)], ensure_ascii=False)
+        else:
+            content = f"[en] {user}"
+        reply = json.dumps({
+            "choices": [{"message": {"role": "assistant", "content": content}}],
+            "usage": {"total_tokens": (len(system) + 2 * len(user)) // 4},
+        }).encode("utf-8")
+        self.send_response(200)
+        self.send_header("content-type", "application/json")
+        self.send_header("content-length", str(len(reply)))
+        self.end_headers()
+        self.wfile.write(reply)
+
+    def log_message(self, *args):
+        pass
+
+
+def serve(port: int, latency: float) -> ThreadingHTTPServer:
+    MockLLM.latency = latency
+    server = ThreadingHTTPServer(("127.0.0.1", port), MockLLM)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark async translation against a mock LLM")
+    parser.add_argument("--texts", type=int, default=100, help="distinct descriptions to translate")
+    parser.add_argument("--latency", type=float, default=0.2, help="mock seconds per request")
+    parser.add_argument("--rpm", type=float, default=600, help="TRANSLATE_RPM for the pipeline run")
+    parser.add_argument("--tpm", type=float, default=600000, help="TRANSLATE_TPM for the pipeline run")
+    parser.add_argument("--serve", type=int, metavar="PORT", help="only run the mock server on PORT")
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(args.serve, args.latency)
+        print(f"🤖 Mock LLM on http://127.0.0.1:{args.serve}/v1 — set TRANSLATE_BASE_URL to it (Ctrl-C stops)")
+        threading.Event().wait()
+
+    server = serve(0, args.latency)
+    os.environ["TRANSLATE_BASE_URL"] = f"http://127.0.0.1:{server.server_port}/v1"
+    os.environ["TRANSLATION_CACHE_PATH"] = os.path.join(tempfile.mkdtemp(), "translations.sqlite")
+    os.environ["TRANSLATE_RPM"] = str(args.rpm)
+    os.environ["TRANSLATE_TPM"] = str(args.tpm)
+
+    from app.core import translate
+
+    # Short and long postings, all distinct so nothing is deduplicated
+    texts = [
+        f"Stelle {i}: " + SAMPLE * (1 if i % 3 else 8)
+        for i in range(args.texts)
+    ]
+
+    def run(label: str, batch: list[str]):
+        before = MockLLM.requests
+        start = time.perf_counter()
+        out = translate.translate_many(batch, assume_non_english=True)
+        elapsed = time.perf_counter() - start
+        ok = sum(o.startswith("[en] ") for o in out)
+        print(f"{label:<14} {elapsed:>8.2f}s {MockLLM.requests - before:>9} {ok:>6}/{len(batch)}")
+
+    print(f"📄 {args.texts} texts, mock latency {args.latency}s/request\n")
+    print(f"{'run':<14} {'time':>9} {'requests':>9} {'translated':>13}")
+
+    # 1. Sequential baseline: no packing, one request at a time
+    saved = translate.TRANSLATE_CONCURRENCY, translate.TRANSLATE_PACK_ITEM_CHARS
+    translate.TRANSLATE_CONCURRENCY, translate.TRANSLATE_PACK_ITEM_CHARS = 1, 0
+    run("sequential", [f"seq {t}" for t in texts])
+    translate.TRANSLATE_CONCURRENCY, translate.TRANSLATE_PACK_ITEM_CHARS = saved
+
+    # 2. Pipeline, 3. same texts again from the cache
+    run("pipeline", texts)
+    run("cached rerun", texts)
+
+    c = translate.translation_cache.snapshot()
+    print(f"\n🗂️  cache: {c['entries']} entries, hit rate {c['hit_rate']:.0%}, ~{c['tokens_saved']} tokens saved")
+    server.shutdown()
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
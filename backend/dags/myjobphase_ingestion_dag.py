@@ -8,7 +8,9 @@ Orchestrates job scraping from 10+ sources with:
 - Retry logic
 - Monitoring
 
-Schedule: Every 6 hours
+Schedule: Hourly (the API only ingests sources that are due). When the
+API runs with INGEST_IN_PROCESS=false the app.ingest_loop worker ingests
+instead; the trigger gets a 409 and the downstream tasks run as usual.
 Author: The_Dev
 """
 
@@ -39,7 +41,9 @@ dag = DAG(
     'myjobphase_job_ingestion',
     default_args=default_args,
     description='Ingest remote jobs from 10+ sources with Bronze layer',
-    schedule_interval='0 */6 * * *',  # Every 6 hours
+    # Hourly tick — the API only ingests sources whose adaptive interval
+    # has elapsed (app/ingest/schedule.py), so most runs touch a few boards
+    schedule_interval='0 * * * *',
     start_date=datetime(2026, 4, 1),
     catchup=False,
     tags=['production', 'data-ingestion', 'bronze-layer'],
@@ -52,9 +56,18 @@ def run_job_ingestion():
     print("🚀 Calling API to trigger ingestion...")
     
     with httpx.Client(timeout=7200) as client:
-        response = client.post("http://jobboard-api:8000/internal/trigger-ingest")
+        response = client.post(
+            "http://jobboard-api:8000/internal/trigger-ingest",
+            params={"workers": int(os.getenv("INGEST_WORKERS", "1")), "due": "true"},
+            headers={"X-Internal-Secret": os.getenv("INTERNAL_SECRET", "")},
+        )
         print(f"Response: {response.status_code}")
-        
+
+        if response.status_code == 409:
+            # Ingest runs in the jobboard-ingest worker — don't start a second one
+            print(f"⏭️  {response.json().get('detail')}")
+            return
+
         if response.status_code != 200:
             raise Exception(f"Ingestion failed: {response.status_code} - {response.text}")
     
@@ -66,24 +79,20 @@ def check_data_quality(**context):
     Validate data quality from DLQ
     """
     from pathlib import Path
-    import json
+    sys.path.insert(0, '/opt/airflow')
+    from app.ingest.storage import DeadLetterQueue
     
-    dlq_path = Path('/opt/airflow/data/dlq/filter')
+    dlq_path = Path('/opt/airflow/data/dlq')
     
     if not dlq_path.exists():
         print("⚠️  No DLQ data found")
         return {'total_filtered': 0}
     
-    total_filtered = 0
-    sources = {}
-    
-    # Count filtered records per source
-    for source_file in dlq_path.rglob('*.jsonl'):
-        with open(source_file, 'r') as f:
-            count = sum(1 for line in f if line.strip())
-            source_name = source_file.stem
-            sources[source_name] = count
-            total_filtered += count
+    # Filtered records per source, all history — read from the DLQ
+    # counters index instead of line-counting every file
+    dlq = DeadLetterQueue(base_path=str(dlq_path))
+    sources = dlq.get_counts(days=None, by="source", error_type="filter")
+    total_filtered = sum(sources.values())
     
     print(f"\n📊 Data Quality Report:")
     print(f"  Total filtered (US-only): {total_filtered}")
@@ -102,41 +111,31 @@ def check_data_quality(**context):
 
 def generate_report(**context):
     """
-    Generate Bronze layer statistics
+    Generate Bronze layer statistics (from the segment manifest — no file reads)
     """
-    from pathlib import Path
-    import json
-    
-    bronze_path = Path('/opt/airflow/data/bronze')
-    
-    if not bronze_path.exists():
+    import sys
+    sys.path.insert(0, '/opt/airflow')
+    from app.ingest.storage import BronzeStorage
+
+    stats = BronzeStorage(base_path='/opt/airflow/data/bronze').stats()
+
+    if not stats:
         print("⚠️  No Bronze data found")
         return {'total_records': 0}
-    
-    total_records = 0
-    sources = {}
-    
-    # Count records per source
-    for source_dir in bronze_path.iterdir():
-        if source_dir.is_dir():
-            count = 0
-            for json_file in source_dir.rglob('*.json'):
-                try:
-                    with open(json_file, 'r') as f:
-                        data = json.load(f)
-                        count += data.get('record_count', 0)
-                except Exception as e:
-                    print(f"⚠️  Error reading {json_file}: {e}")
-            
-            sources[source_dir.name] = count
-            total_records += count
-    
+
+    sources = {source: s['records'] for source, s in stats.items()}
+    total_records = sum(sources.values())
+    total_mb = sum(s['bytes'] for s in stats.values()) / 1024 / 1024
+    total_refs = sum(s['refs'] for s in stats.values())
+
     print(f"\n📊 Bronze Layer Report:")
     print(f"  Total records: {total_records}")
+    print(f"  Disk usage: {total_mb:.1f} MB")
+    print(f"  Stored as references (unchanged): {total_refs}")
     print(f"  Active sources: {len(sources)}")
     for source, count in sorted(sources.items(), key=lambda x: x[1], reverse=True):
         print(f"  - {source}: {count} records")
-    
+
     return {
         'total_records': total_records,
         'sources': sources,
@@ -146,71 +145,56 @@ def generate_report(**context):
 
 def cleanup_old_data(**context):
     """
-    Delete Bronze files older than 30 days
+    Delete Bronze segments older than 30 days (files + manifest rows)
     """
-    from pathlib import Path
+    import sys
     from datetime import datetime, timedelta
-    
-    bronze_path = Path('/opt/airflow/data/bronze')
+    sys.path.insert(0, '/opt/airflow')
+    from app.ingest.storage import BronzeStorage
+
     cutoff_date = datetime.now() - timedelta(days=30)
-    
-    deleted_count = 0
-    
-    if bronze_path.exists():
-        for date_dir in bronze_path.rglob('*'):
-            if date_dir.is_dir():
-                try:
-                    # Parse date from folder name (YYYY-MM-DD)
-                    dir_date = datetime.strptime(date_dir.name, '%Y-%m-%d')
-                    if dir_date < cutoff_date:
-                        print(f"🗑️  Deleting old data: {date_dir}")
-                        import shutil
-                        shutil.rmtree(date_dir)
-                        deleted_count += 1
-                except ValueError:
-                    # Not a date folder, skip
-                    pass
-    
-    print(f"✅ Cleanup complete: Deleted {deleted_count} old directories")
+    deleted_count = BronzeStorage(base_path='/opt/airflow/data/bronze').delete_before(cutoff_date)
+
+    print(f"✅ Cleanup complete: Deleted {deleted_count} old segments")
     return {'deleted_count': deleted_count}
 
 def transform_to_silver(**context):
-    """Read Bronze files, clean them, save as Parquet"""
-    from pathlib import Path
-    import json
+    """
+    Read today's Bronze segments, clean them, save as Parquet
+
+    Only segments ingested today are read (manifest range query), and
+    only records that are new or changed — records Bronze stored as
+    references to an earlier copy are skipped. Silver input scales with
+    actual change. Re-running on the same day rewrites today's Parquet
+    file per source.
+    """
     import sys
+    from datetime import datetime
     sys.path.insert(0, '/opt/airflow')
+    from app.ingest.storage import BronzeStorage
     from app.transform.silver import SilverLayer
 
-    bronze_path = Path('/opt/airflow/data/bronze')
+    bronze = BronzeStorage(base_path='/opt/airflow/data/bronze')
     silver = SilverLayer(base_path='/opt/airflow/data/silver')
 
-    if not bronze_path.exists():
-        print("⚠️  No Bronze data found")
+    today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    records_by_source = {}
+    for package in bronze.iter_packages(since=today, changed_only=True):
+        source = package['source']
+        records = package.get('data', [])
+        for r in records:
+            r['source'] = source
+        records_by_source.setdefault(source, []).extend(records)
+
+    if not records_by_source:
+        print("⚠️  No Bronze data found for today")
         return
 
     total_processed = 0
-
-    for source_dir in bronze_path.iterdir():
-        if not source_dir.is_dir():
-            continue
-
-        all_records = []
-        for json_file in source_dir.rglob('*.json'):
-            try:
-                with open(json_file, 'r') as f:
-                    package = json.load(f)
-                    records = package.get('data', [])
-                    for r in records:
-                        r['source'] = source_dir.name
-                    all_records.extend(records)
-            except Exception as e:
-                print(f"⚠️  Error reading {json_file}: {e}")
-
-        if all_records:
-            df = silver.transform_bronze_to_silver(all_records)
-            silver.save_to_parquet(df, source_dir.name)
-            total_processed += len(df)
+    for source, all_records in records_by_source.items():
+        df = silver.transform_bronze_to_silver(all_records)
+        silver.save_to_parquet(df, source)
+        total_processed += len(df)
 
     print(f"\n💎 Silver complete: {total_processed} total records")
 